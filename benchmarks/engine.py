@@ -0,0 +1,67 @@
+"""Measure how the threaded transform engine scales with the thread count.
+
+Rotates, projects and colours a large array of random 4D points with
+math4d.engine.TransformEngine at 1 to 16 threads, next to a single
+Projection.project call (plus w_colors) as the baseline. Speedup is
+relative to the baseline; it cannot exceed the number of cores.
+
+Run from the repository root:
+
+  python -m benchmarks.engine [--points N] [--repeat R] [--precision P]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from math4d.engine import TransformEngine
+from math4d.projections import make_projection
+from math4d.rotations import rotation_matrix
+from renderer.colormap import w_colors
+
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def best_time(fn, repeat):
+  """Best wall-clock time of `repeat` calls to fn, in milliseconds."""
+  best = float('inf')
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return 1000 * best
+
+
+def main(num_points=4_000_000, repeat=5, precision='compact'):
+  dtype = np.float64 if precision == 'full' else np.float32
+  points = np.random.default_rng(0).uniform(-1, 1, (num_points, 4)).astype(dtype)
+  rotation = rotation_matrix('xw', 0.3) @ rotation_matrix('yz', 0.2)
+  projection = make_projection('perspective', 'w', 3.0)
+  out = np.empty((num_points, 3), dtype=dtype)
+  colors = np.empty((num_points, 3), dtype=np.float32)
+
+  def baseline():
+    xyz, w = projection.project(points, rotation)
+    w_colors(w, -1, 1, out=colors)
+
+  base_ms = best_time(baseline, repeat)
+  print(f"{num_points:,d} points ({precision}), {os.cpu_count()} cores")
+  print(f"{'threads':>8} {'time':>10} {'speedup':>8}")
+  print(f"{'numpy':>8} {base_ms:>8.1f}ms {1.0:>7.2f}x")
+  for threads in THREAD_COUNTS:
+    engine = TransformEngine(threads)
+    ms = best_time(lambda: engine.transform(points, rotation, projection, out=out,
+                                            colors=colors, depth_range=(-1, 1)), repeat)
+    engine.close()
+    print(f"{threads:>8} {ms:>8.1f}ms {base_ms / ms:>7.2f}x")
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--points', type=int, default=4_000_000, help="number of 4D points")
+  parser.add_argument('--repeat', type=int, default=5, help="timed runs per measurement")
+  parser.add_argument('--precision', choices=('full', 'compact'), default='compact')
+  args = parser.parse_args()
+  main(num_points=args.points, repeat=args.repeat, precision=args.precision)
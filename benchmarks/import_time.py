@@ -0,0 +1,62 @@
+"""Measure how long it takes to import the viewer's modules.
+
+Each import runs in a fresh interpreter, so nothing is cached between
+measurements; the time of starting an empty interpreter is subtracted.
+Also reports whether the import pulled in the GUI stack (pygame or
+PyOpenGL), which the core modules must not do.
+
+Run from the repository root:
+
+  python -m benchmarks.import_time
+"""
+import subprocess
+import sys
+import time
+
+
+TARGETS = {
+  'geometry + math4d': "import geometry.product, geometry.loader, geometry.weld, "
+                       "math4d.batch, math4d.slicing, math4d.stream",
+  'object4d': "import object4d",
+  'main (viewer, no window)': "import main",
+  'renderer.window (GUI)': "import renderer.window",
+}
+
+GUI_CHECK = ("import sys; "
+             "print(','.join(sorted({m.split('.')[0] for m in sys.modules} & {'pygame', 'OpenGL'})))")
+
+
+def time_import(statement, repeat=5):
+  """Best wall-clock time of running `statement` in a fresh interpreter.
+
+  Returns:
+    (seconds, gui_modules): gui_modules lists 'pygame'/'OpenGL' if loaded,
+    or is None if the import failed
+  """
+  best = float('inf')
+  gui = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', f"{statement}; {GUI_CHECK}"],
+                            capture_output=True, text=True)
+    best = min(best, time.perf_counter() - start)
+    if result.returncode != 0:
+      return best, None
+    gui = result.stdout.strip()
+  return best, gui
+
+
+def main():
+  baseline, _ = time_import("pass")
+  print(f"{'interpreter startup':<28} {baseline * 1000:7.1f} ms")
+  for name, statement in TARGETS.items():
+    seconds, gui = time_import(statement)
+    if gui is None:
+      status = "import failed (missing dependency?)"
+    else:
+      status = f"loads {gui}" if gui else "no GUI modules"
+    print(f"{name:<28} {(seconds - baseline) * 1000:7.1f} ms  {status}")
+
+
+if __name__ == '__main__':
+  main()
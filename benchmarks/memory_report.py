@@ -0,0 +1,36 @@
+"""Print how much memory compact storage saves for the built-in shapes.
+
+Run from the repository root:
+
+  python -m benchmarks.memory_report
+"""
+from geometry.base import memory_report
+from geometry.tesseract import make_tesseract
+from geometry.pentachoron import make_pentachoron
+from geometry.hypersphere import make_hypersphere
+from geometry.spherinder import make_spherinder
+
+
+SHAPES = {
+  'Tesseract': (make_tesseract, {}),
+  'Pentachoron': (make_pentachoron, {"radius": 2.25}),
+  'Hypersphere': (make_hypersphere,
+                  {"radius": 2, "n1": 6, "n2": 8, "n3": 10, "interpolation": 1/3}),
+  'Hypersphere (fine)': (make_hypersphere,
+                         {"radius": 2, "n1": 40, "n2": 40, "n3": 80}),
+  'Spherinder': (make_spherinder,
+                 {"radius": 1.5, "n_lat": 10, "n_lon": 12, "interpolation": 1/3,
+                  "half_height": 1.0}),
+}
+
+
+def main():
+  for precision in ('full', 'compact', 'half'):
+    shapes = {name: make_fn(**kwargs, precision=precision)
+              for name, (make_fn, kwargs) in SHAPES.items()}
+    print(memory_report(shapes))
+    print()
+
+
+if __name__ == '__main__':
+  main()
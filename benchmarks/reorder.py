@@ -0,0 +1,70 @@
+"""Measure how vertex reordering affects projection and edge gathers.
+
+Builds a hypersphere mesh of about a million vertices and times, for
+its generated (parametric) numbering, a random numbering and the
+Z-order numbering of geometry.reorder:
+
+  - project: rotate and project the vertices (the CPU wireframe path)
+  - gather:  fetch both endpoints of every edge from the projected
+             vertices, as drawing the edges does
+
+Run from the repository root:
+
+  python -m benchmarks.reorder [--size N] [--repeat R]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from geometry.hypersphere import make_hypersphere
+from geometry.reorder import reorder
+from math4d.projections import make_projection
+from math4d.rotations import rotation_matrix
+
+
+def best_time(fn, repeat):
+  """Best wall-clock time of `repeat` calls to fn, in milliseconds."""
+  best = float('inf')
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return 1000 * best
+
+
+def measure(shape, repeat=5):
+  """(project_ms, gather_ms) for one numbering of a shape."""
+  projection = make_projection('perspective', 'w', 3.0)
+  rotation = rotation_matrix('xw', 0.3) @ rotation_matrix('yz', 0.2)
+  verts_3d, _ = projection.project(shape.vertices, rotation)
+  edges = shape.edges
+  project_ms = best_time(lambda: projection.project(shape.vertices, rotation), repeat)
+  gather_ms = best_time(lambda: verts_3d[edges], repeat)
+  return project_ms, gather_ms
+
+
+def main(size=100, repeat=5, precision='compact'):
+  generated = make_hypersphere(radius=2, n1=size, n2=size, n3=size, precision=precision)
+  generated.edges
+  rng = np.random.default_rng(0)
+  shapes = {
+    'generated': generated,
+    'random': reorder(generated, rng.permutation(generated.num_vertices)),
+    'z-order': reorder(generated),
+  }
+  print(f"hypersphere: {generated.num_vertices:,d} vertices, {generated.num_edges:,d} edges "
+        f"({precision})")
+  print(f"{'numbering':<12} {'project':>10} {'gather':>10}")
+  for name, shape in shapes.items():
+    project_ms, gather_ms = measure(shape, repeat)
+    print(f"{name:<12} {project_ms:>8.1f}ms {gather_ms:>8.1f}ms")
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--size', type=int, default=100,
+                      help="samples along each hypersphere angle (vertices ~ size^3)")
+  parser.add_argument('--repeat', type=int, default=5, help="timed runs per measurement")
+  args = parser.parse_args()
+  main(size=args.size, repeat=args.repeat)
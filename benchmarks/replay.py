@@ -0,0 +1,85 @@
+"""Replay a recorded session without a window and report frame timings.
+
+Record a session with the viewer, then replay it as a repeatable load
+test (from the repository root):
+
+  python main.py --record heavy.npz --data points.npy --preview 1000000 --threads 4
+  python -m benchmarks.replay heavy.npz --repeat 3
+
+The session keeps the start data (and its loader arguments) and the
+thread count, so the replay runs on the same load.
+
+Frames go through the same Viewer.step() as the live loop, and
+Viewer.render_headless() does all the per-frame CPU work (projection,
+cross-sections, point streaming, ray marching) without issuing OpenGL
+calls. pygame is needed to rebuild the recorded events, but no display.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from main import Viewer, load_source
+from math4d.engine import TransformEngine
+from session import Session
+
+
+def make_viewer(session):
+  """A Viewer started like the recorded one: same precision, start shape and threads."""
+  engine = TransformEngine(session.threads) if session.threads else None
+  shape = load_source(**session.source) if session.source else None
+  return Viewer(precision=session.precision, shape=shape, engine=engine)
+
+
+def replay(session):
+  """Replay a session once.
+
+  Returns:
+    (F,) float64 array of per-frame times in milliseconds
+  """
+  viewer = make_viewer(session)
+  times = []
+  try:
+    for events, keys in session.frames():
+      start = time.perf_counter()
+      viewer.step(events, keys)
+      viewer.render_headless()
+      times.append(1000 * (time.perf_counter() - start))
+      if not viewer.running:
+        break
+  finally:
+    viewer.close()
+    if viewer.obj.engine is not None:
+      viewer.obj.engine.close()
+  return np.array(times)
+
+
+def timing_report(times, slowest=5):
+  """Summarize per-frame times (milliseconds) as a multi-line string."""
+  order = np.argsort(times)[::-1][:slowest]
+  lines = [
+    f"frames {len(times)}, total {times.sum() / 1000:.2f} s",
+    f"mean {times.mean():.2f} ms, median {np.median(times):.2f} ms, "
+    f"p95 {np.percentile(times, 95):.2f} ms, max {times.max():.2f} ms",
+    "slowest frames: " + ", ".join(f"#{i} ({times[i]:.1f} ms)" for i in order),
+  ]
+  return "\n".join(lines)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('path', help="session recorded with main.py --record")
+  parser.add_argument('--repeat', type=int, default=1, help="number of replays")
+  args = parser.parse_args()
+
+  session = Session.load(args.path)
+  if session.frame_ms is not None and np.isfinite(session.frame_ms).any():
+    print("recorded (live, including OpenGL):")
+    print(timing_report(session.frame_ms[np.isfinite(session.frame_ms)].astype(np.float64)))
+  for run in range(args.repeat):
+    print(f"replay {run + 1}/{args.repeat} (headless):")
+    print(timing_report(replay(session)))
+
+
+if __name__ == '__main__':
+  main()
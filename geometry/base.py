@@ -1,27 +1,319 @@
 import numpy as np
 
 
-class Shape3D:
-  """Base class for 3D geometric objects.
+# Storage formats for shape data. 'full' keeps the original float64
+# vertices and int32 indices. 'compact' stores float32 vertices (what the
+# renderer draws with anyway) and the smallest unsigned index type that
+# can address every vertex. 'half' goes further and stores float16
+# vertices; they are promoted to float32 whenever they are transformed.
+PRECISIONS = {
+  'full': np.float64,
+  'compact': np.float32,
+  'half': np.float16,
+}
 
-  Used as input for operations that produce 4D shapes, such as
-  make_prism() which extrudes a 3D shape along the W axis.
 
-  Attributes:
-    vertices: (N, 3) array of 3D vertex positions [x, y, z].
-    edges: (M, 2) array of vertex index pairs defining edges.
-    faces: list of arrays, each containing vertex indices for one face.
+def index_dtype(num_vertices, precision='full'):
+  """Pick the index type used for edges and faces of a shape.
+
+  Args:
+    num_vertices: number of vertices the indices must be able to address
+    precision: one of PRECISIONS
+
+  Returns:
+    np.int32 for 'full', otherwise the smallest of uint8/uint16/uint32
+    whose range covers every vertex index.
+  """
+  assert precision in PRECISIONS, \
+    f"precision must be one of {sorted(PRECISIONS)}, got '{precision}'"
+  if precision == 'full':
+    return np.dtype(np.int32)
+  for dtype in (np.uint8, np.uint16, np.uint32):
+    if num_vertices - 1 <= np.iinfo(dtype).max:
+      return np.dtype(dtype)
+  return np.dtype(np.uint64)
+
+
+def grid_edges(shape, wrap=()):
+  """Edges between neighbouring points of a regular index grid.
+
+  Vertices are assumed to be numbered in C order over a grid of the given
+  shape (the last axis varies fastest), which is what nested loops or
+  np.meshgrid(..., indexing='ij') produce. Each vertex is connected to the
+  next one along every axis; axes listed in `wrap` also connect the last
+  sample back to the first.
+
+  Degenerate edges (a == b, e.g. a wrapped axis of length 1) are dropped
+  and duplicates are merged, so the result matches a set of (min, max)
+  pairs sorted lexicographically.
+
+  Args:
+    shape: grid dimensions, e.g. (n1 + 1, n2 + 1, n3)
+    wrap: axes whose last sample connects back to the first
+
+  Returns:
+    (M, 2) int64 array of vertex index pairs
   """
+  idx = np.arange(int(np.prod(shape))).reshape(shape)
+  pairs = []
+  for axis in range(len(shape)):
+    if axis in wrap:
+      nxt = np.roll(idx, -1, axis=axis)
+      pairs.append(np.stack([idx, nxt], axis=-1).reshape(-1, 2))
+    else:
+      head = np.take(idx, np.arange(shape[axis] - 1), axis=axis)
+      tail = np.take(idx, np.arange(1, shape[axis]), axis=axis)
+      pairs.append(np.stack([head, tail], axis=-1).reshape(-1, 2))
+  edges = np.concatenate(pairs)
+  edges = edges[edges[:, 0] != edges[:, 1]]
+  edges = np.sort(edges, axis=1)
+  return np.unique(edges, axis=0)
+
+
+def build_adjacency(shape):
+  """Default builder for the 'adjacency' topology of a shape.
+
+  Returns the vertex adjacency in compressed (CSR) form: the neighbours
+  of vertex i are neighbors[offsets[i]:offsets[i + 1]], sorted ascending.
+
+  Args:
+    shape: a Shape3D/Shape4D whose edges define the adjacency
+
+  Returns:
+    (offsets, neighbors) tuple of arrays
+  """
+  edges = shape.edges.astype(np.int64)
+  both = np.concatenate([edges, edges[:, ::-1]])
+  both = both[np.lexsort((both[:, 1], both[:, 0]))]
+  counts = np.bincount(both[:, 0], minlength=shape.num_vertices)
+  offsets = np.concatenate([[0], np.cumsum(counts)])
+  return offsets, both[:, 1].astype(shape.edges.dtype)
+
+
+def build_packed_faces(shape):
+  """Default builder for the 'packed_faces' topology of a shape.
+
+  Faces packed into two flat arrays: the corners of all faces, face
+  after face, and the number of corners of each face. Generators that
+  produce faces as arrays (see geometry.product) register a builder for
+  it directly and derive 'faces' from it with unpack_faces().
+
+  Returns:
+    (indices, lengths) tuple of int64 arrays, in face order
+  """
+  faces = shape.faces
+  lengths = np.array([len(f) for f in faces], dtype=np.int64)
+  indices = np.concatenate(faces).astype(np.int64) if faces else np.zeros(0, dtype=np.int64)
+  return indices, lengths
+
+
+def unpack_faces(indices, lengths):
+  """Split packed faces (see build_packed_faces) into a list of arrays."""
+  if len(lengths) == 0:
+    return []
+  return np.split(indices, np.cumsum(lengths)[:-1])
+
+
+def ragged_ranges(starts, lengths):
+  """Concatenation of arange(start, start + length) for each pair.
+
+  Gathering packed faces (see build_packed_faces) at
+  ragged_ranges(face_starts[order], lengths[order]) reorders whole faces.
+  """
+  ends = np.cumsum(lengths)
+  return np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - (ends - lengths), lengths)
+
+
+def build_cell_normals(shape):
+  """Default builder for the 'cell_normals' topology of a shape.
+
+  A 3-cell spans a hyperplane; its normal is the direction its centered
+  vertices do not span (the last right-singular vector), oriented away
+  from the centroid of all vertices. Cells are processed in groups of
+  equal vertex count, so the work is vectorized per group.
+
+  Args:
+    shape: a convex Shape4D with 'cells' topology
+
+  Returns:
+    (C, 4) float64 array of outward unit normals
+  """
+  cells = shape.topology('cells')
+  vertices = shape.vertices.astype(np.float64)
+  center = vertices.mean(axis=0)
+  normals = np.empty((len(cells), 4))
+  lengths = np.array([len(c) for c in cells])
+  for k in np.unique(lengths):
+    idx = np.flatnonzero(lengths == k)
+    points = vertices[np.array([cells[i] for i in idx], dtype=np.int64)]
+    centroids = points.mean(axis=1)
+    _, _, vt = np.linalg.svd(points - centroids[:, np.newaxis])
+    n = vt[:, -1]
+    n *= np.sign(np.sum(n * (centroids - center), axis=1))[:, np.newaxis]
+    normals[idx] = n
+  return normals
+
+
+def build_cell_offsets(shape):
+  """Default builder for 'cell_offsets': cell i lies in the hyperplane n_i . p = offsets[i]."""
+  first = np.array([c[0] for c in shape.topology('cells')], dtype=np.int64)
+  normals = shape.topology('cell_normals')
+  return np.sum(normals * shape.vertices[first].astype(np.float64), axis=1)
+
+
+def build_edge_cells(shape):
+  """Default builder for the 'edge_cells' incidence of a shape.
+
+  An edge of a convex polytope belongs to a 3-cell exactly when both of
+  its endpoints do. Candidate cells come from the first endpoint's cells
+  (via a sorted (cell, vertex) table), and the second endpoint is looked
+  up in the same table, all vectorized.
+
+  Returns:
+    (K, 2) int64 array of (edge index, cell index) pairs, by edge
+  """
+  cells = shape.topology('cells')
+  n = shape.num_vertices
+  cell_of = np.repeat(np.arange(len(cells)), [len(c) for c in cells])
+  vertex = np.concatenate([np.asarray(c, dtype=np.int64) for c in cells]) if cells else cell_of
+  # Cells of each vertex, in CSR form.
+  order = np.argsort(vertex, kind='stable')
+  start = np.searchsorted(vertex[order], np.arange(n + 1))
+  members = np.sort(cell_of * n + vertex)
+
+  edges = shape.edges.astype(np.int64)
+  counts = np.diff(start)[edges[:, 0]]
+  edge = np.repeat(np.arange(len(edges)), counts)
+  local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+  cell = cell_of[order[start[edges[edge, 0]] + local]]
+  key = cell * n + edges[edge, 1]
+  found = np.searchsorted(members, key)
+  hit = members[np.minimum(found, len(members) - 1)] == key
+  return np.column_stack([edge[hit], cell[hit]])
+
+
+class _Shape:
+  """Shared storage for Shape1D through Shape4D.
+
+  Subclasses set `dimension` to the number of coordinates per vertex.
+
+  Vertices are always stored eagerly. Topology (edges, faces, adjacency
+  and anything else a generator wants to attach) can be given either as
+  data or as a builder: a callable taking the shape and returning the
+  data. Builders run on first access and their result is cached, so a
+  caller that only looks at vertices never pays for edges or faces.
+
+  'packed_faces' holds the faces as flat arrays (see build_packed_faces).
+  Polytope generators also attach 'cells' (the 3-cells, as lists of
+  vertex indices); 'cell_normals', 'cell_offsets' and 'edge_cells' are
+  then derived from them by default builders.
+  """
+
+  dimension = None
+
+  def __init__(self, vertices, edges=None, faces=None, precision='full'):
+    assert precision in PRECISIONS, \
+      f"precision must be one of {sorted(PRECISIONS)}, got '{precision}'"
+    self.precision = precision
+    self.vertices = np.asarray(vertices, dtype=PRECISIONS[precision])
+
+    d = self.dimension
+    assert self.vertices.ndim == 2 and self.vertices.shape[1] == d, \
+      f"vertices must be (N, {d}), got {self.vertices.shape}"
+
+    # Optional vectorized signed-distance function, attached by generators
+    # of shapes that have a closed-form implicit description.
+    self.sdf = None
+    # Bumped whenever the vertices are rewritten in place (see
+    # geometry.morph), so caches keyed on the shape know to refresh.
+    self.version = 0
+
+    self._topology = {}
+    self._builders = {'adjacency': build_adjacency, 'packed_faces': build_packed_faces,
+                      'cell_normals': build_cell_normals,
+                      'cell_offsets': build_cell_offsets, 'edge_cells': build_edge_cells}
+    self._set_or_register('edges', edges if edges is not None else np.zeros((0, 2)))
+    self._set_or_register('faces', faces if faces is not None else [])
+
+  def _set_or_register(self, name, value):
+    if callable(value):
+      self.register_builder(name, value)
+    else:
+      self._topology[name] = self._normalize(name, value)
+
+  def _normalize(self, name, value):
+    """Convert topology data to this shape's index type and check it."""
+    idx = index_dtype(self.vertices.shape[0], self.precision)
+    if name == 'edges':
+      value = np.asarray(value, dtype=idx)
+      if value.size == 0:
+        value = value.reshape(0, 2)
+      assert value.ndim == 2 and value.shape[1] == 2, \
+        f"edges must be (M, 2), got {value.shape}"
+    elif name in ('faces', 'cells'):
+      value = [np.asarray(f, dtype=idx) for f in value]
+    elif name == 'packed_faces':
+      indices, lengths = value
+      value = (np.asarray(indices, dtype=idx), np.asarray(lengths, dtype=np.int64))
+    return value
+
+  def register_builder(self, name, builder):
+    """Attach a builder that computes topology `name` on first access.
 
-  def __init__(self, vertices, edges, faces=None):
-    self.vertices = np.asarray(vertices, dtype=np.float64)
-    self.edges = np.asarray(edges, dtype=np.int32)
-    self.faces = faces if faces is not None else []
+    Any previously cached value for `name` is discarded.
 
-    assert self.vertices.ndim == 2 and self.vertices.shape[1] == 3, \
-      f"vertices must be (N, 3), got {self.vertices.shape}"
-    assert self.edges.ndim == 2 and self.edges.shape[1] == 2, \
-      f"edges must be (M, 2), got {self.edges.shape}"
+    Args:
+      name: topology name, e.g. 'edges', 'faces', 'adjacency'
+      builder: callable taking this shape and returning the data
+    """
+    self._builders[name] = builder
+    self._topology.pop(name, None)
+
+  def topology(self, name):
+    """Return topology `name`, building and caching it if needed."""
+    if name not in self._topology:
+      assert name in self._builders, f"no topology or builder named '{name}'"
+      self._topology[name] = self._normalize(name, self._builders[name](self))
+    return self._topology[name]
+
+  def is_built(self, name):
+    """Whether topology `name` has already been computed."""
+    return name in self._topology
+
+  def has_topology(self, name):
+    """Whether topology `name` is available (built, or has a builder)."""
+    return name in self._topology or name in self._builders
+
+  @property
+  def edges(self):
+    return self.topology('edges')
+
+  @edges.setter
+  def edges(self, value):
+    self._set_or_register('edges', value)
+
+  @property
+  def faces(self):
+    return self.topology('faces')
+
+  @faces.setter
+  def faces(self, value):
+    self._set_or_register('faces', value)
+
+  @property
+  def cells(self):
+    """List of vertex-index arrays, one per 3-cell (polytopes only)."""
+    return self.topology('cells')
+
+  @property
+  def adjacency(self):
+    """(offsets, neighbors) CSR vertex adjacency, built from the edges."""
+    return self.topology('adjacency')
+
+  def neighbors(self, i):
+    """Indices of the vertices sharing an edge with vertex i."""
+    offsets, neighbors = self.adjacency
+    return neighbors[offsets[i]:offsets[i + 1]]
 
   @property
   def num_vertices(self):
@@ -35,34 +327,123 @@ class Shape3D:
   def num_faces(self):
     return len(self.faces)
 
+  @property
+  def compute_dtype(self):
+    """Float type to transform the vertices in (float16 is storage only)."""
+    return np.promote_types(self.vertices.dtype, np.float32)
+
+  def _built_arrays(self):
+    """All index arrays of the topology built so far."""
+    for value in self._topology.values():
+      if isinstance(value, np.ndarray):
+        yield value
+      elif isinstance(value, (list, tuple)):
+        yield from (v for v in value if isinstance(v, np.ndarray))
 
-class Shape4D:
+  @property
+  def nbytes(self):
+    """Bytes held by the vertices and the topology built so far."""
+    return self.vertices.nbytes + sum(a.nbytes for a in self._built_arrays())
+
+  def with_precision(self, precision):
+    """Return a copy of this shape stored at a different precision.
+
+    Topology that is already built is converted; unbuilt topology stays
+    lazy and is built at the new precision on first access.
+    """
+    shape = type(self)(self.vertices, precision=precision)
+    shape.sdf = self.sdf
+    for name, builder in self._builders.items():
+      shape.register_builder(name, builder)
+    for name in ('edges', 'faces'):
+      if self.is_built(name):
+        shape._topology[name] = shape._normalize(name, self._topology[name])
+    return shape
+
+
+class Shape1D(_Shape):
+  """Base class for 1D geometric objects (points on a line).
+
+  Mostly used as a factor of Cartesian products, e.g. the segment that
+  make_prism() multiplies a 3D shape by.
+
+  Attributes:
+    vertices: (N, 1) array of positions.
+    edges: (M, 2) array of vertex index pairs defining edges.
+    faces: always empty for a 1D shape.
+    precision: storage format, one of PRECISIONS.
+  """
+
+  dimension = 1
+
+
+class Shape2D(_Shape):
+  """Base class for 2D geometric objects, e.g. polygons.
+
+  Attributes:
+    vertices: (N, 2) array of 2D vertex positions [x, y].
+    edges: (M, 2) array of vertex index pairs defining edges.
+    faces: list of arrays, each containing vertex indices for one face.
+    precision: storage format, one of PRECISIONS.
+  """
+
+  dimension = 2
+
+
+class Shape3D(_Shape):
+  """Base class for 3D geometric objects.
+
+  Used as input for operations that produce 4D shapes, such as
+  make_prism() which extrudes a 3D shape along the W axis.
+
+  Attributes:
+    vertices: (N, 3) array of 3D vertex positions [x, y, z].
+    edges: (M, 2) array of vertex index pairs defining edges.
+    faces: list of arrays, each containing vertex indices for one face.
+    precision: storage format, one of PRECISIONS.
+  """
+
+  dimension = 3
+
+
+class Shape4D(_Shape):
   """Base class for 4D geometric objects.
 
   Attributes:
     vertices: (N, 4) array of 4D vertex positions [x, y, z, w].
     edges: (M, 2) array of vertex index pairs defining edges.
     faces: list of arrays, each containing vertex indices for one face.
+    cells: list of arrays of vertex indices, one per 3-cell (polytopes
+      only; see has_topology('cells')).
+    precision: storage format, one of PRECISIONS.
+    sdf: vectorized signed-distance function of the solid shape, mapping
+      (..., 4) points to (...) distances, or None if the shape has none.
   """
 
-  def __init__(self, vertices, edges, faces=None):
-    self.vertices = np.asarray(vertices, dtype=np.float64)
-    self.edges = np.asarray(edges, dtype=np.int32)
-    self.faces = faces if faces is not None else []
+  dimension = 4
 
-    assert self.vertices.ndim == 2 and self.vertices.shape[1] == 4, \
-      f"vertices must be (N, 4), got {self.vertices.shape}"
-    assert self.edges.ndim == 2 and self.edges.shape[1] == 2, \
-      f"edges must be (M, 2), got {self.edges.shape}"
 
-  @property
-  def num_vertices(self):
-    return self.vertices.shape[0]
+def memory_report(shapes):
+  """Summarize how much memory each shape uses compared to 'full' precision.
 
-  @property
-  def num_edges(self):
-    return self.edges.shape[0]
+  Only topology that has been built is counted.
 
-  @property
-  def num_faces(self):
-    return len(self.faces)
+  Args:
+    shapes: dict mapping a display name to a Shape3D/Shape4D
+
+  Returns:
+    A multi-line string, one line per shape.
+  """
+  lines = []
+  for name, shape in shapes.items():
+    # What the same shape costs as float64 vertices and int32 indices.
+    full = shape.vertices.size * 8 + sum(a.size * 4 for a in shape._built_arrays())
+    used = shape.nbytes
+    saved = full - used
+    percent = 100.0 * saved / full if full else 0.0
+    lines.append(
+      f"{name:<24} {shape.precision:<8} {shape.vertices.dtype.name:>8} "
+      f"{shape.edges.dtype.name:>7}  {used:>10,d} B  "
+      f"(full {full:,d} B, saved {saved:,d} B / {percent:.0f}%)"
+    )
+  return "\n".join(lines)
@@ -0,0 +1,55 @@
+import numpy as np
+from functools import partial
+from geometry.product import make_polygon, product
+from geometry.sdf import sdf_convex, sdf_duocylinder
+
+
+def make_duoprism(n1=6, n2=6, radius1=1.0, radius2=1.0, precision='full'):
+  """Generate the duoprism of a regular n1-gon (in XY) and n2-gon (in ZW).
+
+  The Cartesian product of the two polygons: n1 * n2 vertices, n1 * n2
+  edges along each polygon, n2 copies of the first polygon, n1 copies of
+  the second, and n1 * n2 square faces.
+
+  Args:
+    n1: number of sides of the XY polygon
+    n2: number of sides of the ZW polygon
+    radius1: circumradius of the XY polygon
+    radius2: circumradius of the ZW polygon
+    precision: storage format for the result
+
+  Returns a Shape4D.
+  """
+  shape = product(make_polygon(n1, radius1), make_polygon(n2, radius2), precision=precision)
+
+  # Facets are (polygon side) × (other polygon); their normals point at
+  # the middle of each side, at the polygon's apothem.
+  normals, offsets = [], []
+  for n, radius, axes in ((n1, radius1, [0, 1]), (n2, radius2, [2, 3])):
+    angles = 2 * np.pi * (np.arange(n) + 0.5) / n
+    block = np.zeros((n, 4))
+    block[:, axes] = np.column_stack([np.cos(angles), np.sin(angles)])
+    normals.append(block)
+    offsets.append(np.full(n, radius * np.cos(np.pi / n)))
+  shape.sdf = partial(sdf_convex, normals=np.vstack(normals), offsets=np.concatenate(offsets))
+  return shape
+
+
+def make_duocylinder(radius1=1.0, radius2=1.0, resolution=32, precision='full'):
+  """Generate a duocylinder (disk in XY × disk in ZW).
+
+  The mesh is a resolution × resolution duoprism; its square faces tile
+  the flat torus where the two cylindrical cells meet. The attached
+  signed-distance function is that of the exact, round duocylinder.
+
+  Args:
+    radius1: radius of the XY disk
+    radius2: radius of the ZW disk
+    resolution: number of polygon sides used for each circle
+    precision: storage format for the result
+
+  Returns a Shape4D.
+  """
+  shape = make_duoprism(resolution, resolution, radius1, radius2, precision=precision)
+  shape.sdf = partial(sdf_duocylinder, radius1=radius1, radius2=radius2)
+  return shape
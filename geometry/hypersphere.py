@@ -1,8 +1,11 @@
 import numpy as np
-from geometry.base import Shape4D
+from functools import partial
+from geometry.base import Shape4D, grid_edges
+from geometry.sdf import sdf_hypersphere
+from geometry.weld import weld
 
 
-def make_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0):
+def make_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0, precision='full'):
   """Generate a tessellated 3-sphere (hypersphere) using hyperspherical coords.
 
   The 3-sphere S³ is parameterized by three angles:
@@ -17,7 +20,8 @@ def make_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0):
     w = R * cos(phi1)
 
   The grid has poles at phi1=0 (w=+R) and phi1=pi (w=-R), where
-  all phi2/phi3 values collapse to a single point. Like a UV sphere
+  all phi2/phi3 values collapse to a single point; these coincident
+  vertices are welded together (see geometry.weld). Like a UV sphere
   in 3D, the mesh is denser near the poles. This is a known tradeoff
   for simplicity; more uniform alternatives (Hopf fibration, recursive
   subdivision of a 600-cell) are significantly more complex.
@@ -28,9 +32,10 @@ def make_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0):
     n2: number of steps along phi2 (higher = more latitude lines)
     n3: number of steps along phi3 (longitude, higher = more meridians)
     interpolation: [0,1], 0 for angle interpolation, 1 for axis distance interpolation
+    precision: storage format for the result (see geometry.base.PRECISIONS)
 
   Returns a Shape4D with vertices on S³ and edges connecting adjacent
-  grid points.
+  grid points. Edges are built lazily on first access.
   """
   # Sample the angles. phi1 and phi2 include both endpoints (0 and pi).
   phi1_vals_angle = np.linspace(0, np.pi, n1 + 1)
@@ -44,44 +49,24 @@ def make_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0):
   # phi3 wraps around, so we exclude the endpoint (0 ≈ 2*pi).
   phi3_vals = np.linspace(0, 2 * np.pi, n3, endpoint=False)
 
-  # Generate all vertices on the grid
-  vertices = []
-  # Map (i, j, k) grid indices to vertex index in the flat list
-  idx = {}
+  # Generate all vertices on the grid. indexing='ij' numbers them in the
+  # same (i, j, k) order as three nested loops over phi1, phi2, phi3.
+  p1, p2, p3 = np.meshgrid(phi1_vals, phi2_vals, phi3_vals, indexing='ij')
+  x = radius * np.sin(p1) * np.sin(p2) * np.cos(p3)
+  y = radius * np.sin(p1) * np.sin(p2) * np.sin(p3)
+  z = radius * np.sin(p1) * np.cos(p2)
+  w = radius * np.cos(p1)
+  vertices = np.stack([x, y, z, w], axis=-1).reshape(-1, 4)
 
-  for i, p1 in enumerate(phi1_vals):
-    for j, p2 in enumerate(phi2_vals):
-      for k, p3 in enumerate(phi3_vals):
-        x = radius * np.sin(p1) * np.sin(p2) * np.cos(p3)
-        y = radius * np.sin(p1) * np.sin(p2) * np.sin(p3)
-        z = radius * np.sin(p1) * np.cos(p2)
-        w = radius * np.cos(p1)
-        idx[(i, j, k)] = len(vertices)
-        vertices.append([x, y, z, w])
+  # Edges between adjacent grid points are only built when first used:
+  # along phi1 (toward next ring), along phi2, and along phi3 (wraps).
+  grid = (len(phi1_vals), len(phi2_vals), len(phi3_vals))
 
-  vertices = np.array(vertices, dtype=np.float64)
+  def build_edges(shape):
+    return grid_edges(grid, wrap=(2,))
 
-  # Generate edges between adjacent grid points
-  edge_set = set()
-
-  def add_edge(a, b):
-    if a != b:  # skip degenerate edges at poles
-      edge_set.add((min(a, b), max(a, b)))
-
-  for i in range(len(phi1_vals)):
-    for j in range(len(phi2_vals)):
-      for k in range(len(phi3_vals)):
-        v = idx[(i, j, k)]
-        # Edge along phi1 (toward next ring)
-        if i + 1 < len(phi1_vals):
-          add_edge(v, idx[(i + 1, j, k)])
-        # Edge along phi2
-        if j + 1 < len(phi2_vals):
-          add_edge(v, idx[(i, j + 1, k)])
-        # Edge along phi3 (wraps around)
-        k_next = (k + 1) % len(phi3_vals)
-        add_edge(v, idx[(i, j, k_next)])
-
-  edges = np.array(sorted(edge_set), dtype=np.int32)
-
-  return Shape4D(vertices, edges)
+  shape = Shape4D(vertices, build_edges, precision=precision)
+  shape.sdf = partial(sdf_hypersphere, radius=radius)
+  # Every phi2/phi3 sample at a pole (and along the phi2 = 0, pi axes) is
+  # the same point; merge them so they aren't projected and drawn per frame.
+  return weld(shape)
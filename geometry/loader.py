@@ -0,0 +1,101 @@
+import numpy as np
+
+from geometry.pointcloud import DEFAULT_CHUNK_SIZE, PointCloud4D
+
+
+PROBE_ROWS = 65536  # rows read to estimate the extent of a dataset
+
+
+def open_table(path, num_columns=None, dtype=None, offset=0):
+  """Memory-map a 2D table of numbers without reading it into RAM.
+
+  .npy files are opened with np.load(mmap_mode='r'), which reads the
+  shape and dtype from the header. Any other file is treated as raw
+  row-major binary, so its dtype and number of columns must be given.
+
+  Args:
+    path: file to open
+    num_columns: columns per row (raw files only)
+    dtype: element type, e.g. 'float32' (raw files only)
+    offset: bytes to skip before the first row (raw files only)
+
+  Returns:
+    (N, C) read-only memory-mapped array
+  """
+  if str(path).endswith('.npy'):
+    table = np.load(path, mmap_mode='r')
+  else:
+    assert num_columns is not None and dtype is not None, \
+      "raw binary files need num_columns and dtype"
+    table = np.memmap(path, dtype=dtype, mode='r', offset=offset)
+    assert table.size % num_columns == 0, \
+      f"file holds {table.size} values, not a multiple of {num_columns} columns"
+    table = table.reshape(-1, num_columns)
+  assert table.ndim == 2, f"expected a 2D table, got shape {table.shape}"
+  return table
+
+
+def _column_index(columns):
+  """A slice for consecutive columns (so chunks stay views), else a list."""
+  columns = list(columns)
+  if columns == list(range(columns[0], columns[0] + len(columns))):
+    return slice(columns[0], columns[0] + len(columns))
+  return columns
+
+
+def load_points(path, columns=None, stride=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                fit_radius=None, num_columns=None, dtype=None, offset=0):
+  """Expose four columns of a (possibly larger than RAM) file as a PointCloud4D.
+
+  The file is memory-mapped (see open_table) and read one chunk at a
+  time as the cloud is streamed, so only the pages of the current chunk
+  need to be in memory. Rows are selected before columns, so a stride
+  skips rows without touching them.
+
+  Args:
+    path: .npy file, or raw binary file (then num_columns and dtype are
+          required)
+    columns: the four columns used as x, y, z, w (default: the first four)
+    stride: keep every stride-th row, for a quick preview of huge files
+    chunk_size: points per streamed chunk
+    fit_radius: if given, center the data and scale it so it fits a ball
+                of this radius, as estimated from a sample of rows
+    num_columns, dtype, offset: layout of a raw binary file
+
+  Returns a PointCloud4D. Chunks keep the file's float type; integer
+  data is converted to float64.
+  """
+  table = open_table(path, num_columns=num_columns, dtype=dtype, offset=offset)
+  if columns is None:
+    columns = range(4)
+  assert len(columns) == 4, f"need 4 columns for x, y, z, w, got {len(columns)}"
+  assert max(columns) < table.shape[1], \
+    f"column {max(columns)} out of range for a table with {table.shape[1]} columns"
+  assert stride >= 1, f"stride must be at least 1, got {stride}"
+  cols = _column_index(columns)
+  float_type = table.dtype if np.issubdtype(table.dtype, np.floating) else np.dtype(np.float64)
+  num_points = -(-table.shape[0] // stride)
+
+  # Estimate the extent from rows spread evenly over the file.
+  probe_step = max(1, table.shape[0] // PROBE_ROWS)
+  probe = np.asarray(table[::probe_step, cols], dtype=np.float64)
+  center = np.zeros(4)
+  scale = 1.0
+  if fit_radius is not None and len(probe):
+    center = probe.mean(axis=0)
+    extent = np.linalg.norm(probe - center, axis=1).max()
+    scale = fit_radius / extent if extent > 0 else 1.0
+  radius = float(np.linalg.norm((probe - center) * scale, axis=1).max()) if len(probe) else 0.0
+
+  center = center.astype(float_type)
+  scale = float_type.type(scale)
+  transform = fit_radius is not None
+
+  def chunk_fn(start, stop):
+    rows = table[start * stride:stop * stride:stride]
+    chunk = np.asarray(rows[:, cols], dtype=float_type)
+    if transform:
+      chunk = (chunk - center) * scale
+    return chunk
+
+  return PointCloud4D(chunk_fn, num_points, chunk_size, radius)
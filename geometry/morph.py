@@ -0,0 +1,168 @@
+import numpy as np
+from functools import partial
+from geometry.hypersphere import make_hypersphere
+from geometry.sdf import sdf_hypersphere, sdf_spherinder
+from geometry.sphere import make_sphere
+from geometry.spherinder import make_spherinder
+
+
+# Allowed range of each morphable parameter, (low, high); None is unbounded.
+PARAMETER_RANGES = {
+  'interpolation': (0.0, 1.0),
+  'radius': (0.1, None),
+  'half_height': (0.05, None),
+}
+
+
+def clamp_parameter(name, value):
+  """Clip a parameter value into its PARAMETER_RANGES interval."""
+  low, high = PARAMETER_RANGES[name]
+  return float(np.clip(value, low, high))
+
+
+class MorphableShape:
+  """A generated shape whose parameters change without rebuilding it.
+
+  The shape is generated once. Changing a parameter never alters its
+  topology (vertex count, edges, welds), only where the vertices are, so
+  set() rewrites `shape.vertices` in place and bumps `shape.version`;
+  caches keyed on the shape and its version (GPU uploads, slices,
+  picking) refresh, while anything keyed on the edges (trails, element
+  buffers) is kept.
+
+  The generators place vertices on a grid of angles, and every
+  coordinate is a product of per-axis factors (sines and cosines of one
+  angle each). The per-vertex grid coordinates are found once, so an
+  update only recomputes the factors of the (few) grid lines and
+  gathers them into the existing vertex array.
+
+  Attributes:
+    shape: the Shape3D or Shape4D being morphed
+    params: dict of the current parameter values
+  """
+
+  def __init__(self, shape, params, update):
+    self.shape = shape
+    self.params = dict(params)
+    self._update = update
+
+  def set(self, **params):
+    """Change some parameters and move the vertices to match.
+
+    Returns:
+      True if any parameter changed (and the vertices were rewritten)
+    """
+    unknown = set(params) - set(self.params)
+    assert not unknown, f"unknown parameters {sorted(unknown)}, expected {sorted(self.params)}"
+    for name, value in params.items():
+      low, high = PARAMETER_RANGES[name]
+      assert (low is None or value >= low) and (high is None or value <= high), \
+        f"{name} must be in [{low}, {high}], got {value}"
+    merged = {**self.params, **params}
+    if merged == self.params:
+      return False
+    self.params = merged
+    self._update(self.shape, **merged)
+    self.shape.version += 1
+    return True
+
+
+def _latitudes(n):
+  """Pole-to-pole angle samples of the generators at interpolation 0 and 1."""
+  return np.linspace(0, np.pi, n + 1), np.arccos(np.linspace(1, -1, n + 1))
+
+
+def _blend(endpoints, interpolation):
+  angle, dist = endpoints
+  return (1 - interpolation) * angle + interpolation * dist
+
+
+def _sphere_writer(n_lat, n_lon, source_index):
+  """In-place evaluator of make_sphere()'s welded vertices.
+
+  Returns:
+    write(out, radius, interpolation), filling an (N, 3) array (or view)
+  """
+  theta = _latitudes(n_lat)
+  ring, column = np.unravel_index(source_index, (n_lat + 1, n_lon))
+  phi = np.linspace(0, 2 * np.pi, n_lon, endpoint=False)
+  cos_phi, sin_phi = np.cos(phi)[column], np.sin(phi)[column]
+  scratch = np.empty(len(source_index))
+
+  def write(out, radius, interpolation):
+    t = _blend(theta, interpolation)
+    np.take(radius * np.sin(t), ring, out=scratch)
+    np.multiply(scratch, cos_phi, out=out[:, 0])
+    np.multiply(scratch, sin_phi, out=out[:, 1])
+    np.take(radius * np.cos(t), ring, out=scratch)
+    out[:, 2] = scratch
+
+  return write
+
+
+def morphable_sphere(radius=1.0, n_lat=10, n_lon=12, interpolation=0, precision='full'):
+  """make_sphere() with live radius and interpolation (see MorphableShape)."""
+  shape = make_sphere(radius=radius, n_lat=n_lat, n_lon=n_lon,
+                      interpolation=interpolation, precision=precision)
+  write = _sphere_writer(n_lat, n_lon, shape.source_index)
+
+  def update(shape, radius, interpolation):
+    write(shape.vertices, radius, interpolation)
+
+  return MorphableShape(shape, {'radius': radius, 'interpolation': interpolation}, update)
+
+
+def morphable_spherinder(radius=1.0, n_lat=10, n_lon=12, interpolation=0, half_height=1.0,
+                         precision='full'):
+  """make_spherinder() with live radius, interpolation and half_height.
+
+  The sphere is only evaluated for the bottom cap; the top cap is a copy
+  of it, and W is just +-half_height.
+  """
+  sphere = make_sphere(radius=radius, n_lat=n_lat, n_lon=n_lon,
+                       interpolation=interpolation, precision=precision)
+  write = _sphere_writer(n_lat, n_lon, sphere.source_index)
+  shape = make_spherinder(radius=radius, n_lat=n_lat, n_lon=n_lon,
+                          interpolation=interpolation, half_height=half_height,
+                          precision=precision)
+  n = sphere.num_vertices
+  # The prism stacks the bottom cap (w = -half_height) on the top one.
+  w_sign = np.repeat([-1.0, 1.0], n)
+
+  def update(shape, radius, interpolation, half_height):
+    bottom = shape.vertices[:n, :3]
+    write(bottom, radius, interpolation)
+    shape.vertices[n:, :3] = bottom
+    np.multiply(w_sign, half_height, out=shape.vertices[:, 3])
+    shape.sdf = partial(sdf_spherinder, radius=radius, half_height=half_height)
+
+  params = {'radius': radius, 'interpolation': interpolation, 'half_height': half_height}
+  return MorphableShape(shape, params, update)
+
+
+def morphable_hypersphere(radius=1.5, n1=6, n2=8, n3=12, interpolation=0, precision='full'):
+  """make_hypersphere() with live radius and interpolation (see MorphableShape)."""
+  shape = make_hypersphere(radius=radius, n1=n1, n2=n2, n3=n3,
+                           interpolation=interpolation, precision=precision)
+  phi1, phi2 = _latitudes(n1), _latitudes(n2)
+  i, j, k = np.unravel_index(shape.source_index, (n1 + 1, n2 + 1, n3))
+  phi3 = np.linspace(0, 2 * np.pi, n3, endpoint=False)
+  cos3, sin3 = np.cos(phi3)[k], np.sin(phi3)[k]
+  outer = np.empty(len(i))  # R sin(phi1), per vertex
+  scratch = np.empty(len(i))
+
+  def update(shape, radius, interpolation):
+    p1, p2 = _blend(phi1, interpolation), _blend(phi2, interpolation)
+    out = shape.vertices
+    np.take(radius * np.sin(p1), i, out=outer)
+    np.take(np.sin(p2), j, out=scratch)
+    np.multiply(scratch, outer, out=scratch)
+    np.multiply(scratch, cos3, out=out[:, 0])
+    np.multiply(scratch, sin3, out=out[:, 1])
+    np.take(np.cos(p2), j, out=scratch)
+    np.multiply(scratch, outer, out=out[:, 2])
+    np.take(radius * np.cos(p1), i, out=scratch)
+    out[:, 3] = scratch
+    shape.sdf = partial(sdf_hypersphere, radius=radius)
+
+  return MorphableShape(shape, {'radius': radius, 'interpolation': interpolation}, update)
@@ -1,22 +1,31 @@
 import numpy as np
+from functools import partial
 from itertools import combinations
 from geometry.base import Shape4D
+from geometry.sdf import sdf_convex
 
 
-def make_pentachoron(radius = 2):
+def make_pentachoron(radius = 2, precision='full'):
   """Generate a pentachoron (5-cell / 4D simplex).
 
   The pentachoron is the 4D analogue of the tetrahedron. It has:
     - 5 vertices, all equidistant from each other
     - 10 edges (every pair of vertices is connected)
     - 10 triangular faces (every triple of vertices forms a face)
+    - 5 tetrahedral cells (every four vertices form a cell)
 
   The vertices are constructed by embedding a regular tetrahedron in
   the w=0 hyperplane, then adding a 5th vertex along the +w axis at
   the correct distance to make all edges equal. The result is then
   centered at the origin so rotations behave symmetrically.
 
-  Returns a Shape4D with 5 vertices, 10 edges, 10 triangular faces.
+  Args:
+    radius: distance from the center to each vertex
+    precision: storage format for the result (see geometry.base.PRECISIONS)
+
+  Returns a Shape4D with 5 vertices, 10 edges, 10 triangular faces and
+  5 tetrahedral cells. Edges, faces and cells are built lazily on first
+  access.
   """
   # A regular tetrahedron with edge length 2, centered at the origin in XYZ:
   #   vertex 0: ( 1,  1,  1, 0)
@@ -58,10 +67,25 @@ def make_pentachoron(radius = 2):
   vertices /= max_dist
   vertices *= radius
 
-  # 10 edges: every pair of 5 vertices
-  edges = np.array(list(combinations(range(5), 2)), dtype=np.int32)
+  shape = Shape4D(vertices, _pentachoron_edges, _pentachoron_faces, precision=precision)
+  shape.register_builder('cells', _pentachoron_cells)
+  # Each tetrahedral facet lies opposite one vertex: its outward normal
+  # points away from that vertex, at the inradius R/4 from the center.
+  normals = -vertices / np.linalg.norm(vertices, axis=1, keepdims=True)
+  shape.sdf = partial(sdf_convex, normals=normals, offsets=np.full(5, radius / 4))
+  return shape
+
+
+def _pentachoron_edges(shape):
+  """10 edges: every pair of 5 vertices."""
+  return np.array(list(combinations(range(5), 2)), dtype=np.int32)
+
+
+def _pentachoron_faces(shape):
+  """10 faces: every triple of 5 vertices."""
+  return [np.array(f) for f in combinations(range(5), 3)]
 
-  # 10 faces: every triple of 5 vertices
-  faces = [np.array(f) for f in combinations(range(5), 3)]
 
-  return Shape4D(vertices, edges, faces)
+def _pentachoron_cells(shape):
+  """5 tetrahedral cells: every four of the 5 vertices."""
+  return [np.array(c) for c in combinations(range(5), 4)]
@@ -0,0 +1,135 @@
+import numpy as np
+
+from geometry.base import PRECISIONS
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class PointCloud4D:
+  """A 4D point set that is produced one chunk at a time.
+
+  Unlike Shape4D, a point cloud has no topology and never needs to hold
+  all of its points at once: `chunk_fn(start, stop)` returns the points
+  with indices [start, stop) as a (stop - start, 4) array, and consumers
+  iterate over fixed-size chunks. Points may be generated on the fly,
+  sliced out of an in-memory array, or read from disk.
+
+  Attributes:
+    num_points: total number of points
+    chunk_size: number of points per chunk (the last chunk may be shorter)
+    radius: bound on the distance of any point from the origin, used to
+            scale W colouring (None if unknown)
+  """
+
+  def __init__(self, chunk_fn, num_points, chunk_size=DEFAULT_CHUNK_SIZE, radius=None):
+    assert chunk_size > 0, f"chunk_size must be positive, got {chunk_size}"
+    self.chunk_fn = chunk_fn
+    self.num_points = num_points
+    self.chunk_size = chunk_size
+    self.radius = radius
+
+  @classmethod
+  def from_array(cls, points, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Wrap an existing (N, 4) array. Chunks are views, not copies."""
+    points = np.asarray(points)
+    assert points.ndim == 2 and points.shape[1] == 4, \
+      f"points must be (N, 4), got {points.shape}"
+    radius = float(np.sqrt((points.astype(np.float64)**2).sum(axis=1).max())) if len(points) else 0.0
+    return cls(lambda start, stop: points[start:stop], len(points), chunk_size, radius)
+
+  @property
+  def num_vertices(self):
+    return self.num_points
+
+  def iter_chunks(self):
+    """Yield the points as consecutive (k, 4) arrays of at most chunk_size rows."""
+    for start in range(0, self.num_points, self.chunk_size):
+      yield self.chunk_fn(start, min(start + self.chunk_size, self.num_points))
+
+  def to_array(self):
+    """Materialize every point into one (N, 4) array (for small clouds)."""
+    chunks = list(self.iter_chunks())
+    if not chunks:
+      return np.zeros((0, 4))
+    return np.concatenate(chunks)
+
+
+def sample_hypersphere(num_points=200_000, radius=1.5, chunk_size=DEFAULT_CHUNK_SIZE,
+                       seed=0, precision='full'):
+  """Uniformly distributed points on the 3-sphere S³, generated per chunk.
+
+  Normalizing a standard 4D Gaussian sample gives a direction uniformly
+  distributed on S³ (the Gaussian is rotation invariant). Unlike the
+  angle grid of make_hypersphere(), this has no pole clustering.
+
+  Each chunk is drawn from its own generator seeded with (seed, chunk
+  index), so iterating the cloud again reproduces exactly the same
+  points without ever storing them.
+
+  Args:
+    num_points: total number of points
+    radius: radius of the hypersphere
+    chunk_size: points per chunk
+    seed: base random seed
+    precision: storage format of the chunks (see geometry.base.PRECISIONS)
+
+  Returns a PointCloud4D.
+  """
+  dtype = PRECISIONS[precision]
+
+  def chunk_fn(start, stop):
+    rng = np.random.default_rng([seed, start // chunk_size])
+    points = rng.standard_normal((stop - start, 4))
+    points *= radius / np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(dtype, copy=False)
+
+  return PointCloud4D(chunk_fn, num_points, chunk_size, radius)
+
+
+def reservoir_sample(cloud, k, seed=0):
+  """Uniform random subset of k points from a cloud, in one streaming pass.
+
+  Every point gets a random key and the k points with the smallest keys
+  are kept (a vectorized reservoir sample): each chunk is merged with
+  the current reservoir and cut back to k, so memory stays O(k + chunk
+  size) however large the cloud is. The kept points stay in their
+  original order.
+
+  Args:
+    cloud: the PointCloud4D to sample
+    k: number of points to keep (all of them if the cloud is smaller)
+    seed: random seed
+
+  Returns an in-memory PointCloud4D with min(k, num_points) points.
+  """
+  assert k > 0, f"k must be positive, got {k}"
+  rng = np.random.default_rng(seed)
+  keys = np.empty(0)
+  index = np.empty(0, dtype=np.int64)
+  points = None
+  start = 0
+  for chunk in cloud.iter_chunks():
+    n = len(chunk)
+    chunk_keys = rng.random(n)
+    chunk_index = np.arange(start, start + n)
+    if points is None:
+      points = np.empty((0, 4), dtype=chunk.dtype)
+    if len(keys) == k:
+      # Once the reservoir is full, only keys below its largest can enter.
+      candidates = np.flatnonzero(chunk_keys < keys.max())
+      chunk_keys, chunk_index, chunk = chunk_keys[candidates], chunk_index[candidates], chunk[candidates]
+    keys = np.concatenate([keys, chunk_keys])
+    index = np.concatenate([index, chunk_index])
+    points = np.concatenate([points, chunk])
+    if len(keys) > k:
+      keep = np.argpartition(keys, k - 1)[:k]
+      keys, index, points = keys[keep], index[keep], points[keep]
+    start += n
+
+  if points is None:
+    return PointCloud4D.from_array(np.zeros((0, 4)), cloud.chunk_size)
+  order = np.argsort(index)
+  sample = PointCloud4D.from_array(points[order], cloud.chunk_size)
+  sample.radius = cloud.radius if cloud.radius is not None else sample.radius
+  return sample
@@ -0,0 +1,61 @@
+import itertools
+import numpy as np
+from geometry.base import Shape3D
+
+
+def make_tetrahedron(radius=1.0, precision='full'):
+  """Generate a regular tetrahedron with the given circumradius.
+
+  Uses the alternate corners of a cube, so every pair of vertices is an
+  edge and every triple of vertices is a face.
+
+  Returns a Shape3D with 4 vertices, 6 edges and 4 triangular faces.
+  """
+  vertices = np.array([[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]) / np.sqrt(3)
+  edges = list(itertools.combinations(range(4), 2))
+  faces = list(itertools.combinations(range(4), 3))
+  return Shape3D(radius * vertices, edges, faces, precision=precision)
+
+
+def make_cube(radius=1.0, precision='full'):
+  """Generate a cube with the given circumradius.
+
+  Vertex i has coordinates (±1, ±1, ±1) / sqrt(3) taken from the bits of
+  i (X is the high bit), so two vertices share an edge exactly when their
+  indices differ in one bit.
+
+  Returns a Shape3D with 8 vertices, 12 edges and 6 square faces.
+  """
+  vertices = np.array(list(itertools.product([-1, 1], repeat=3))) / np.sqrt(3)
+  idx = np.arange(8)
+  edges = [(i, i | bit) for bit in (1, 2, 4) for i in idx[idx & bit == 0]]
+
+  # Each face fixes one bit; walk the other two around the square.
+  faces = []
+  for bit in (4, 2, 1):
+    b1, b2 = [b for b in (4, 2, 1) if b != bit]
+    for base in (0, bit):
+      faces.append([base, base | b2, base | b1 | b2, base | b1])
+  return Shape3D(radius * vertices, edges, faces, precision=precision)
+
+
+def make_octahedron(radius=1.0, precision='full'):
+  """Generate a regular octahedron with the given circumradius.
+
+  Vertices are ±X, ±Y, ±Z (vertex 2k is +axis k, 2k + 1 is -axis k).
+  Every pair of non-opposite vertices is an edge, and every choice of one
+  vertex per axis is a face.
+
+  Returns a Shape3D with 6 vertices, 12 edges and 8 triangular faces.
+  """
+  vertices = np.repeat(np.eye(3), 2, axis=0) * np.tile([1, -1], 3)[:, np.newaxis]
+  edges = [(i, j) for i, j in itertools.combinations(range(6), 2) if i // 2 != j // 2]
+  faces = [(x, 2 + y, 4 + z) for x, y, z in itertools.product((0, 1), repeat=3)]
+  return Shape3D(radius * vertices, edges, faces, precision=precision)
+
+
+PLATONIC_SOLIDS = {
+  'tetrahedron': make_tetrahedron,
+  'cube': make_cube,
+  'octahedron': make_octahedron,
+}
@@ -1,58 +1,62 @@
 import numpy as np
-from geometry.base import Shape4D
+from functools import partial
+from geometry.product import make_segment, product
+from geometry.polyhedra import PLATONIC_SOLIDS
+from geometry.sdf import sdf_convex
 
 
-def make_prism(shape3d, half_height=0.5):
+def make_prism(shape3d, half_height=0.5, precision=None):
   """Extrude a 3D shape along the W axis to produce a 4D prism.
 
-  Creates two copies of the 3D shape: one at w = -half_height ("bottom")
-  and one at w = +half_height ("top"). Connects corresponding vertices
-  between the two copies with vertical edges along W.
+  The prism is the Cartesian product of the 3D shape with the segment
+  [-half_height, half_height]: a copy of the 3D shape at w = -half_height
+  ("bottom") and one at w = +half_height ("top"), with corresponding
+  vertices connected by vertical edges along W.
 
   The resulting Shape4D has:
     - 2N vertices (N from bottom + N from top)
     - 2M + N edges (M edges duplicated on both caps + N vertical edges)
     - Original faces duplicated on both caps, plus rectangular side faces
-      connecting each original edge to its copy
+      (a, b, b+N, a+N) connecting each original edge to its copy
 
   Args:
     shape3d: a Shape3D to extrude
     half_height: half the extent along the W axis
+    precision: storage format for the result; defaults to the precision
+               of shape3d
 
   Returns a Shape4D.
   """
-  n = shape3d.num_vertices
-
-  # Bottom copy: original xyz at w = -half_height
-  # Top copy: original xyz at w = +half_height
-  w_bottom = np.full((n, 1), -half_height)
-  w_top = np.full((n, 1), half_height)
-  verts_bottom = np.hstack([shape3d.vertices, w_bottom])
-  verts_top = np.hstack([shape3d.vertices, w_top])
-  vertices = np.vstack([verts_bottom, verts_top])
-
-  # Edges: bottom copy edges, top copy edges (indices shifted by n),
-  # and vertical edges connecting each vertex to its counterpart.
-  edges_bottom = shape3d.edges
-  edges_top = shape3d.edges + n
-  edges_vertical = np.column_stack([np.arange(n), np.arange(n) + n])
-  edges = np.vstack([edges_bottom, edges_top, edges_vertical])
-
-  # Faces: bottom and top cap faces, plus side quads.
-  faces = []
-
-  # Bottom cap faces (same indices)
-  for face in shape3d.faces:
-    faces.append(np.array(face))
-
-  # Top cap faces (shifted by n)
-  for face in shape3d.faces:
-    faces.append(np.array(face) + n)
-
-  # Side faces: for each original edge (a, b), the side quad is
-  # (a, b, b+n, a+n) — a rectangle connecting bottom edge to top edge.
-  for e in shape3d.edges:
-    a, b = e[0], e[1]
-    faces.append(np.array([a, b, b + n, a + n]))
-
-  return Shape4D(vertices, edges, faces)
+  # The segment is stored in the 3D shape's dtype so compact shapes
+  # aren't upcast.
+  segment = make_segment(half_height).with_precision(shape3d.precision)
+  return product(shape3d, segment, precision=precision)
+
+
+def make_platonic_prism(solid='cube', radius=1.5, half_height=1.0, precision='full'):
+  """Prism of a Platonic solid (e.g. the tetrahedral or octahedral prism).
+
+  Args:
+    solid: one of PLATONIC_SOLIDS ('tetrahedron', 'cube', 'octahedron')
+    radius: circumradius of the solid
+    half_height: half the extent along the W axis
+    precision: storage format for the result
+
+  Returns a Shape4D with a signed-distance function.
+  """
+  assert solid in PLATONIC_SOLIDS, \
+    f"solid must be one of {sorted(PLATONIC_SOLIDS)}, got '{solid}'"
+  shape3d = PLATONIC_SOLIDS[solid](radius=radius, precision=precision)
+  shape = make_prism(shape3d, half_height=half_height)
+
+  # The solids are centered at the origin, so each face's centroid points
+  # along its outward normal; the prism adds the two caps along W.
+  centroids = np.array([shape3d.vertices[f].astype(np.float64).mean(axis=0)
+                        for f in shape3d.faces])
+  offsets = np.linalg.norm(centroids, axis=1)
+  normals = np.zeros((len(centroids) + 2, 4))
+  normals[:-2, :3] = centroids / offsets[:, np.newaxis]
+  normals[-2:, 3] = [-1, 1]
+  offsets = np.concatenate([offsets, [half_height, half_height]])
+  shape.sdf = partial(sdf_convex, normals=normals, offsets=offsets)
+  return shape
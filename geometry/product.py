@@ -0,0 +1,173 @@
+import numpy as np
+
+from geometry.base import Shape1D, Shape2D, Shape3D, Shape4D, ragged_ranges, unpack_faces
+
+
+SHAPE_TYPES = {1: Shape1D, 2: Shape2D, 3: Shape3D, 4: Shape4D}
+
+
+def _packed_elements(shape, k):
+  """The k-dimensional elements of a factor, packed like 'packed_faces'.
+
+  Vertices, edges and faces come from the shape's topology; a 3D factor
+  is a single solid, so its only 3-element is all of its vertices.
+  """
+  n = shape.num_vertices
+  if k == 0:
+    return np.arange(n, dtype=np.int64), np.ones(n, dtype=np.int64)
+  if k == 1:
+    return shape.edges.astype(np.int64).reshape(-1), np.full(shape.num_edges, 2, dtype=np.int64)
+  if k == 2:
+    indices, lengths = shape.topology('packed_faces')
+    return indices.astype(np.int64), lengths
+  if k == 3 and shape.dimension == 3:
+    return np.arange(n, dtype=np.int64), np.array([n], dtype=np.int64)
+  return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+
+def _packed_product(packed_a, packed_b, na):
+  """Products of every element of a with every element of b, packed.
+
+  Element pairs run over b's elements, then a's within each; a pair's
+  vertices are all (u, v) with u in the element of a and v in that of b.
+  """
+  indices_a, lengths_a = packed_a
+  indices_b, lengths_b = packed_b
+  starts_a = np.cumsum(lengths_a) - lengths_a
+  starts_b = np.cumsum(lengths_b) - lengths_b
+  pair_a = np.tile(np.arange(len(lengths_a)), len(lengths_b))
+  pair_b = np.repeat(np.arange(len(lengths_b)), len(lengths_a))
+  lengths = lengths_a[pair_a] * lengths_b[pair_b]
+  # Position of each product vertex within its pair, split into the
+  # corner of b (slow) and the corner of a (fast).
+  pair = np.repeat(np.arange(len(lengths)), lengths)
+  local = ragged_ranges(np.zeros(len(lengths), dtype=np.int64), lengths)
+  corner_b, corner_a = np.divmod(local, lengths_a[pair_a][pair])
+  u = indices_a[starts_a[pair_a][pair] + corner_a]
+  v = indices_b[starts_b[pair_b][pair] + corner_b]
+  return v * na + u, lengths
+
+
+def product(a, b, precision=None):
+  """Cartesian product of two shapes, e.g. polygon × polygon or solid × segment.
+
+  The product's vertices are all pairs (u, v) of a vertex u of `a` and a
+  vertex v of `b`, with coordinates concatenated. Pair (i, j) gets index
+  j * len(a) + i, so the result holds one full copy of `a` per vertex of
+  `b`, in order (for a prism: the bottom copy, then the top copy).
+
+  Topology follows from the product rule:
+    - edges: (edge of a) × (vertex of b), then (vertex of a) × (edge of b)
+    - faces: (face of a) × (vertex of b), then (vertex of a) × (face of b),
+      then (edge of a) × (edge of b) as quads
+    - 3-cells, for a 4D product: (solid a) × (vertex of b),
+      (face of a) × (edge of b), (edge of a) × (face of b) and
+      (vertex of a) × (solid b), where a 3D factor is one solid cell
+      (so a prism gets its two caps and one prism per face). Factors
+      without faces would leave part of the boundary uncovered, so
+      their products get no cells.
+
+  Every block is produced by broadcasting index arithmetic over whole
+  arrays, never by looping over elements. Faces are computed in packed
+  form (the 'packed_faces' topology, read from the factors' packed
+  faces) and only split into the per-face list when 'faces' is asked
+  for. Edges, faces and cells are built lazily, like the rest of the
+  generators.
+
+  Args:
+    a: first factor (Shape1D/Shape2D/Shape3D)
+    b: second factor; a.dimension + b.dimension must be at most 4
+    precision: storage format of the result; defaults to a's precision
+
+  Returns a shape of dimension a.dimension + b.dimension.
+  """
+  dimension = a.dimension + b.dimension
+  assert dimension in SHAPE_TYPES, \
+    f"product dimension must be at most 4, got {a.dimension} + {b.dimension}"
+  if precision is None:
+    precision = a.precision
+
+  na, nb = a.num_vertices, b.num_vertices
+  dtype = np.promote_types(a.vertices.dtype, b.vertices.dtype)
+  vertices = np.concatenate([
+    np.tile(a.vertices.astype(dtype, copy=False), (nb, 1)),
+    np.repeat(b.vertices.astype(dtype, copy=False), na, axis=0),
+  ], axis=1)
+
+  # Offset of copy j of `a` in the product's vertex numbering.
+  copy_offset = np.arange(nb, dtype=np.int64) * na
+
+  def build_edges(shape):
+    # Index types of compact factors are too narrow for the product's
+    # indices, so widen everything to int64 before the arithmetic.
+    edges_a = a.edges.astype(np.int64)
+    edges_b = b.edges.astype(np.int64)
+    along_a = edges_a[np.newaxis, :, :] + copy_offset[:, np.newaxis, np.newaxis]
+    along_b = edges_b[:, np.newaxis, :] * na + np.arange(na)[np.newaxis, :, np.newaxis]
+    return np.concatenate([along_a.reshape(-1, 2), along_b.reshape(-1, 2)])
+
+  def build_packed_faces(shape):
+    indices_a, lengths_a = a.topology('packed_faces')
+    indices_b, lengths_b = b.topology('packed_faces')
+    indices_a, indices_b = indices_a.astype(np.int64), indices_b.astype(np.int64)
+    # (face of a) x (vertex of b): all faces of a, once per copy.
+    copies = indices_a[np.newaxis, :] + copy_offset[:, np.newaxis]
+    indices, lengths = [copies.reshape(-1)], [np.tile(lengths_a, nb)]
+    # (vertex of a) x (face of b): each face of b, once per vertex of a.
+    face_lengths = np.repeat(lengths_b, na)
+    starts_b = np.cumsum(lengths_b) - lengths_b
+    corners = indices_b[ragged_ranges(np.repeat(starts_b, na), face_lengths)]
+    vertex_a = np.repeat(np.tile(np.arange(na), len(lengths_b)), face_lengths)
+    indices.append(corners * na + vertex_a)
+    lengths.append(face_lengths)
+    if a.num_edges and b.num_edges:
+      ea = a.edges.astype(np.int64)[np.newaxis, :, :]   # (1, Ma, 2)
+      eb = b.edges.astype(np.int64)[:, np.newaxis, :] * na  # (Mb, 1, 2)
+      quads = np.stack([
+        eb[..., 0] + ea[..., 0], eb[..., 0] + ea[..., 1],
+        eb[..., 1] + ea[..., 1], eb[..., 1] + ea[..., 0],
+      ], axis=-1)
+      indices.append(quads.reshape(-1))
+      lengths.append(np.full(quads.shape[0] * quads.shape[1], 4, dtype=np.int64))
+    return np.concatenate(indices), np.concatenate(lengths)
+
+  def build_faces(shape):
+    return unpack_faces(*shape.topology('packed_faces'))
+
+  result = SHAPE_TYPES[dimension](vertices, build_edges, build_faces, precision=precision)
+  def build_cells(shape):
+    blocks = [_packed_product(_packed_elements(a, k), _packed_elements(b, 3 - k), na)
+              for k in (3, 2, 1, 0)]
+    return unpack_faces(np.concatenate([indices for indices, _ in blocks]),
+                        np.concatenate([lengths for _, lengths in blocks]))
+
+  result = SHAPE_TYPES[dimension](vertices, build_edges, build_faces, precision=precision)
+  result.register_builder('packed_faces', build_packed_faces)
+  # A polygon or solid without faces (e.g. a sphere's wireframe) leaves
+  # parts of the boundary in no cell, so such products get no cells.
+  if dimension == 4 and all(f.dimension < 2 or len(f.topology('packed_faces')[1])
+                            for f in (a, b)):
+    result.register_builder('cells', build_cells)
+  return result
+
+
+def make_segment(half_length=1.0, precision='full'):
+  """A line segment from -half_length to +half_length (two vertices, one edge)."""
+  return Shape1D([[-half_length], [half_length]], [[0, 1]], precision=precision)
+
+
+def make_polygon(n=6, radius=1.0, precision='full'):
+  """A regular n-gon in the plane, centered at the origin.
+
+  Args:
+    n: number of sides (at least 3)
+    radius: circumradius
+    precision: storage format for the result
+
+  Returns a Shape2D with n vertices, n edges and one n-sided face.
+  """
+  assert n >= 3, f"a polygon needs at least 3 sides, got {n}"
+  angles = 2 * np.pi * np.arange(n) / n
+  vertices = radius * np.column_stack([np.cos(angles), np.sin(angles)])
+  edges = np.column_stack([np.arange(n), (np.arange(n) + 1) % n])
+  return Shape2D(vertices, edges, [np.arange(n)], precision=precision)
@@ -0,0 +1,130 @@
+import numpy as np
+
+from geometry.base import ragged_ranges, unpack_faces
+
+
+def morton_codes(vertices, bits=None):
+  """Z-order (Morton) curve position of each vertex.
+
+  Coordinates are quantized to 2**bits steps over the bounding box of the
+  vertices, and the bits of all coordinates are interleaved (bit b of
+  axis k becomes bit b * D + k of the code), so vertices that are close in
+  space tend to get close codes.
+
+  Args:
+    vertices: (N, D) array of positions
+    bits: quantization bits per axis (default: as many as fit 64 bits)
+
+  Returns:
+    (N,) uint64 array of codes
+  """
+  vertices = np.asarray(vertices, dtype=np.float64)
+  n, d = vertices.shape
+  if bits is None:
+    bits = min(64 // d, 21)
+  assert bits * d <= 64, f"{bits} bits per axis do not fit 64-bit codes in {d}D"
+  if n == 0:
+    return np.zeros(0, dtype=np.uint64)
+  lo = vertices.min(axis=0)
+  extent = vertices.max(axis=0) - lo
+  scale = np.where(extent > 0, (2**bits - 1) / np.where(extent > 0, extent, 1), 0)
+  q = np.rint((vertices - lo) * scale).astype(np.uint64)
+
+  codes = np.zeros(n, dtype=np.uint64)
+  one = np.uint64(1)
+  for b in range(bits):
+    for axis in range(d):
+      codes |= ((q[:, axis] >> np.uint64(b)) & one) << np.uint64(b * d + axis)
+  return codes
+
+
+def morton_order(vertices, bits=None):
+  """Permutation that sorts vertices along the Z-order curve (stable)."""
+  return np.argsort(morton_codes(vertices, bits), kind='stable')
+
+
+def reorder_edges(edges, new_index):
+  """Renumber edges and sort them so endpoint gathers walk memory forward.
+
+  Returns:
+    (M, 2) int64 array of (min, max) pairs in lexicographic order
+  """
+  edges = np.sort(new_index[np.asarray(edges, dtype=np.int64)], axis=1)
+  return edges[np.lexsort((edges[:, 1], edges[:, 0]))].reshape(-1, 2)
+
+
+def reorder_faces(packed_faces, new_index):
+  """Renumber packed faces and sort them by their lowest vertex (stable).
+
+  Corner order within each face is kept, so orientation is unchanged.
+
+  Args:
+    packed_faces: (indices, lengths) tuple (see build_packed_faces)
+    new_index: (N,) array, the new index of each old vertex
+
+  Returns:
+    (indices, lengths) tuple of int64 arrays
+  """
+  indices, lengths = packed_faces
+  indices = new_index[np.asarray(indices, dtype=np.int64)]
+  lengths = np.asarray(lengths, dtype=np.int64)
+  if len(lengths) == 0:
+    return indices, lengths
+  starts = np.cumsum(lengths) - lengths
+  order = np.argsort(np.minimum.reduceat(indices, starts), kind='stable')
+  return indices[ragged_ranges(starts[order], lengths[order])], lengths[order]
+
+
+def reorder(shape, order=None):
+  """Renumber a shape's vertices for locality of memory access.
+
+  This is for meshes in arbitrary vertex order, e.g. loaded from a file
+  or welded from a point soup, where the two endpoints of an edge can
+  sit anywhere in the vertex array. Sorting the vertices along a
+  space-filling curve (morton_order) and then the edges by their
+  renumbered endpoints makes the gathers done when projecting and
+  drawing such a mesh read memory nearly sequentially. The generators'
+  own numbering is already local enough: benchmarks/reorder.py gathers
+  it as fast as Z-order, and only a random order is slow.
+
+  Vertices are permuted immediately; edges and faces stay lazy and are
+  remapped from the input shape's topology on first access (faces in
+  packed form, so product shapes stay packed), and so are the 3-cells
+  of a polytope. Other topology registered on the input shape is not
+  carried over, since its meaning is unknown here. Like weld(), the result keeps `source_index`,
+  the index in the input shape of each vertex.
+
+  Args:
+    shape: a Shape3D or Shape4D
+    order: permutation of the vertices to apply (default: morton_order)
+
+  Returns a new shape of the same type and precision.
+  """
+  if order is None:
+    order = morton_order(shape.vertices)
+  order = np.asarray(order, dtype=np.int64)
+  assert order.shape == (shape.num_vertices,), \
+    f"order must be a permutation of {shape.num_vertices} vertices, got shape {order.shape}"
+  new_index = np.empty_like(order)
+  new_index[order] = np.arange(len(order))
+
+  def build_edges(reordered):
+    return reorder_edges(shape.edges, new_index)
+
+  def build_packed_faces(reordered):
+    return reorder_faces(shape.topology('packed_faces'), new_index)
+
+  def build_faces(reordered):
+    return unpack_faces(*reordered.topology('packed_faces'))
+
+  def build_cells(reordered):
+    return [new_index[c.astype(np.int64)] for c in shape.topology('cells')]
+
+  reordered = type(shape)(shape.vertices[order], build_edges, build_faces,
+                          precision=shape.precision)
+  reordered.register_builder('packed_faces', build_packed_faces)
+  if shape.has_topology('cells'):
+    reordered.register_builder('cells', build_cells)
+  reordered.sdf = shape.sdf
+  reordered.source_index = order
+  return reordered
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+# Signed-distance functions for the built-in 4D shapes.
+#
+# Each function takes points as a (..., 4) array and returns a (...)
+# array: negative inside the shape, positive outside, zero on the
+# surface. They are fully vectorized so a renderer can evaluate a whole
+# tile of rays (or a whole slicing grid) in one call.
+#
+# Generators attach the matching function to their result as `shape.sdf`
+# (bound to the shape's parameters with functools.partial, which keeps it
+# picklable for process pools).
+
+
+def sdf_hypersphere(p, radius=1.5):
+  """Exact distance to a 3-sphere of the given radius centered at the origin."""
+  return np.linalg.norm(p, axis=-1) - radius
+
+
+def sdf_spherinder(p, radius=1.0, half_height=1.0):
+  """Exact distance to a spherinder (ball of `radius` in XYZ × |w| <= half_height).
+
+  Like a capped cylinder one dimension up: combine the distance to the
+  ball cross-section and the distance to the W slab.
+  """
+  d_ball = np.linalg.norm(p[..., :3], axis=-1) - radius
+  d_slab = np.abs(p[..., 3]) - half_height
+  outside = np.hypot(np.maximum(d_ball, 0), np.maximum(d_slab, 0))
+  inside = np.minimum(np.maximum(d_ball, d_slab), 0)
+  return outside + inside
+
+
+def sdf_duocylinder(p, radius1=1.0, radius2=1.0):
+  """Exact distance to a duocylinder (disk in XY × disk in ZW).
+
+  The same combination as sdf_spherinder, with the two factors being the
+  distance to the XY disk and the distance to the ZW disk.
+  """
+  d_xy = np.linalg.norm(p[..., :2], axis=-1) - radius1
+  d_zw = np.linalg.norm(p[..., 2:], axis=-1) - radius2
+  outside = np.hypot(np.maximum(d_xy, 0), np.maximum(d_zw, 0))
+  inside = np.minimum(np.maximum(d_xy, d_zw), 0)
+  return outside + inside
+
+
+def sdf_box(p, half_size=1.0):
+  """Exact distance to an axis-aligned 4D box (a tesseract for equal sides)."""
+  q = np.abs(p) - half_size
+  outside = np.linalg.norm(np.maximum(q, 0), axis=-1)
+  inside = np.minimum(q.max(axis=-1), 0)
+  return outside + inside
+
+
+def sdf_convex(p, normals, offsets):
+  """Distance bound for a convex polytope given by its facet hyperplanes.
+
+  The polytope is {p : p · n_i <= offset_i for all i}. The largest signed
+  distance to the facet hyperplanes is exact inside and a lower bound on
+  the true distance outside, which is all sphere tracing needs.
+
+  Args:
+    p: (..., 4) points
+    normals: (F, 4) unit outward facet normals
+    offsets: (F,) distances of the facet hyperplanes from the origin
+  """
+  return (p @ np.asarray(normals).T - offsets).max(axis=-1)
@@ -1,8 +1,9 @@
 import numpy as np
-from geometry.base import Shape3D
+from geometry.base import Shape3D, grid_edges
+from geometry.weld import weld
 
 
-def make_sphere(radius=1.0, n_lat=10, n_lon=12, interpolation=0):
+def make_sphere(radius=1.0, n_lat=10, n_lon=12, interpolation=0, precision='full'):
   """Generate a tessellated 2-sphere using spherical coordinates.
 
   Parameterized by two angles:
@@ -19,44 +20,29 @@ def make_sphere(radius=1.0, n_lat=10, n_lon=12, interpolation=0):
     n_lat: number of latitude steps (pole to pole)
     n_lon: number of longitude steps (around the equator)
     interpolation: [0,1], 0 for angle interpolation, 1 for axis distance interpolation
+    precision: storage format for the result (see geometry.base.PRECISIONS)
 
   Returns a Shape3D with vertices on S² and edges connecting adjacent
-  grid points.
+  grid points. Edges are built lazily on first access.
   """
   theta_vals_angle = np.linspace(0, np.pi, n_lat + 1)
   theta_vals_dist = np.arccos(np.linspace(1, -1, n_lat + 1))
   theta_vals = (1 - interpolation) * theta_vals_angle + interpolation * theta_vals_dist
   phi_vals = np.linspace(0, 2 * np.pi, n_lon, endpoint=False)
 
-  vertices = []
-  idx = {}
+  # Vertices in (i, j) order: latitude rings, then longitude within a ring.
+  theta, phi = np.meshgrid(theta_vals, phi_vals, indexing='ij')
+  x = radius * np.sin(theta) * np.cos(phi)
+  y = radius * np.sin(theta) * np.sin(phi)
+  z = radius * np.cos(theta)
+  vertices = np.stack([x, y, z], axis=-1).reshape(-1, 3)
 
-  for i, theta in enumerate(theta_vals):
-    for j, phi in enumerate(phi_vals):
-      x = radius * np.sin(theta) * np.cos(phi)
-      y = radius * np.sin(theta) * np.sin(phi)
-      z = radius * np.cos(theta)
-      idx[(i, j)] = len(vertices)
-      vertices.append([x, y, z])
+  # Edges along theta (toward next latitude ring) and along phi (wraps
+  # around), built on first access.
+  grid = (len(theta_vals), len(phi_vals))
 
-  vertices = np.array(vertices, dtype=np.float64)
+  def build_edges(shape):
+    return grid_edges(grid, wrap=(1,))
 
-  edge_set = set()
-
-  def add_edge(a, b):
-    if a != b:  # skip degenerate edges at poles
-      edge_set.add((min(a, b), max(a, b)))
-
-  for i in range(len(theta_vals)):
-    for j in range(len(phi_vals)):
-      v = idx[(i, j)]
-      # Edge along theta (toward next latitude ring)
-      if i + 1 < len(theta_vals):
-        add_edge(v, idx[(i + 1, j)])
-      # Edge along phi (wraps around)
-      j_next = (j + 1) % len(phi_vals)
-      add_edge(v, idx[(i, j_next)])
-
-  edges = np.array(sorted(edge_set), dtype=np.int32)
-
-  return Shape3D(vertices, edges)
+  # The whole first and last latitude rings sit on the poles; weld them.
+  return weld(Shape3D(vertices, build_edges, precision=precision))
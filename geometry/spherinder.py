@@ -1,8 +1,11 @@
 from geometry.sphere import make_sphere
+from functools import partial
 from geometry.prism import make_prism
+from geometry.sdf import sdf_spherinder
 
 
-def make_spherinder(radius=1.0, n_lat=10, n_lon=12, interpolation=0, half_height=1.0):
+def make_spherinder(radius=1.0, n_lat=10, n_lon=12, interpolation=0, half_height=1.0,
+                    precision='full'):
   """Generate a spherinder (sphere × line segment) by extruding a sphere.
 
   A spherinder is the Cartesian product of a 2-sphere and a line segment.
@@ -15,8 +18,12 @@ def make_spherinder(radius=1.0, n_lat=10, n_lon=12, interpolation=0, half_height
     n_lon: longitude resolution of the sphere mesh
     interpolation: [0,1], 0 for angle interpolation, 1 for axis distance interpolation
     half_height: half the extension along the W axis
+    precision: storage format for the result (see geometry.base.PRECISIONS)
 
   Returns a Shape4D.
   """
-  sphere = make_sphere(radius=radius, n_lat=n_lat, n_lon=n_lon, interpolation=interpolation)
-  return make_prism(sphere, half_height=half_height)
+  sphere = make_sphere(radius=radius, n_lat=n_lat, n_lon=n_lon, interpolation=interpolation,
+                       precision=precision)
+  shape = make_prism(sphere, half_height=half_height)
+  shape.sdf = partial(sdf_spherinder, radius=radius, half_height=half_height)
+  return shape
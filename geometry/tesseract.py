@@ -1,21 +1,36 @@
 import numpy as np
+from functools import partial
 from itertools import product
 from geometry.base import Shape4D
+from geometry.sdf import sdf_box
 
 
-def make_tesseract():
+def make_tesseract(precision='full'):
   """Generate a tesseract (4D hypercube) with vertices at (±1, ±1, ±1, ±1).
 
+  Args:
+    precision: storage format for the result (see geometry.base.PRECISIONS)
+
   Returns a Shape4D with:
     - 16 vertices (all combinations of ±1 in 4 coordinates)
     - 32 edges (between vertices differing in exactly 1 coordinate)
     - 24 square faces (between vertices differing in exactly 2 coordinates,
       with the other 2 coordinates fixed)
+    - 8 cubic cells (one coordinate fixed at ±1)
+  Edges, faces and cells are built lazily on first access.
   """
   # 16 vertices: all combinations of -1 and +1 in 4 dimensions
   vertices = np.array(list(product([-1, 1], repeat=4)), dtype=np.float64)
 
-  # 32 edges: connect vertices that differ in exactly 1 coordinate.
+  shape = Shape4D(vertices, _tesseract_edges, _tesseract_faces, precision=precision)
+  shape.register_builder('cells', _tesseract_cells)
+  shape.sdf = partial(sdf_box, half_size=1.0)
+  return shape
+
+
+def _tesseract_edges(shape):
+  """32 edges: connect vertices that differ in exactly 1 coordinate."""
+  vertices = shape.vertices
   # Two vertices at Hamming distance 1 share an edge.
   edges = []
   for i in range(len(vertices)):
@@ -23,9 +38,12 @@ def make_tesseract():
       diff = np.abs(vertices[i] - vertices[j])
       if np.sum(diff) == 2:  # exactly 1 coord differs by 2 (from -1 to +1)
         edges.append([i, j])
-  edges = np.array(edges, dtype=np.int32)
+  return np.array(edges, dtype=np.int32)
 
-  # 24 square faces: pick 2 axes to vary, fix the other 2.
+
+def _tesseract_faces(shape):
+  """24 square faces: pick 2 axes to vary, fix the other 2."""
+  vertices = shape.vertices
   # There are C(4,2) = 6 axis pairs, and 2^2 = 4 sign choices for the
   # fixed axes, giving 6 * 4 = 24 faces.
   faces = []
@@ -48,5 +66,10 @@ def make_tesseract():
           angles = np.arctan2(relative[:, b], relative[:, a])
           order = np.argsort(angles)
           faces.append(face_vert_idxs[order])
+  return faces
+
 
-  return Shape4D(vertices, edges, faces)
+def _tesseract_cells(shape):
+  """8 cubic cells: fix one axis at -1 or +1, the 8 vertices on that side."""
+  vertices = shape.vertices
+  return [np.flatnonzero(vertices[:, axis] == sign) for axis in range(4) for sign in (-1, 1)]
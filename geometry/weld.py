@@ -0,0 +1,225 @@
+import numpy as np
+
+
+DEFAULT_TOLERANCE = 1e-9
+CELL_WIDTH = 16  # spatial hash cell size, in tolerances
+
+
+def _pairs_with(points, cells, starts, counts, order):
+  """Expand (point, cell) pairs into (point, other point in that cell) pairs."""
+  n = counts[cells]
+  first = np.repeat(points, n)
+  # Position of each expanded pair within its cell's run of points.
+  rank = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+  second = order[np.repeat(starts[cells], n) + rank]
+  return first, second
+
+
+def _components(num, a, b):
+  """Label every node with the smallest node of its connected component."""
+  labels = np.arange(num)
+  while True:
+    low = np.minimum(labels[a], labels[b])
+    before = labels.copy()
+    np.minimum.at(labels, a, low)
+    np.minimum.at(labels, b, low)
+    labels = labels[labels]  # pointer jumping
+    if np.array_equal(labels, before):
+      return labels
+
+
+def _cell_hashes(keys):
+  """64-bit hash of each row of integer cell coordinates.
+
+  The hash is linear (modulo 2^64), so the hash of a neighbouring cell
+  is the hash of the cell plus that of the step to it.
+  """
+  multipliers = np.random.default_rng(0).integers(1, 2**63, size=keys.shape[1], dtype=np.uint64)
+  with np.errstate(over='ignore'):
+    return (keys.astype(np.uint64) * (multipliers | np.uint64(1))).sum(axis=1, dtype=np.uint64)
+
+
+def _close_pairs(vertices, tolerance):
+  """All pairs of vertices within `tolerance` of each other (per coordinate).
+
+  Vertices are hashed to cells CELL_WIDTH tolerances wide, centred on
+  multiples of the cell size so exact values like 0 or 1.5 sit far from
+  a cell boundary. A close pair is either in one cell, or one of its
+  points is within `tolerance` of the face between their cells; only
+  those points probe the (up to 2^D - 1) neighbouring cells on that side.
+  Cells are looked up by hash; a collision only adds candidates, which
+  the final distance check removes.
+
+  Returns:
+    (a, b): int64 arrays of vertex indices, one entry per pair found
+  """
+  n, d = vertices.shape
+  scaled = vertices / tolerance
+  keys = np.round(scaled / CELL_WIDTH).astype(np.int64)
+  hashes = _cell_hashes(keys)
+  cells, cell_of, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+  order = np.argsort(cell_of, kind='stable')
+  starts = np.cumsum(counts) - counts
+
+  # Every point with every other point of its own cell.
+  shared = np.flatnonzero(counts[cell_of] > 1)
+  a, b = _pairs_with(shared, cell_of[shared], starts, counts, order)
+
+  # Points within a tolerance of a cell face with the points of the
+  # neighbours on that side: the non-zero corners of the unit cube, moved
+  # only along the probing axes.
+  local = scaled - CELL_WIDTH * keys
+  side = np.where(local <= 1 - CELL_WIDTH / 2, -1, np.where(local >= CELL_WIDTH / 2 - 1, 1, 0))
+  near = np.flatnonzero(np.any(side != 0, axis=1))
+  steps = np.array(np.meshgrid(*[[0, 1]] * d, indexing='ij')).reshape(d, -1).T[1:]
+  valid = np.all(steps[np.newaxis] <= (side[near] != 0)[:, np.newaxis], axis=2)
+  point_index, step_index = np.nonzero(valid)
+  probe_point = near[point_index]
+  with np.errstate(over='ignore'):
+    probe_hash = hashes[probe_point] + _cell_hashes(steps[step_index] * side[probe_point])
+  neighbour = np.minimum(np.searchsorted(cells, probe_hash), len(cells) - 1)
+  found = cells[neighbour] == probe_hash
+  a2, b2 = _pairs_with(probe_point[found], neighbour[found], starts, counts, order)
+
+  a, b = np.concatenate([a, a2]), np.concatenate([b, b2])
+  close = (a != b) & np.all(np.abs(vertices[a] - vertices[b]) <= tolerance, axis=1)
+  return a[close], b[close]
+
+
+def weld_map(vertices, tolerance=DEFAULT_TOLERANCE):
+  """Find groups of coincident vertices with a spatial hash.
+
+  Any two vertices within `tolerance` of each other (per coordinate) end
+  up in the same group, as do chains of such pairs (groups are the
+  connected components of the "close" relation), even when the points
+  straddle a hash cell boundary. Points that agree to within a 1/1024th
+  of the tolerance, like the ±1e-16 coordinates of a pole computed
+  through different angles, are collapsed first, so a pole shared by
+  thousands of grid points costs no pairwise comparisons.
+
+  The first vertex of each group (in the original order) represents it,
+  and groups keep the order of their representatives, so a mesh with no
+  duplicates is unchanged. The tolerance should be far below the real
+  vertex spacing.
+
+  Args:
+    vertices: (N, D) array of positions
+    tolerance: vertices closer than this (per coordinate) are merged
+
+  Returns:
+    (representatives, inverse): indices of the kept vertices, and for
+    every original vertex the index of the welded vertex it maps to.
+  """
+  vertices = np.asarray(vertices, dtype=np.float64)
+  fine = np.round(vertices * (1024 / tolerance)).astype(np.int64)
+  _, first, fine_of = np.unique(fine, axis=0, return_index=True, return_inverse=True)
+  fine_of = fine_of.reshape(-1)
+
+  a, b = _close_pairs(vertices[first], tolerance)
+  labels = _components(len(first), a, b)
+  # Label each group by its earliest vertex, so sorting the labels keeps
+  # the groups in order of first occurrence.
+  earliest = np.full(len(first), len(vertices), dtype=np.int64)
+  np.minimum.at(earliest, labels, first)
+  representatives, inverse = np.unique(earliest[labels[fine_of]], return_inverse=True)
+  return representatives, inverse.reshape(-1)
+
+
+def remap_edges(edges, inverse):
+  """Renumber edges through a weld map, dropping zero-length and repeated ones.
+
+  Returns:
+    (M', 2) int64 array of sorted (min, max) pairs in lexicographic order
+  """
+  edges = inverse[np.asarray(edges, dtype=np.int64)]
+  edges = edges[edges[:, 0] != edges[:, 1]]
+  edges = np.sort(edges, axis=1)
+  return np.unique(edges, axis=0).reshape(-1, 2)
+
+
+def remap_faces(faces, inverse):
+  """Renumber faces through a weld map.
+
+  Corners that collapse onto an earlier corner of the same face are
+  removed (a quad with two welded corners becomes a triangle), faces
+  left with fewer than three corners are dropped, and faces over the
+  same set of vertices are kept only once. Faces are processed in groups
+  of equal length, so the work is vectorized per group rather than per
+  face.
+
+  Returns:
+    list of int64 arrays, in the original face order
+  """
+  if len(faces) == 0:
+    return []
+  lengths = np.array([len(f) for f in faces])
+  result = [None] * len(faces)
+  for k in np.unique(lengths):
+    idx = np.flatnonzero(lengths == k)
+    block = inverse[np.array([faces[i] for i in idx], dtype=np.int64)]
+    # A corner survives if no earlier corner of the face maps to the same
+    # welded vertex.
+    earlier = np.tril(np.ones((k, k), dtype=bool), -1)
+    keep = ~np.any((block[:, :, np.newaxis] == block[:, np.newaxis, :]) & earlier, axis=2)
+    counts = keep.sum(axis=1)
+    kept = np.split(block[keep], np.cumsum(counts)[:-1])
+    for i, face, n in zip(idx, kept, counts):
+      if n >= 3:
+        result[i] = face
+
+  # Drop faces that repeat an earlier face's vertex set.
+  seen = set()
+  out = []
+  for face in result:
+    if face is None:
+      continue
+    key = tuple(np.sort(face))
+    if key not in seen:
+      seen.add(key)
+      out.append(face)
+  return out
+
+
+def weld(shape, tolerance=DEFAULT_TOLERANCE):
+  """Merge coincident vertices of a shape and clean up its topology.
+
+  Vertices are welded immediately; edges and faces stay lazy and are
+  remapped from the input shape's topology on first access.
+
+  The result records what changed in `weld_stats`, a dict mapping
+  'vertices', 'edges' and 'faces' to (before, after) counts (edge and
+  face counts appear once that topology has been built), and keeps
+  `source_index`, the index in the input shape of each welded vertex.
+
+  Args:
+    shape: a Shape3D or Shape4D
+    tolerance: vertices closer than this (per coordinate) are merged
+
+  Returns a new shape of the same type and precision.
+  """
+  representatives, inverse = weld_map(shape.vertices, tolerance)
+  stats = {'vertices': (shape.num_vertices, len(representatives))}
+
+  def build_edges(welded):
+    edges = remap_edges(shape.edges, inverse)
+    stats['edges'] = (shape.num_edges, len(edges))
+    return edges
+
+  def build_faces(welded):
+    faces = remap_faces(shape.faces, inverse)
+    stats['faces'] = (shape.num_faces, len(faces))
+    return faces
+
+  welded = type(shape)(shape.vertices[representatives], build_edges, build_faces,
+                       precision=shape.precision)
+  welded.sdf = shape.sdf
+  welded.weld_stats = stats
+  welded.source_index = representatives
+  return welded
+
+
+def weld_summary(shape):
+  """One-line description of a welded shape's before/after counts."""
+  stats = getattr(shape, 'weld_stats', {})
+  parts = [f"{name} {before} -> {after}" for name, (before, after) in stats.items()]
+  return ", ".join(parts) if parts else "not welded"
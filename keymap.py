@@ -0,0 +1,22 @@
+import functools
+
+
+# Key and event bindings are written as pygame names ('a', 'LEFTBRACKET',
+# 'MOUSEWHEEL') and turned into pygame's numeric codes on first use, so
+# modules that define bindings (object4d, the camera, the main loop) can
+# be imported without loading pygame. Lookups are cached, so pygame is
+# imported once rather than on every frame or event.
+
+
+@functools.cache
+def key_code(name):
+  """pygame key code for a key name, e.g. 'a' -> pygame.K_a."""
+  import pygame
+  return getattr(pygame, 'K_' + name)
+
+
+@functools.cache
+def event_type(name):
+  """pygame event type code for an event name, e.g. 'KEYDOWN'."""
+  import pygame
+  return getattr(pygame, name)
@@ -1,59 +1,417 @@
-import pygame
-from pygame.locals import QUIT
+import argparse
+import os
+import time
 
+import numpy as np
+
+from geometry.base import Shape4D
 from geometry.tesseract import make_tesseract
 from geometry.pentachoron import make_pentachoron
 from geometry.hypersphere import make_hypersphere
 from geometry.spherinder import make_spherinder
-from renderer.window import init_window, clear, swap
+from geometry.duoprism import make_duocylinder
+from geometry.prism import make_platonic_prism
+from geometry.pointcloud import sample_hypersphere, reservoir_sample
+from geometry.loader import load_points
+from geometry.morph import morphable_hypersphere, morphable_spherinder, clamp_parameter
 from renderer.camera import Camera
-from object4d import Object4D
+from renderer.raymarch import RayMarcher
+from renderer.picking import PickingIndex
+from renderer.viewports import SplitView
+from object4d import Object4D, ROTATION_KEYS, SLICE_KEYS
+from math4d.quaternions import KeyframePlayer
+from math4d.engine import TransformEngine
+from session import SessionRecorder
+from keymap import event_type, key_code
 
 
-# Shape catalogue: number keys switch between shapes
+# Shape catalogue: number keys (pygame key names) switch between shapes
 SHAPES = {
-  pygame.K_1: ('Tesseract', make_tesseract, {}),
-  pygame.K_2: ('Pentachoron', make_pentachoron, {"radius": 2.25}),
-  pygame.K_3: ('Hypersphere', make_hypersphere,
+  '1': ('Tesseract', make_tesseract, {}),
+  '2': ('Pentachoron', make_pentachoron, {"radius": 2.25}),
+  '3': ('Hypersphere', make_hypersphere,
                {"radius": 2, "n1":6, "n2":8, "n3":10, "interpolation": 1/3}),
-  pygame.K_4: ('Spherinder', make_spherinder,
+  '4': ('Spherinder', make_spherinder,
                {"radius": 1.5, "n_lat" : 10, "n_lon": 12, "interpolation": 1/3, "half_height": 1.0}),
+  '5': ('Hypersphere (points)', sample_hypersphere,
+               {"radius": 2, "num_points": 200_000}),
+  '6': ('Duocylinder', make_duocylinder,
+               {"radius1": 1.5, "radius2": 1.5, "resolution": 24}),
+  '7': ('Octahedral prism', make_platonic_prism,
+               {"solid": "octahedron", "radius": 1.5, "half_height": 1.0}),
 }
 
-def main():
-  init_window()
+# Generators whose parameters can be changed live; their catalogue shapes
+# are built as MorphableShapes (see geometry.morph).
+MORPHABLE = {
+  make_hypersphere: morphable_hypersphere,
+  make_spherinder: morphable_spherinder,
+}
 
-  camera = Camera(distance=3.0, sensitivity=.25, zoom_sensitivity=.25)
-  obj = Object4D(make_tesseract(), camera_distance=3.0)
-  clock = pygame.time.Clock()
+# Held keys that slide a morphable shape's parameters: (parameter, direction)
+MORPH_KEYS = {
+  'COMMA': ('interpolation', -1),
+  'PERIOD': ('interpolation', +1),
+  'MINUS': ('radius', -1),
+  'EQUALS': ('radius', +1),
+  'SEMICOLON': ('half_height', -1),
+  'QUOTE': ('half_height', +1),
+}
+MORPH_SPEED = 0.01  # parameter units per frame
 
-  running = True
-  while running:
-    for event in pygame.event.get():
-      if event.type == QUIT:
-        running = False
-      camera.handle_event(event)
+# Storage format for generated shapes: 'full' (float64 / int32),
+# 'compact' (float32 / smallest unsigned index) or 'half' (float16 storage).
+PRECISION = 'full'
 
-    keys = pygame.key.get_pressed()
-    camera.update(keys)
-    obj.update(keys)
+# Keyframe animation (B stores a keyframe, N plays them back)
+KEYFRAME_SECONDS = 1.0  # time between consecutive keyframes
+FRAME_RATE = 60  # frames per second the main loop is capped at
+
+# Colour of the vertex or edge under the mouse in picking mode (H)
+HIGHLIGHT_COLOR = (1.0, 0.6, 0.2)
+
+# Keys whose held state the main loop reads (recorded with --record)
+TRACKED_KEYS = ['x', 'z', *ROTATION_KEYS, *SLICE_KEYS, *MORPH_KEYS, *SHAPES]
+
+
+class Viewer:
+  """Everything the main loop changes from frame to frame.
+
+  Input handling (step) is kept apart from drawing (render, or
+  render_headless without OpenGL), so a recorded session can be replayed
+  through exactly the same code.
+
+  Attributes:
+    camera: the 3D orbit camera
+    obj: the Object4D being viewed
+    precision: storage format shapes are generated at
+    raymarcher: RayMarcher while the ray-marched view is on, else None
+    shader_mode: rotate and project wireframes on the GPU (G toggles)
+    picking_mode: highlight the vertex or edge under the mouse (H toggles)
+    split_view: show the perspective and the four axis-dropped orthographic
+                views side by side (V toggles)
+    keyframes: 4D rotations stored with B, played back in order with N
+    morph: MorphableShape of the current shape, if its parameters can be
+           slid with the MORPH_KEYS, else None
+    running: False once the window has been closed
+  """
+
+  def __init__(self, precision=PRECISION, shape=None, engine=None):
+    self.camera = Camera(distance=3.0, sensitivity=.25, zoom_sensitivity=.25)
+    if shape is None:
+      shape = make_tesseract(precision=precision)
+    self.obj = Object4D(shape, camera_distance=3.0, engine=engine)
+    self.precision = precision
+    # R toggles the ray-marched view for shapes with a signed-distance function
+    self.raymarcher = None
+    self.shader_mode = False
+    self._shader = None  # created on first use, once a GL context exists
+    self.picking_mode = False
+    self._picking = None  # created on first use, once the window size is known
+    self.split_view = False
+    self._split = SplitView()
+    self.keyframes = []
+    self._animation = None  # iterator over the rotations still to be shown
+    self.morph = None
+    self.running = True
+    self._caption = None
+
+  def step(self, events, keys):
+    """Apply one frame of input: the queued events and the held keys."""
+    for event in events:
+      pressed = event.key if event.type == event_type('KEYDOWN') else None
+      if event.type == event_type('QUIT'):
+        self.running = False
+      elif pressed == key_code('r'):
+        if self.raymarcher is None:
+          self.raymarcher = RayMarcher()
+        else:
+          self.raymarcher.close()
+          self.raymarcher = None
+      elif pressed == key_code('c'):
+        # C toggles the implicit cross-section; [ and ] move it along W
+        self.obj.slice_mode = not self.obj.slice_mode
+        self.obj.trail.reset()
+      elif pressed == key_code('g'):
+        self.shader_mode = not self.shader_mode
+      elif pressed == key_code('p'):
+        # P cycles perspective / orthographic (along each axis) / stereographic
+        self.obj.next_projection()
+      elif pressed == key_code('h'):
+        # H toggles highlighting the vertex or edge under the mouse
+        self.picking_mode = not self.picking_mode
+      elif pressed == key_code('v'):
+        self.split_view = not self.split_view
+      elif pressed == key_code('t'):
+        # T toggles motion trails behind the (CPU-drawn) wireframe
+        self.obj.trail_mode = not self.obj.trail_mode
+        self.obj.trail.reset()
+      elif pressed == key_code('f'):
+        # F toggles hiding edges of cells that face away in 4D (CPU
+        # wireframe only; the split and shader views draw every edge)
+        self.obj.cull = not self.obj.cull
+      elif pressed == key_code('b'):
+        self.keyframes.append(self.obj.rotation.copy())
+      elif pressed == key_code('n'):
+        self.play_keyframes()
+      self.camera.handle_event(event)
+
+    self.camera.update(keys)
+    self.obj.update(keys)
+    if self._animation is not None:
+      rotation = next(self._animation, None)
+      if rotation is None:
+        self._animation = None
+      else:
+        self.obj.rotation = rotation
+
+    if self.morph is not None:
+      self.slide_parameters(keys)
 
     # Shape switching: number keys swap the geometry, reset rotation
     for key, (name, make_fn, kwargs) in SHAPES.items():
-      if keys[key]:
-        obj.shape = make_fn(**kwargs)
-        obj.reset_rotation()
-        camera.reset()
+      if keys[key_code(key)]:
+        if make_fn in MORPHABLE:
+          self.morph = MORPHABLE[make_fn](**kwargs, precision=self.precision)
+          self.obj.shape = self.morph.shape
+        else:
+          self.morph = None
+          self.obj.shape = make_fn(**kwargs, precision=self.precision)
+        self.obj.reset_rotation()
+        self.obj.trail.reset()
+        self.camera.reset()
+        self.keyframes = []
+        self._animation = None
 
-    clear()
-    camera.apply()
-    obj.draw()
+  def slide_parameters(self, keys):
+    """Move the morphable shape's parameters by the held MORPH_KEYS.
+
+    The vertices are recomputed in place, so the topology, rotation and
+    trail carry on uninterrupted.
+    """
+    changes = {}
+    for key, (name, sign) in MORPH_KEYS.items():
+      if keys[key_code(key)] and name in self.morph.params:
+        value = changes.get(name, self.morph.params[name]) + sign * MORPH_SPEED
+        changes[name] = clamp_parameter(name, value)
+    if changes:
+      self.morph.set(**changes)
+
+  def play_keyframes(self):
+    """Animate smoothly through the stored keyframes, one frame per step().
+
+    Every frame of the animation is interpolated up front in one call.
+    Needs at least two keyframes.
+    """
+    if len(self.keyframes) < 2:
+      return
+    player = KeyframePlayer(np.array(self.keyframes),
+                            times=KEYFRAME_SECONDS * np.arange(len(self.keyframes)))
+    num_frames = int(round(player.duration * FRAME_RATE)) + 1
+    self._animation = iter(player.evaluate(np.linspace(0, player.duration, num_frames)))
+
+  def _raymarching(self):
+    return self.raymarcher is not None and getattr(self.obj.shape, 'sdf', None) is not None
+
+  def _wireframe(self):
+    obj = self.obj
+    return isinstance(obj.shape, Shape4D) and not (obj.slice_mode and obj.shape.sdf is not None)
+
+  def _shader_drawing(self):
+    # The shader draws plain wireframes; cross-sections and point clouds
+    # keep using the CPU path.
+    return self.shader_mode and self._wireframe()
+
+  def _split_drawing(self):
+    return self.split_view and self._wireframe()
+
+  def _shader_renderer(self):
+    from renderer.shader import ShaderRenderer
+    if self._shader is None:
+      self._shader = ShaderRenderer()
+    return self._shader
 
+  def render(self):
+    """Draw the current frame to the window."""
+    # Imported here so Viewer can run headlessly without OpenGL.
+    from renderer.window import clear, swap, draw_image, set_title
+
+    caption = f"4D Viewer - {self.obj.projection.name}"
+    if self.morph is not None:
+      caption += "".join(f", {name} {value:.2f}" for name, value in self.morph.params.items())
+    clear()
+    self.camera.apply()
+    if self._raymarching():
+      draw_image(self.raymarcher.render(self.obj, self.camera))
+    elif self._split_drawing():
+      caption = "4D Viewer - split view" + self._no_cull_note()
+      self._split.draw(self.obj, shader=self._shader_renderer() if self.shader_mode else None)
+    else:
+      if self._shader_drawing():
+        caption += self._no_cull_note()
+        self._shader_renderer().draw(self.obj.shape, self.obj.rotation, self.obj.projection)
+      else:
+        self.obj.draw()
+      if self.picking_mode:
+        caption += self._draw_picked()
+    if caption != self._caption:
+      set_title(caption)
+      self._caption = caption
     swap()
-    clock.tick(60)
 
+  def _no_cull_note(self):
+    # The split view and the shader path draw every edge (see Object4D).
+    return " - culling off in this view" if self.obj.cull else ""
+
+  def _draw_picked(self):
+    """Highlight the vertex (or else edge) under the mouse; returns a caption suffix.
+
+    The picking index is only rebuilt when the view has changed, so
+    hovering over a still wireframe costs just the grid lookups. A
+    rebuild reuses the vertices this frame already projected on the CPU;
+    only the shader path has to project them again.
+    """
+    from OpenGL.GL import glEnable, glDisable, GL_DEPTH_TEST
+    from renderer.window import window_size, mouse_position
+    from renderer.wireframe import draw_wireframe
+    from renderer.points import draw_points
+
+    width, height = window_size()
+    if self._picking is None or (self._picking.width, self._picking.height) != (width, height):
+      self._picking = PickingIndex(width, height)
+    picking = self._picking
+    wireframe = None if self._shader_drawing() else self.obj.last_wireframe
+    picking.update(self.obj, self.camera, wireframe)
+    x, y = mouse_position()
+    vertex = picking.nearest_vertex(x, y)
+    edge = picking.nearest_edge(x, y) if vertex is None else None
+
+    # Drawn without depth testing, on top of the wireframe it coincides with.
+    glDisable(GL_DEPTH_TEST)
+    if vertex is not None:
+      draw_points(picking.verts_3d[[vertex]], color=HIGHLIGHT_COLOR, size=8.0)
+    elif edge is not None:
+      draw_wireframe(picking.verts_3d, picking.edges[[edge]], color=HIGHLIGHT_COLOR)
+    glEnable(GL_DEPTH_TEST)
+
+    if vertex is not None:
+      return f" - vertex {vertex}"
+    if edge is not None:
+      a, b = picking.edges[edge]
+      return f" - edge {edge} ({a}-{b})"
+    return ""
+
+  def render_headless(self):
+    """Do all the CPU work of render() but issue no OpenGL calls."""
+    self.camera.update_zoom()
+    if self._raymarching():
+      self.raymarcher.render(self.obj, self.camera)
+    elif self._split_drawing():
+      if not self.shader_mode:
+        self._split.project(self.obj)
+    elif self._shader_drawing():
+      self.obj.projection.combined(self.obj.rotation)
+    else:
+      for _ in self.obj.project():
+        pass
+
+  def close(self):
+    if self.raymarcher is not None:
+      self.raymarcher.close()
+      self.raymarcher = None
+    if self._shader is not None:
+      self._shader.release()
+      self._shader = None
+    self._split.release()
+
+
+def load_source(path, columns=None, stride=1, preview=None, raw_columns=None, raw_dtype=None):
+  """The start shape for a data file (--data): its points, optionally sampled.
+
+  A recorded session keeps these arguments, so a replay starts from the
+  same points.
+
+  Args:
+    path: .npy or raw binary file (see geometry.loader.load_points)
+    columns: the four columns used as x, y, z, w (default: the first four)
+    stride: keep every stride-th row
+    preview: if given, a uniform random sample of this many rows
+    raw_columns, raw_dtype: layout of a raw binary file
+
+  Returns a PointCloud4D.
+  """
+  shape = load_points(path, columns=columns, stride=stride, fit_radius=2.0,
+                      num_columns=raw_columns, dtype=raw_dtype)
+  if preview:
+    shape = reservoir_sample(shape, preview)
+  return shape
+
+
+def main(record=None, source=None, threads=None):
+  """Run the viewer.
+
+  Args:
+    record: optional path of an .npz file to record the session to (see
+            session.py and benchmarks/replay.py)
+    source: optional keyword arguments of load_source() for data to
+            start with instead of the tesseract
+    threads: if given, rotate and project on this many threads (see
+             math4d/engine.py)
+  """
+  import pygame
+  from renderer.window import init_window
+
+  init_window()
+
+  engine = TransformEngine(threads) if threads else None
+  shape = load_source(**source) if source else None
+  viewer = Viewer(shape=shape, engine=engine)
+  clock = pygame.time.Clock()
+  recorder = None
+  if record:
+    recorder = SessionRecorder([key_code(k) for k in TRACKED_KEYS], precision=PRECISION,
+                               source=source, threads=threads)
+
+  while viewer.running:
+    start = time.perf_counter()
+    events = pygame.event.get()
+    keys = pygame.key.get_pressed()
+    viewer.step(events, keys)
+    viewer.render()
+    if recorder is not None:
+      recorder.record_frame(events, keys, frame_ms=1000 * (time.perf_counter() - start))
+    clock.tick(FRAME_RATE)
+
+  viewer.close()
+  if engine is not None:
+    engine.close()
+  if recorder is not None:
+    recorder.save(record)
   pygame.quit()
 
 
 if __name__ == '__main__':
-  main()
+  parser = argparse.ArgumentParser(description="Interactive 4D shape viewer.")
+  parser.add_argument('--record', metavar='PATH',
+                      help="record the session's input to an .npz file for replay")
+  parser.add_argument('--data', metavar='PATH',
+                      help="view 4D points from a .npy or raw binary file (memory-mapped)")
+  parser.add_argument('--columns', type=int, nargs=4, metavar='C',
+                      help="columns of the data used as x y z w (default: the first four)")
+  parser.add_argument('--stride', type=int, default=1,
+                      help="keep every n-th row of the data")
+  parser.add_argument('--preview', type=int, metavar='N',
+                      help="show a uniform random sample of N rows of the data")
+  parser.add_argument('--raw-columns', type=int, help="columns per row of a raw binary file")
+  parser.add_argument('--raw-dtype', help="element type of a raw binary file, e.g. float32")
+  parser.add_argument('--threads', type=int,
+                      help="rotate and project on this many threads (large meshes and data)")
+  args = parser.parse_args()
+
+  source = None
+  if args.data:
+    # An absolute path, so a recorded session replays from any directory.
+    source = dict(path=os.path.abspath(args.data), columns=args.columns, stride=args.stride,
+                  preview=args.preview, raw_columns=args.raw_columns,
+                  raw_dtype=args.raw_dtype)
+  main(record=args.record, source=source, threads=args.threads)
@@ -0,0 +1,91 @@
+import numpy as np
+
+from math4d.rotations import compose_planes
+
+
+# Upper bound on the number of projected points (K * N) materialized at
+# once. 2**20 points of float64 XYZW is 32 MB of scratch.
+DEFAULT_MAX_POINTS = 2**20
+
+
+def project_batch(vertices, rotations, camera_distance=3.0, out=None,
+                  max_points=DEFAULT_MAX_POINTS):
+  """Rotate and project one set of 4D vertices under K rotations at once.
+
+  Equivalent to
+
+    np.stack([perspective(vertices @ R, camera_distance) for R in rotations])
+
+  but done with one batched matmul and one divide per chunk of rotations
+  instead of a Python loop per orientation. Rotations are processed in
+  chunks so that at most `max_points` rotated vertices exist at a time,
+  which caps the scratch memory when K * N is large.
+
+  Args:
+    vertices: (N, 4) array of 4D positions
+    rotations: (K, 4, 4) array of rotation matrices (row-vector convention)
+    camera_distance: distance of the 4D camera along W, or None for an
+                     orthographic projection (drop W)
+    out: optional (K, N, 3) array to write the result into
+    max_points: maximum number of rotated vertices held per chunk
+
+  Returns:
+    (K, N, 3) array of projected 3D positions
+  """
+  vertices = np.asarray(vertices)
+  rotations = np.asarray(rotations)
+  assert vertices.ndim == 2 and vertices.shape[1] == 4, \
+    f"vertices must be (N, 4), got {vertices.shape}"
+  assert rotations.ndim == 3 and rotations.shape[1:] == (4, 4), \
+    f"rotations must be (K, 4, 4), got {rotations.shape}"
+
+  k_total = rotations.shape[0]
+  n = vertices.shape[0]
+  # Compute at the vertices' precision (float16 storage promotes to
+  # float32) rather than letting float64 rotations upcast everything.
+  dtype = np.promote_types(vertices.dtype, np.float32)
+  vertices = vertices.astype(dtype, copy=False)
+  rotations = rotations.astype(dtype, copy=False)
+  if out is None:
+    out = np.empty((k_total, n, 3), dtype=dtype)
+  assert out.shape == (k_total, n, 3), \
+    f"out must be ({k_total}, {n}, 3), got {out.shape}"
+
+  # How many orientations fit into one chunk (always at least one).
+  step = max(1, max_points // max(n, 1))
+
+  for start in range(0, k_total, step):
+    stop = min(start + step, k_total)
+    # (N, 4) @ (k, 4, 4) broadcasts to (k, N, 4)
+    rotated = np.matmul(vertices, rotations[start:stop])
+    if camera_distance is None:
+      out[start:stop] = rotated[..., :3]
+    else:
+      scale = camera_distance - rotated[..., 3:]
+      np.divide(rotated[..., :3], scale, out=out[start:stop])
+
+  return out
+
+
+def project_angles(vertices, planes, angles, camera_distance=3.0, out=None,
+                   max_points=DEFAULT_MAX_POINTS):
+  """Project 4D vertices under K orientations given as per-plane angles.
+
+  Builds the K rotation matrices with compose_planes() and passes them to
+  project_batch().
+
+  Args:
+    vertices: (N, 4) array of 4D positions
+    planes: sequence of P plane names, e.g. ('xw', 'yw')
+    angles: (K, P) array of angles in radians
+    camera_distance: distance of the 4D camera along W, or None for an
+                     orthographic projection
+    out: optional (K, N, 3) output array
+    max_points: maximum number of rotated vertices held per chunk
+
+  Returns:
+    (K, N, 3) array of projected 3D positions
+  """
+  rotations = compose_planes(planes, angles)
+  return project_batch(vertices, rotations, camera_distance, out=out,
+                       max_points=max_points)
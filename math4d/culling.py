@@ -0,0 +1,56 @@
+import numpy as np
+
+
+# Back-cell culling: the 4D analogue of back-face culling. A 3-cell of a
+# convex polytope whose outward normal points away from the 4D viewpoint
+# is hidden behind the cells in front of it, and so is every edge that
+# belongs only to such cells.
+
+
+def facing_cells(normals, offsets, rotation, eye):
+  """Which cells of a convex polytope face the 4D viewpoint.
+
+  Cell i lies in the hyperplane normals[i] . p = offsets[i]; it faces
+  the viewpoint when the viewpoint is strictly on its outer side. The
+  viewpoint is rotated back into the shape's frame instead of rotating
+  every normal, so the test is one (C, 4) @ (4,) product.
+
+  Args:
+    normals: (C, 4) outward unit normals
+    offsets: (C,) plane offsets
+    rotation: (4, 4) rotation matrix of the shape (row-vector convention)
+    eye: homogeneous (5,) viewpoint in the rotated frame, as returned by
+         Projection.eye() (last component 0 for a point at infinity)
+
+  Returns:
+    (C,) bool array
+  """
+  eye = np.asarray(eye, dtype=np.float64)
+  # p_rotated = p @ R, so p = p_rotated @ R.T = R @ p_rotated.
+  local = np.asarray(rotation, dtype=np.float64) @ eye[:4]
+  return normals @ local - offsets * eye[4] > 0
+
+
+def visible_edge_mask(num_edges, edge_cells, front):
+  """Which edges belong to at least one front-facing cell.
+
+  Args:
+    num_edges: number of edges E
+    edge_cells: (K, 2) (edge index, cell index) incidence pairs
+    front: (C,) bool from facing_cells()
+
+  Returns:
+    (E,) bool array
+  """
+  keep = np.zeros(num_edges, dtype=bool)
+  keep[edge_cells[front[edge_cells[:, 1]], 0]] = True
+  return keep
+
+
+def visible_edges(edges, edge_cells, front):
+  """The edges that belong to at least one front-facing cell.
+
+  Returns:
+    (E', 2) subset of edges, in their original order
+  """
+  return edges[visible_edge_mask(len(edges), edge_cells, front)]
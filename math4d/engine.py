@@ -0,0 +1,111 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from math4d.projections import Projection
+from renderer.colormap import w_colors
+
+
+# Rows per work item: with float32 data a chunk's input, homogeneous
+# scratch and output (4 + 5 + 3 values per row) take about 0.75 MB, so
+# one chunk per core stays in its L2 cache between the product, the
+# divide and the colouring.
+DEFAULT_CHUNK_ROWS = 16384
+
+
+class TransformEngine:
+  """Rotates and projects large vertex arrays on a pool of threads.
+
+  The array is split into chunks of at most chunk_size rows (fewer if
+  that would leave threads idle). Each chunk is rotated, projected and
+  optionally coloured by one thread, start to finish, writing straight
+  into its rows of shared output arrays. NumPy releases the GIL inside
+  these operations, so the element-wise divide and colouring, not only
+  the matrix product, run in parallel.
+
+  Each thread keeps its own homogeneous scratch buffer, reused across
+  calls. The pool is created on first use and reused; call close() when
+  done.
+
+  Attributes:
+    threads: number of worker threads (1 = work in the calling thread)
+    chunk_size: rows per work item
+  """
+
+  def __init__(self, threads=None, chunk_size=DEFAULT_CHUNK_ROWS):
+    assert chunk_size > 0, f"chunk_size must be positive, got {chunk_size}"
+    self.threads = threads if threads is not None else (os.cpu_count() or 1)
+    assert self.threads >= 1, f"threads must be at least 1, got {self.threads}"
+    self.chunk_size = chunk_size
+    self._pool = None
+    self._local = threading.local()
+
+  def _scratch(self, dtype):
+    """This thread's (chunk_size, 5) scratch buffer of the given dtype."""
+    scratch = getattr(self._local, 'scratch', None)
+    if scratch is None or scratch.dtype != dtype:
+      scratch = np.empty((self.chunk_size, 5), dtype=dtype)
+      self._local.scratch = scratch
+    return scratch
+
+  def transform(self, vertices, rotation, projection, out=None, depth=None,
+                colors=None, depth_range=None):
+    """Rotate and project (N, 4) vertices, optionally colouring them by depth.
+
+    Args:
+      vertices: (N, 4) array of 4D positions
+      rotation: (4, 4) rotation matrix (row-vector convention)
+      projection: a math4d.projections.Projection
+      out: optional (N, 3) array for the projected positions
+      depth: optional (N,) array to also receive the depth along the
+             viewing axis
+      colors: optional (N, 3) float32 array to receive depth colours
+              (see renderer.colormap.w_colors)
+      depth_range: (low, high) depths mapped to the two ends of the
+                   colour ramp (required with colors)
+
+    Returns:
+      out, the (N, 3) projected positions at the vertices' compute
+      precision (float16 is promoted to float32)
+    """
+    n = len(vertices)
+    dtype = np.promote_types(vertices.dtype, np.float32)
+    if out is None:
+      out = np.empty((n, 3), dtype=dtype)
+    assert out.shape == (n, 3), f"out must be ({n}, 3), got {out.shape}"
+    if colors is not None:
+      assert depth_range is not None, "colouring needs a depth_range"
+    # Fold the rotation in once instead of once per chunk.
+    combined = Projection(projection.name, projection.combined(rotation),
+                          projection.stereographic)
+
+    # Smaller chunks for small inputs, so every thread still gets work.
+    rows = max(1, min(self.chunk_size, -(-n // self.threads)))
+
+    def work(start):
+      stop = min(start + rows, n)
+      scratch = self._scratch(dtype)[:stop - start]
+      _, d = combined.project(vertices[start:stop], out=out[start:stop], scratch=scratch)
+      if depth is not None:
+        depth[start:stop] = d
+      if colors is not None:
+        w_colors(d, *depth_range, out=colors[start:stop])
+
+    starts = range(0, n, rows)
+    if self.threads == 1 or len(starts) == 1:
+      for start in starts:
+        work(start)
+    else:
+      if self._pool is None:
+        self._pool = ThreadPoolExecutor(max_workers=self.threads)
+      # list() waits for every chunk and re-raises the first error.
+      list(self._pool.map(work, starts))
+    return out
+
+  def close(self):
+    """Shut down the thread pool, if one was started."""
+    if self._pool is not None:
+      self._pool.shutdown()
+      self._pool = None
@@ -33,6 +33,9 @@ def perspective(vertices, camera_distance=3.0):
                      Must be greater than the largest W value in the
                      vertices to avoid division by zero or negative.
 
+  The result keeps the dtype of `vertices`, so float32 input stays
+  float32 all the way to the renderer.
+
   Returns:
     (N, 3) array of 3D positions
   """
@@ -40,3 +43,166 @@ def perspective(vertices, camera_distance=3.0):
   scale = camera_distance - w  # (N,) array, one scale factor per vertex
   xyz = vertices[:, :3] / scale[:, np.newaxis]
   return xyz
+
+
+# Homogeneous projections.
+#
+# A projection is a 5x5 matrix acting on row vectors [x, y, z, w, 1]. Its
+# output [X, Y, Z, D, H] is turned into a 3D point by dividing XYZ by H;
+# D is the depth along the viewing axis (kept for colouring). Because the
+# rotation can be embedded as a 5x5 matrix too, rotate-and-project is a
+# single matrix product followed by one divide.
+
+AXES = {'x': 0, 'y': 1, 'z': 2, 'w': 3}
+
+# Keeps stereographic points at the projection pole finite (they land
+# at about 1 / STEREO_EPS times the shape's radius).
+STEREO_EPS = 1e-3
+# Absolute floor of the stereographic divisor, for the origin itself
+# (|p| = 0), which projects to the 3D origin.
+STEREO_MIN_DIVISOR = 1e-30
+
+
+def homogeneous(rotation):
+  """Embed a (4, 4) rotation (row-vector convention) in a (5, 5) matrix."""
+  m = np.eye(5)
+  m[:4, :4] = rotation
+  return m
+
+
+def axis_matrix(axis='w', scale=1.0):
+  """Homogeneous matrix that views along `axis`.
+
+  The three remaining axes (in x, y, z, w order) become XYZ, scaled by
+  `scale`, the viewing axis becomes the depth D, and H is 1. For
+  axis='w' this is the identity with scaled XYZ.
+  """
+  assert axis in AXES, f"axis must be one of {list(AXES)}, got '{axis}'"
+  k = AXES[axis]
+  others = [i for i in range(4) if i != k]
+  m = np.zeros((5, 5))
+  m[others, [0, 1, 2]] = scale
+  m[k, 3] = 1
+  m[4, 4] = 1
+  return m
+
+
+class Projection:
+  """A 4D -> 3D projection: a 5x5 homogeneous matrix plus optional post-step.
+
+  Attributes:
+    name: display name, e.g. "perspective (w)"
+    matrix: (5, 5) homogeneous projection matrix
+    stereographic: if True, add |p| to H before dividing (the nonlinear
+                   part of the stereographic projection)
+  """
+
+  def __init__(self, name, matrix, stereographic=False):
+    self.name = name
+    self.matrix = np.asarray(matrix, dtype=np.float64)
+    self.stereographic = stereographic
+
+  def combined(self, rotation=None):
+    """The (5, 5) matrix that rotates (row-vector convention) then projects."""
+    if rotation is None:
+      return self.matrix
+    return homogeneous(rotation) @ self.matrix
+
+  def project(self, vertices, rotation=None, out=None, scratch=None):
+    """Rotate and project 4D vertices with one matrix product and one divide.
+
+    Computes at the vertices' precision (float16 is promoted to float32).
+
+    Args:
+      vertices: (N, 4) array of 4D positions
+      rotation: optional (4, 4) rotation applied first
+      out: optional (N, 3) array for the projected positions
+      scratch: optional (N, 5) array for the homogeneous coordinates;
+               pass both buffers to project without allocating
+
+    Returns:
+      (verts_3d, depth): (N, 3) projected positions and the (N,) depth
+      along the viewing axis (a view into `scratch`)
+    """
+    dtype = np.promote_types(vertices.dtype, np.float32)
+    vertices = vertices.astype(dtype, copy=False)
+    m = self.combined(rotation).astype(dtype)
+    h = np.matmul(vertices, m[:4], out=scratch)
+    h += m[4]
+    if self.stereographic:
+      # Rotations preserve length, so |p| of the input is |p| rotated.
+      norm = np.linalg.norm(vertices, axis=1)
+      h[:, 4] += norm
+      floor = np.maximum(STEREO_EPS * norm, STEREO_MIN_DIVISOR)
+      np.maximum(h[:, 4], floor, out=h[:, 4])
+    xyz = np.divide(h[:, :3], h[:, 4:], out=out)
+    return xyz, h[:, 3]
+
+  def eye(self):
+    """Homogeneous position (x, y, z, w, 1 or 0) of the 4D viewpoint.
+
+    The viewpoint is where every point projects to the origin with
+    H = 0: the 4D camera of a perspective projection, or the point at
+    infinity (last component 0) on the viewing axis of an orthographic
+    one. It is on the side of positive depth. Returns None for
+    stereographic projections, which have no single viewpoint.
+    """
+    if self.stereographic:
+      return None
+    # Null vector of the XYZ and H columns of the matrix.
+    _, _, vt = np.linalg.svd(self.matrix[:, [0, 1, 2, 4]].T)
+    eye = vt[-1]
+    if abs(eye[4]) > 1e-12:
+      eye = eye / eye[4]
+    elif eye @ self.matrix[:, 3] < 0:
+      eye = -eye
+    return eye
+
+
+def orthographic_projection(axis='w', scale=1.0):
+  """Orthographic projection along any axis (drop it, keep the other three)."""
+  return Projection(f"orthographic ({axis})", axis_matrix(axis, scale))
+
+
+def perspective_projection(camera_distance=3.0, axis='w'):
+  """Perspective projection from a 4D camera on `axis` (H = d - depth).
+
+  With axis='w' this gives the same result as perspective().
+  """
+  m = axis_matrix(axis)
+  m[:, 4] = -m[:, 3]
+  m[4, 4] = camera_distance
+  return Projection(f"perspective ({axis})", m)
+
+
+def stereographic_projection(axis='w', scale=1.0):
+  """Stereographic projection from the pole on `axis`.
+
+  Each point is pushed onto the 3-sphere through its own length and
+  projected from the pole: XYZ / (|p| - depth). The linear part (XYZ
+  and -depth) is the matrix; |p| is added as a post-step.
+  """
+  m = axis_matrix(axis, scale)
+  m[:, 4] = -m[:, 3]
+  return Projection(f"stereographic ({axis})", m, stereographic=True)
+
+
+def make_projection(kind='perspective', axis='w', camera_distance=3.0):
+  """Build a projection by name, sized to match perspective at w = 0.
+
+  Args:
+    kind: 'perspective', 'orthographic' or 'stereographic'
+    axis: viewing axis, one of AXES
+    camera_distance: 4D camera distance (perspective); orthographic views
+                     are scaled by 1 / camera_distance so shapes keep
+                     their size when switching
+
+  Returns a Projection.
+  """
+  if kind == 'perspective':
+    return perspective_projection(camera_distance, axis)
+  if kind == 'orthographic':
+    return orthographic_projection(axis, 1.0 / camera_distance)
+  assert kind == 'stereographic', \
+    f"kind must be 'perspective', 'orthographic' or 'stereographic', got '{kind}'"
+  return stereographic_projection(axis)
@@ -0,0 +1,229 @@
+import numpy as np
+
+
+# 4D rotations as pairs of unit quaternions (left and right isoclinic parts).
+#
+# A 4D vector (x, y, z, w) is read as the quaternion x + y i + z j + w k.
+# Every rotation of R^4 can be written as p -> l p conj(r) for unit
+# quaternions l and r, and (l, r) and (-l, -r) give the same rotation.
+# Quaternions are (..., 4) arrays, real part first; pairs are passed as
+# two arrays (left, right) of the same shape.
+#
+# Matrices follow the rest of math4d: row vectors, so a rotation matrix M
+# is applied as `v @ M`.
+
+
+def multiply(p, q):
+  """Hamilton product p * q of (..., 4) quaternion arrays."""
+  p, q = np.asarray(p, dtype=np.float64), np.asarray(q, dtype=np.float64)
+  a1, b1, c1, d1 = np.moveaxis(p, -1, 0)
+  a2, b2, c2, d2 = np.moveaxis(q, -1, 0)
+  return np.stack([
+    a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2,
+    a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2,
+    a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2,
+    a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2,
+  ], axis=-1)
+
+
+def conjugate(q):
+  """Quaternion conjugate of (..., 4) quaternions."""
+  return np.asarray(q, dtype=np.float64) * [1, -1, -1, -1]
+
+
+def normalize(q):
+  """Scale (..., 4) quaternions to unit length."""
+  q = np.asarray(q, dtype=np.float64)
+  return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def _left_matrix(q):
+  """(..., 4, 4) matrix of p -> q * p acting on column vectors."""
+  a, b, c, d = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+  return np.stack([
+    np.stack([a, -b, -c, -d], axis=-1),
+    np.stack([b, a, -d, c], axis=-1),
+    np.stack([c, d, a, -b], axis=-1),
+    np.stack([d, -c, b, a], axis=-1),
+  ], axis=-2)
+
+
+def _right_matrix(q):
+  """(..., 4, 4) matrix of p -> p * q acting on column vectors."""
+  a, b, c, d = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+  return np.stack([
+    np.stack([a, -b, -c, -d], axis=-1),
+    np.stack([b, a, d, -c], axis=-1),
+    np.stack([c, -d, a, b], axis=-1),
+    np.stack([d, c, -b, a], axis=-1),
+  ], axis=-2)
+
+
+def to_matrix(left, right):
+  """Rotation matrices (row-vector convention) of quaternion pairs.
+
+  Args:
+    left, right: (..., 4) unit quaternions
+
+  Returns:
+    (..., 4, 4) matrices M with v @ M = left * v * conj(right)
+  """
+  column = _left_matrix(left) @ _right_matrix(conjugate(right))
+  return np.swapaxes(column, -1, -2)
+
+
+# BASIS[i, j] is the (row-vector) rotation matrix of the pair of basis
+# quaternions (e_i, e_j). The 16 matrices are orthogonal to each other
+# with squared Frobenius norm 4, and to_matrix(l, r) = sum l_i r_j
+# BASIS[i, j], so <M, BASIS[i, j]> / 4 recovers the outer product l r^T.
+BASIS = to_matrix(np.eye(4)[:, np.newaxis], np.eye(4)[np.newaxis, :])
+
+
+def from_matrix(matrices):
+  """Quaternion pairs of rotation matrices (row-vector convention).
+
+  The outer product l r^T is read off the matrix (see BASIS) and split
+  into its factors. For a matrix that has drifted slightly from a
+  rotation this gives the pair of the nearest rotation, so
+  to_matrix(*from_matrix(m)) also re-orthonormalizes m.
+
+  Of the two equivalent pairs, the one whose left quaternion has a
+  positive largest-magnitude component is returned.
+
+  Args:
+    matrices: (..., 4, 4) rotation matrices
+
+  Returns:
+    (left, right): (..., 4) unit quaternions
+  """
+  m = np.asarray(matrices, dtype=np.float64)
+  outer = np.einsum('...ab,ijab->...ij', m, BASIS) / 4
+  # The row of l r^T with the largest norm is l_i r^T for the largest |l_i|.
+  rows = np.linalg.norm(outer, axis=-1)
+  i = np.argmax(rows, axis=-1)
+  row = np.take_along_axis(outer, i[..., np.newaxis, np.newaxis], axis=-2)[..., 0, :]
+  right = row / np.linalg.norm(row, axis=-1, keepdims=True)
+  left = normalize(np.einsum('...ij,...j->...i', outer, right))
+  return left, right
+
+
+def compose(first, second):
+  """The pair of applying rotation `first`, then `second`.
+
+  Matches matrix composition: to_matrix(*compose(a, b)) equals
+  to_matrix(*a) @ to_matrix(*b).
+
+  Args:
+    first, second: (left, right) pairs of (..., 4) quaternions
+
+  Returns:
+    (left, right) pair
+  """
+  return multiply(second[0], first[0]), multiply(second[1], first[1])
+
+
+def align(reference, pair):
+  """Pick the sign of `pair` (l, r) or (-l, -r) closest to `reference`.
+
+  Both signs are the same rotation; interpolating towards the closer one
+  takes the shorter path. The sign flips both quaternions together,
+  since flipping only one would give a different rotation, so the left
+  and right angles can't be minimised separately: the sign with the
+  smaller squared path length theta_l^2 + theta_r^2 in SO(4) is chosen,
+  where theta = arccos(dot) is each quaternion's angle. Flipping maps
+  theta to pi - theta, so flipping is shorter exactly when
+  theta_l + theta_r > pi, i.e. when dot_l + dot_r < 0.
+  """
+  dot_l = np.sum(reference[0] * pair[0], axis=-1)
+  dot_r = np.sum(reference[1] * pair[1], axis=-1)
+  sign = np.where(dot_l + dot_r < 0, -1.0, 1.0)[..., np.newaxis]
+  return pair[0] * sign, pair[1] * sign
+
+
+def slerp(q0, q1, t):
+  """Spherical linear interpolation between unit quaternions.
+
+  Args:
+    q0, q1: (..., 4) unit quaternions (not re-signed; see align)
+    t: interpolation parameters, broadcast against q0[..., 0]
+
+  Returns:
+    (..., 4) unit quaternions, q0 at t = 0 and q1 at t = 1
+  """
+  q0, q1 = np.asarray(q0, dtype=np.float64), np.asarray(q1, dtype=np.float64)
+  t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+  cos = np.clip(np.sum(q0 * q1, axis=-1, keepdims=True), -1.0, 1.0)
+  theta = np.arccos(cos)
+  sin = np.sin(theta)
+  # Nearly equal quaternions: fall back to (normalized) linear interpolation.
+  small = sin < 1e-6
+  safe = np.where(small, 1.0, sin)
+  w0 = np.where(small, 1 - t, np.sin((1 - t) * theta) / safe)
+  w1 = np.where(small, t, np.sin(t * theta) / safe)
+  return normalize(w0 * q0 + w1 * q1)
+
+
+def slerp_pair(a, b, t):
+  """Interpolate between two rotations along the shortest path in SO(4).
+
+  Args:
+    a, b: (left, right) pairs of (..., 4) unit quaternions
+    t: interpolation parameters
+
+  Returns:
+    (left, right) pair of the interpolated rotations
+  """
+  b = align(a, b)
+  return slerp(a[0], b[0], t), slerp(a[1], b[1], t)
+
+
+class KeyframePlayer:
+  """Smooth animation through a sequence of 4D orientations.
+
+  Keyframes are stored as quaternion pairs, re-signed once so that each
+  one is on the near side of the one before it. Orientations between two
+  keyframes are SLERPed, so every interpolated rotation is exactly
+  orthonormal, and evaluate() computes any number of them in one
+  vectorized call.
+
+  Args:
+    rotations: (K, 4, 4) rotation matrices (row-vector convention), K >= 1
+    times: (K,) increasing keyframe times (default: 0, 1, ..., K - 1)
+  """
+
+  def __init__(self, rotations, times=None):
+    left, right = from_matrix(rotations)
+    assert left.ndim == 2 and len(left) >= 1, "need at least one keyframe"
+    if times is None:
+      times = np.arange(len(left), dtype=np.float64)
+    self.times = np.asarray(times, dtype=np.float64)
+    assert self.times.shape == (len(left),), \
+      f"need one time per keyframe, got {self.times.shape} for {len(left)} keyframes"
+    assert np.all(np.diff(self.times) > 0), "keyframe times must be increasing"
+    for k in range(1, len(left)):
+      left[k], right[k] = align((left[k - 1], right[k - 1]), (left[k], right[k]))
+    self.left = left
+    self.right = right
+
+  @property
+  def duration(self):
+    return self.times[-1] - self.times[0]
+
+  def orientations(self, t):
+    """Quaternion pairs at times t (clamped to the keyframe range).
+
+    Returns:
+      (left, right): (..., 4) arrays, one pair per entry of t
+    """
+    t = np.clip(np.asarray(t, dtype=np.float64), self.times[0], self.times[-1])
+    if len(self.times) == 1:
+      shape = t.shape + (4,)
+      return np.broadcast_to(self.left[0], shape), np.broadcast_to(self.right[0], shape)
+    k = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 2)
+    u = (t - self.times[k]) / (self.times[k + 1] - self.times[k])
+    return (slerp(self.left[k], self.left[k + 1], u),
+            slerp(self.right[k], self.right[k + 1], u))
+
+  def evaluate(self, t):
+    """Rotation matrices at times t, shape t.shape + (4, 4)."""
+    return to_matrix(*self.orientations(t))
@@ -54,3 +54,66 @@ def compose(*matrices):
   for m in matrices:
     result = result @ m
   return result
+
+
+def rotation_matrices(plane, angles):
+  """Build a stack of 4x4 rotation matrices, one per angle, in one plane.
+
+  Vectorized version of rotation_matrix(): instead of looping over
+  angles in Python, the 2x2 rotation block is filled for all of them
+  at once.
+
+  Args:
+    plane: two axis letters, e.g. 'xy', 'xz', 'yz', 'xw', 'yw', 'zw'.
+    angles: (K,) array of rotation angles in radians
+
+  Returns:
+    (K, 4, 4) array of rotation matrices
+  """
+  axis_index = {'x': 0, 'y': 1, 'z': 2, 'w': 3}
+
+  plane = plane.lower()
+  assert len(plane) == 2 and plane[0] in axis_index and plane[1] in axis_index \
+    and plane[0] != plane[1], \
+    f"plane must be two distinct axis letters like 'xy', got '{plane}'"
+
+  i = axis_index[plane[0]]
+  j = axis_index[plane[1]]
+
+  angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+  c = np.cos(angles)
+  s = np.sin(angles)
+
+  m = np.tile(np.eye(4, dtype=np.float64), (len(angles), 1, 1))
+  m[:, i, i] = c
+  m[:, i, j] = s
+  m[:, j, i] = -s
+  m[:, j, j] = c
+
+  return m
+
+
+def compose_planes(planes, angles):
+  """Build K composed rotations from K sets of per-plane angles.
+
+  Row k of `angles` gives one angle per plane; the result for that row
+  is compose(rotation_matrix(planes[0], angles[k, 0]), ...), i.e. the
+  planes are applied in the order given.
+
+  Args:
+    planes: sequence of P plane names, e.g. ('xy', 'zw')
+    angles: (K, P) array of angles in radians
+
+  Returns:
+    (K, 4, 4) array of rotation matrices
+  """
+  angles = np.asarray(angles, dtype=np.float64)
+  if angles.ndim == 1:
+    angles = angles[:, np.newaxis]
+  assert angles.ndim == 2 and angles.shape[1] == len(planes), \
+    f"angles must be (K, {len(planes)}), got {angles.shape}"
+
+  result = np.tile(np.eye(4, dtype=np.float64), (angles.shape[0], 1, 1))
+  for p, plane in enumerate(planes):
+    result = result @ rotation_matrices(plane, angles[:, p])
+  return result
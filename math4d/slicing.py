@@ -0,0 +1,207 @@
+import numpy as np
+
+from geometry.base import Shape3D
+
+
+def hyperplane_basis(normal):
+  """Orthonormal basis of the 3D hyperplane perpendicular to `normal`.
+
+  Built by Gram-Schmidt over the coordinate axes, so for normal = +W the
+  basis is simply X, Y, Z and slice coordinates coincide with the
+  viewer's XYZ.
+
+  Args:
+    normal: (4,) hyperplane normal (need not be unit length)
+
+  Returns:
+    (3, 4) array whose rows span the hyperplane
+  """
+  n = np.asarray(normal, dtype=np.float64)
+  n = n / np.linalg.norm(n)
+  basis = [n]
+  for axis in np.eye(4):
+    v = axis - sum((axis @ b) * b for b in basis)
+    if np.linalg.norm(v) > 1e-6:
+      basis.append(v / np.linalg.norm(v))
+    if len(basis) == 4:
+      break
+  return np.array(basis[1:])
+
+
+def slice_to_4d(points, normal, offset=0.0):
+  """Map slice coordinates (from slice_sdf) back to 4D positions.
+
+  Args:
+    points: (N, 3) coordinates in the hyperplane basis
+    normal: (4,) hyperplane normal
+    offset: signed distance of the hyperplane from the origin
+
+  Returns:
+    (N, 4) array of 4D positions
+  """
+  n = np.asarray(normal, dtype=np.float64)
+  n = n / np.linalg.norm(n)
+  return offset * n + np.asarray(points) @ hyperplane_basis(n)
+
+
+# Marching tetrahedra. Each grid cube is split into six tetrahedra that
+# share the diagonal from corner 0 to corner 7 (corner index = dx + 2dy +
+# 4dz), which makes neighbouring cubes agree on their shared faces.
+CUBE_CORNERS = np.array([[dx, dy, dz] for dz in (0, 1) for dy in (0, 1) for dx in (0, 1)])
+CUBE_TETS = np.array([
+  [0, 1, 3, 7], [0, 3, 2, 7], [0, 2, 6, 7],
+  [0, 6, 4, 7], [0, 4, 5, 7], [0, 5, 1, 7],
+])
+TET_EDGES = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+
+
+def _build_tet_table():
+  """Triangles (as tet edge indices) for each of the 16 inside/outside cases.
+
+  One corner on its own side of the surface cuts off a triangle; two on
+  each side cut the tet with a quad, emitted as two triangles.
+  """
+  edge_id = {tuple(e): k for k, e in enumerate(TET_EDGES.tolist())}
+
+  def edge(a, b):
+    return edge_id[(min(a, b), max(a, b))]
+
+  table = np.full((16, 2, 3), -1, dtype=np.int64)
+  for case in range(16):
+    inside = [c for c in range(4) if case >> c & 1]
+    outside = [c for c in range(4) if not case >> c & 1]
+    if len(inside) in (1, 3):
+      lone, others = (inside, outside) if len(inside) == 1 else (outside, inside)
+      a = lone[0]
+      table[case, 0] = [edge(a, b) for b in others]
+    elif len(inside) == 2:
+      (a, b), (c, d) = inside, outside
+      table[case, 0] = [edge(a, c), edge(a, d), edge(b, d)]
+      table[case, 1] = [edge(a, c), edge(b, d), edge(b, c)]
+  return table
+
+
+TET_TABLE = _build_tet_table()
+
+
+def marching_tetrahedra(values, cells, spacing, origin):
+  """Extract the zero isosurface of a sampled scalar field.
+
+  Fully vectorized: every tetrahedron of every given cell is classified
+  at once and triangles are emitted through a lookup table. Surface
+  vertices are created once per crossed grid edge, so the mesh is
+  watertight and shares vertices between triangles.
+
+  Args:
+    values: (R + 1, R + 1, R + 1) array of field values at grid points;
+            only the corners of `cells` need to be filled in
+    cells: (C, 3) integer grid coordinates of the cells to polygonize
+    spacing: grid spacing
+    origin: (3,) position of grid point (0, 0, 0)
+
+  Returns:
+    (vertices, triangles): (V, 3) float array and (T, 3) index array
+  """
+  dims = np.array(values.shape)
+  flat = values.reshape(-1)
+
+  # Global grid index of every corner of every cell: (C, 8)
+  corners = cells[:, np.newaxis, :] + CUBE_CORNERS[np.newaxis]
+  corner_ids = np.ravel_multi_index(corners.reshape(-1, 3).T, dims).reshape(-1, 8)
+
+  # (C * 6, 4) tetrahedra as global grid indices
+  tets = corner_ids[:, CUBE_TETS].reshape(-1, 4)
+  tet_values = flat[tets]
+  case = ((tet_values < 0) * (1 << np.arange(4))).sum(axis=1)
+
+  tris = TET_TABLE[case].reshape(-1, 3)  # two triangle slots per tet
+  owner = np.repeat(np.arange(len(tets)), 2)
+  keep = tris[:, 0] >= 0
+  tris, owner = tris[keep], owner[keep]
+
+  # Grid edge (a, b) for every triangle corner, then one vertex per edge.
+  ends = tets[owner[:, np.newaxis, np.newaxis], TET_EDGES[tris]]  # (T, 3, 2)
+  ends = np.sort(ends, axis=-1).reshape(-1, 2)
+  keys = ends[:, 0] * flat.size + ends[:, 1]
+  unique_keys, inverse = np.unique(keys, return_inverse=True)
+  a = unique_keys // flat.size
+  b = unique_keys % flat.size
+
+  va, vb = flat[a], flat[b]
+  t = va / (va - vb)
+  pa = np.stack(np.unravel_index(a, dims), axis=1)
+  pb = np.stack(np.unravel_index(b, dims), axis=1)
+  vertices = origin + spacing * (pa + t[:, np.newaxis] * (pb - pa))
+  return vertices, inverse.reshape(-1, 3)
+
+
+def slice_sdf(sdf, normal=(0, 0, 0, 1), offset=0.0, rotation=None, extent=2.5,
+              resolution=48, block_size=8, precision='full'):
+  """Exact (implicit) cross-section of a 4D solid with a hyperplane.
+
+  Samples the shape's signed-distance function on a 3D grid spanning the
+  hyperplane and extracts the zero surface with marching tetrahedra.
+  The grid is first divided into blocks and the SDF is evaluated at each
+  block center; since the SDFs are 1-Lipschitz, a block whose center is
+  farther from the surface than its half-diagonal cannot contain any of
+  it and is skipped without sampling its interior.
+
+  Args:
+    sdf: vectorized signed-distance function (e.g. shape.sdf)
+    normal: (4,) hyperplane normal in the rotated (viewer) frame
+    offset: signed distance of the hyperplane from the origin
+    rotation: optional (4, 4) rotation of the shape (row-vector
+              convention, as in Object4D.rotation)
+    extent: the grid covers [-extent, extent]^3 in slice coordinates
+    resolution: number of cells along each axis (rounded up to a
+                multiple of block_size)
+    block_size: cells per block edge for the skipping pass
+    precision: storage format of the resulting Shape3D
+
+  Returns:
+    Shape3D in slice coordinates (see hyperplane_basis / slice_to_4d),
+    with triangle faces and the edges of those triangles.
+  """
+  n = np.asarray(normal, dtype=np.float64)
+  n = n / np.linalg.norm(n)
+  basis = hyperplane_basis(n)
+  rotation = np.eye(4) if rotation is None else np.asarray(rotation, dtype=np.float64)
+
+  def field(points3):
+    p4 = offset * n + points3 @ basis
+    # rotated = v @ R, so the unrotated point is p @ R^T
+    return sdf(p4 @ rotation.T)
+
+  n_blocks = -(-resolution // block_size)
+  res = n_blocks * block_size
+  h = 2 * extent / res
+  origin = np.full(3, -extent)
+
+  # Coarse pass: one SDF sample per block decides whether to refine it.
+  block_idx = np.stack(np.meshgrid(*[np.arange(n_blocks)] * 3, indexing='ij'), -1).reshape(-1, 3)
+  centers = origin + (block_idx + 0.5) * block_size * h
+  half_diagonal = np.sqrt(3) / 2 * block_size * h
+  active_blocks = block_idx[np.abs(field(centers)) <= half_diagonal]
+
+  if len(active_blocks) == 0:
+    return Shape3D(np.zeros((0, 3)), np.zeros((0, 2)), [], precision=precision)
+
+  # Fine pass: sample only the grid points of active blocks.
+  local = np.stack(np.meshgrid(*[np.arange(block_size)] * 3, indexing='ij'), -1).reshape(-1, 3)
+  cells = (active_blocks[:, np.newaxis] * block_size + local[np.newaxis]).reshape(-1, 3)
+  dims = (res + 1,) * 3
+  corner_ids = np.ravel_multi_index(
+    (cells[:, np.newaxis] + CUBE_CORNERS[np.newaxis]).reshape(-1, 3).T, dims)
+  point_ids = np.unique(corner_ids)
+  values = np.full(dims, np.nan)
+  grid_points = np.stack(np.unravel_index(point_ids, dims), axis=1)
+  values.reshape(-1)[point_ids] = field(origin + h * grid_points)
+
+  # Only cells whose corners straddle zero can contain surface.
+  corner_vals = values.reshape(-1)[corner_ids].reshape(-1, 8)
+  crossing = (corner_vals.min(axis=1) < 0) & (corner_vals.max(axis=1) >= 0)
+  vertices, triangles = marching_tetrahedra(values, cells[crossing], h, origin)
+
+  edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+  edges = np.unique(edges, axis=0)
+  return Shape3D(vertices, edges, list(triangles), precision=precision)
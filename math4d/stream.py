@@ -0,0 +1,47 @@
+import numpy as np
+
+from math4d.projections import perspective_projection, orthographic_projection
+
+
+def transform_chunks(chunks, rotation, camera_distance=3.0, projection=None):
+  """Rotate and project a stream of 4D point chunks with constant memory.
+
+  A generator pipeline stage: for each (k, 4) chunk it yields the
+  projected (k, 3) positions and the depth along the viewing axis (the
+  rotated W values for the default projections). All work happens in
+  scratch buffers sized to the largest chunk seen so far, so peak memory
+  depends on the chunk size, not on the total number of points.
+
+  The yielded arrays are views into those buffers and are overwritten
+  when the generator advances; copy them if they need to outlive the
+  current iteration.
+
+  Args:
+    chunks: iterable of (k, 4) arrays (e.g. PointCloud4D.iter_chunks())
+    rotation: (4, 4) rotation matrix (row-vector convention)
+    camera_distance: distance of the 4D camera along W, or None for an
+                     orthographic projection
+    projection: optional math4d.projections.Projection to use instead
+                of the one camera_distance describes
+
+  Yields:
+    (verts_3d, w) tuples: (k, 3) projected positions and (k,) depths
+  """
+  if projection is None:
+    if camera_distance is None:
+      projection = orthographic_projection()
+    else:
+      projection = perspective_projection(camera_distance)
+
+  xyz_buf = None
+  h_buf = None
+
+  for chunk in chunks:
+    k = chunk.shape[0]
+    if xyz_buf is None or xyz_buf.shape[0] < k:
+      # Compute at the chunk's precision (float16 storage -> float32).
+      dtype = np.promote_types(chunk.dtype, np.float32)
+      xyz_buf = np.empty((k, 3), dtype=dtype)
+      h_buf = np.empty((k, 5), dtype=dtype)
+
+    yield projection.project(chunk, rotation, out=xyz_buf[:k], scratch=h_buf[:k])
@@ -1,32 +1,57 @@
 import numpy as np
-import pygame
 
 from math4d.rotations import rotation_matrix
-from math4d.projections import perspective
-from renderer.wireframe import draw_wireframe
+from math4d.projections import make_projection
+from math4d.stream import transform_chunks
+from math4d.culling import facing_cells, visible_edge_mask
+from math4d.slicing import slice_sdf, slice_to_4d
+from geometry.pointcloud import PointCloud4D
+from renderer.colormap import w_colors
+from renderer.trails import TrailBuffer
+from keymap import key_code
 
 
-# Key bindings: each entry maps a pygame key to (plane, sign).
+# Key bindings: each entry maps a pygame key name (see keymap.key_code)
+# to (plane, sign).
 # sign=+1 means positive rotation in that plane, -1 means negative.
 ROTATION_KEYS = {
   # Left hand: 3D rotations (XZ=yaw, YZ=pitch, XY=roll)
-  pygame.K_a: ('xz', +1),  # yaw left
-  pygame.K_d: ('xz', -1),  # yaw right
-  pygame.K_w: ('yz', -1),  # pitch up
-  pygame.K_s: ('yz', +1),  # pitch down
-  pygame.K_q: ('xy', +1),  # roll counter-clockwise
-  pygame.K_e: ('xy', -1),  # roll clockwise
+  'a': ('xz', +1),  # yaw left
+  'd': ('xz', -1),  # yaw right
+  'w': ('yz', -1),  # pitch up
+  's': ('yz', +1),  # pitch down
+  'q': ('xy', +1),  # roll counter-clockwise
+  'e': ('xy', -1),  # roll clockwise
   # Right hand: 4D rotations (ana = -W direction)
-  pygame.K_j: ('xw', -1),  # ana -> left
-  pygame.K_l: ('xw', +1),  # ana -> right
-  pygame.K_i: ('yw', +1),  # ana -> up
-  pygame.K_k: ('yw', -1),  # ana -> down
-  pygame.K_u: ('zw', +1),  # ana -> front
-  pygame.K_o: ('zw', -1),  # ana -> back
+  'j': ('xw', -1),  # ana -> left
+  'l': ('xw', +1),  # ana -> right
+  'i': ('yw', +1),  # ana -> up
+  'k': ('yw', -1),  # ana -> down
+  'u': ('zw', +1),  # ana -> front
+  'o': ('zw', -1),  # ana -> back
 }
 
 ROTATION_SPEED = 0.02  # radians per frame
 
+# Keys that move the slicing hyperplane along W (in slice mode)
+SLICE_KEYS = {
+  'LEFTBRACKET': -1,
+  'RIGHTBRACKET': +1,
+}
+
+# Projections the P key cycles through: (kind, viewing axis)
+PROJECTION_MODES = [
+  ('perspective', 'w'),
+  ('orthographic', 'w'),
+  ('orthographic', 'x'),
+  ('orthographic', 'y'),
+  ('orthographic', 'z'),
+  ('stereographic', 'w'),
+]
+
+SLICE_SPEED = 0.02  # units per frame
+SLICE_RESOLUTION = 40  # grid cells along each axis of the slicing grid
+
 
 class Object4D:
   """A 4D shape with rotation state and the ability to draw itself.
@@ -35,21 +60,73 @@ class Object4D:
   Handles keyboard input for rotation and reset, and knows how to
   project and render itself.
 
+  The shape can also be a PointCloud4D, in which case it is drawn as
+  points, streaming through the cloud one chunk at a time.
+
+  In slice mode, shapes with a signed-distance function are drawn as
+  their exact cross-section with the hyperplane w = slice_offset (in the
+  rotated frame) instead of as a wireframe.
+
+  In cull mode, edges of polytopes that lie only on 3-cells facing away
+  from the 4D viewpoint are left out (see math4d/culling.py), from the
+  wireframe and from its trail alike. Only this CPU wireframe path
+  culls: the split view and the GPU shader path draw every edge.
+
+  In trail mode, a wireframe is drawn over fading ghosts of where it was
+  in the last few frames (see renderer.trails).
+
   Attributes:
-    shape: the underlying Shape4D geometry
+    shape: the underlying Shape4D geometry (or PointCloud4D)
     rotation: (4, 4) accumulated rotation matrix
     camera_distance: distance for 4D perspective projection
+    projection_index: index into PROJECTION_MODES of the active projection
+    color_by_w: colour point clouds by their rotated W coordinate
+    slice_mode: draw the implicit cross-section instead of the wireframe
+    slice_offset: W position of the slicing hyperplane
+    cull: hide edges that belong only to cells facing away in 4D (CPU
+          wireframe path only)
+    trail_mode: draw fading ghosts of the last frames behind the wireframe
+    trail: TrailBuffer of recently projected frames
+    engine: optional math4d.engine.TransformEngine that projects on
+            several threads
+    last_wireframe: (verts_3d, edges) of the wireframe project() yielded
+                    last (None for point clouds), for code that needs the
+                    frame's projection after drawing, like picking
   """
 
-  def __init__(self, shape, camera_distance=3.0):
+  def __init__(self, shape, camera_distance=3.0, color_by_w=True, engine=None):
     self.shape = shape
     self.rotation = np.eye(4)
     self.camera_distance = camera_distance
+    self.color_by_w = color_by_w
+    self.projection_index = 0
+    self.slice_mode = False
+    self.slice_offset = 0.0
+    self._slice_cache = (None, None, None)  # (shape, key, Shape3D)
+    self.cull = False
+    self.trail_mode = False
+    self.trail = TrailBuffer()
+    self.engine = engine
+    self._engine_xyz = None  # output buffers of the engine, reused across frames
+    self._engine_colors = None
+    self.last_wireframe = None
 
   def reset_rotation(self):
     """Reset the 4D rotation to identity."""
     self.rotation = np.eye(4)
 
+  @property
+  def projection(self):
+    """The active math4d.projections.Projection."""
+    kind, axis = PROJECTION_MODES[self.projection_index]
+    return make_projection(kind, axis, self.camera_distance)
+
+  def next_projection(self):
+    """Switch to the next projection in PROJECTION_MODES; returns its name."""
+    self.projection_index = (self.projection_index + 1) % len(PROJECTION_MODES)
+    self.trail.reset()
+    return self.projection.name
+
   def update(self, keys):
     """Check rotation keys and update rotation state. Called once per frame.
 
@@ -57,14 +134,159 @@ class Object4D:
       - Rotation key pairs: accumulate rotation in the corresponding plane
       - X key: reset rotation to identity
     """
-    if keys[pygame.K_x]:
+    if keys[key_code('x')]:
       self.reset_rotation()
     for key, (plane, sign) in ROTATION_KEYS.items():
-      if keys[key]:
+      if keys[key_code(key)]:
         self.rotation = self.rotation @ rotation_matrix(plane, sign * ROTATION_SPEED)
+    if self.slice_mode:
+      for key, sign in SLICE_KEYS.items():
+        if keys[key_code(key)]:
+          self.slice_offset += sign * SLICE_SPEED
 
   def draw(self):
-    """Project to 3D and render as wireframe."""
-    rotated = self.shape.vertices @ self.rotation
-    verts_3d = perspective(rotated, self.camera_distance)
-    draw_wireframe(verts_3d, self.shape.edges)
+    """Project to 3D and render as wireframe (or points for a point cloud)."""
+    # Imported here so the object model loads without OpenGL.
+    from renderer.wireframe import draw_wireframe
+    from renderer.points import draw_points
+
+    if self.trail_mode:
+      self.trail.draw()
+    for verts_3d, edges, colors in self.project():
+      if edges is None:
+        draw_points(verts_3d, colors)
+      else:
+        draw_wireframe(verts_3d, edges)
+
+  def project(self):
+    """Do all the CPU work of a frame and yield what there is to draw.
+
+    Kept separate from draw() so the same work can run without OpenGL
+    (e.g. when replaying a recorded session headlessly).
+
+    The rotation and the active projection are combined into one 5x5
+    matrix, so each vertex costs one matrix product and one divide. It is
+    applied at the shape's compute dtype, so compact shapes are
+    transformed in float32 instead of being silently upcast.
+
+    Yields:
+      (verts_3d, edges, colors) batches: edges is None for a batch of
+      points, colors is None when the batch has a single colour. Point
+      batches (and every batch when an engine is set) reuse their
+      buffers, so consume each before the next.
+    """
+    self.last_wireframe = None
+    if isinstance(self.shape, PointCloud4D):
+      yield from self.project_points()
+      return
+    if self.slice_mode and self.shape.sdf is not None:
+      # Slices leave no trail, and the wireframe's ghosts would never fade.
+      self.trail.reset()
+      verts_3d, edges, colors = self.project_slice()
+      self.last_wireframe = (verts_3d, edges)
+      yield verts_3d, edges, colors
+      return
+    if self.engine is not None:
+      verts_3d = self.engine.transform(self.shape.vertices, self.rotation, self.projection,
+                                       out=self._engine_output(self.shape.num_vertices,
+                                                               self.shape.compute_dtype))
+    else:
+      verts_3d, _ = self.projection.project(self.shape.vertices, self.rotation)
+    mask = self.drawn_edge_mask()
+    edges = self.shape.edges if mask is None else self.shape.edges[mask]
+    self.last_wireframe = (verts_3d, edges)
+    yield verts_3d, edges, None
+    # Recorded once the frame has been consumed, so draw() shows only the
+    # previous frames as ghosts. The trail keeps the full edge array (a
+    # new one would reset it) and masks out this frame's hidden edges.
+    if self.trail_mode:
+      self.trail.push(verts_3d, self.shape.edges, mask)
+
+  def drawn_edge_mask(self):
+    """(E,) bool of the edges drawn in cull mode, or None when all are drawn.
+
+    Culling applies to shapes with 3-cells under projections with a
+    single viewpoint (not stereographic); others keep all their edges.
+    """
+    shape = self.shape
+    eye = self.projection.eye() if self.cull else None
+    if eye is None or not shape.has_topology('cells'):
+      return None
+    front = facing_cells(shape.topology('cell_normals'), shape.topology('cell_offsets'),
+                         self.rotation, eye)
+    return visible_edge_mask(shape.num_edges, shape.topology('edge_cells'), front)
+
+  def drawn_edges(self):
+    """The wireframe's edges, without hidden ones in cull mode."""
+    mask = self.drawn_edge_mask()
+    return self.shape.edges if mask is None else self.shape.edges[mask]
+
+  def project_points(self):
+    """Stream a point cloud through rotation and projection.
+
+    Only one chunk of points is in flight at a time, so memory use does
+    not grow with the size of the cloud.
+    """
+    cloud = self.shape
+    r = cloud.radius if cloud.radius else 1.0
+    if self.engine is not None:
+      yield from self._engine_points(cloud, r)
+      return
+    colors = None
+    for verts_3d, w in transform_chunks(cloud.iter_chunks(), self.rotation,
+                                        projection=self.projection):
+      if self.color_by_w:
+        if colors is None or len(colors) < len(w):
+          colors = np.empty((len(w), 3), dtype=np.float32)
+        yield verts_3d, None, w_colors(w, -r, r, out=colors[:len(w)])
+      else:
+        yield verts_3d, None, None
+
+  def _engine_output(self, n, dtype):
+    """An (n, 3) position buffer for the engine, reused while large enough."""
+    if self._engine_xyz is None or len(self._engine_xyz) < n or self._engine_xyz.dtype != dtype:
+      self._engine_xyz = np.empty((n, 3), dtype=dtype)
+    return self._engine_xyz[:n]
+
+  def _engine_points(self, cloud, r):
+    """project_points() on the engine: each chunk is split across its threads."""
+    for chunk in cloud.iter_chunks():
+      n = len(chunk)
+      xyz = self._engine_output(n, np.promote_types(chunk.dtype, np.float32))
+      if not self.color_by_w:
+        yield self.engine.transform(chunk, self.rotation, self.projection, out=xyz), None, None
+        continue
+      if self._engine_colors is None or len(self._engine_colors) < n:
+        self._engine_colors = np.empty((n, 3), dtype=np.float32)
+      colors = self._engine_colors[:n]
+      self.engine.transform(chunk, self.rotation, self.projection, out=xyz,
+                            colors=colors, depth_range=(-r, r))
+      yield xyz, None, colors
+
+  def cross_section(self):
+    """The implicit cross-section at the current rotation and offset.
+
+    Returns a Shape3D in XYZ coordinates of the hyperplane. Re-extracting
+    the surface is the expensive part, so the result is cached until the
+    shape (or its version), rotation or offset changes. The shape is kept
+    and compared by identity, so a new shape never picks up the slice of
+    a freed one that had the same id().
+    """
+    key = (self.shape.version, self.rotation.tobytes(), self.slice_offset)
+    cached_shape, cached_key, cached = self._slice_cache
+    if cached_shape is not self.shape or cached_key != key:
+      cached = slice_sdf(self.shape.sdf, offset=self.slice_offset,
+                         rotation=self.rotation, resolution=SLICE_RESOLUTION)
+      self._slice_cache = (self.shape, key, cached)
+    return cached
+
+  def project_slice(self):
+    """Place the cross-section where it sits in the current projection.
+
+    Returns:
+      (verts_3d, edges, None) batch of the cross-section's wireframe
+    """
+    section = self.cross_section()
+    verts_4d = slice_to_4d(section.vertices, (0, 0, 0, 1), self.slice_offset)
+    verts_3d, _ = self.projection.project(verts_4d)
+    return verts_3d, section.edges, None
@@ -1,7 +1,4 @@
-from OpenGL.GL import (
-  glLoadIdentity, glTranslatef, glRotatef,
-  GL_MODELVIEW, glMatrixMode,
-)
+from keymap import event_type, key_code
 
 
 class Camera:
@@ -45,20 +42,18 @@ class Camera:
       - MOUSEMOTION while dragging: orbit the camera
       - MOUSEWHEEL: zoom in/out
     """
-    import pygame
-
-    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+    if event.type == event_type('MOUSEBUTTONDOWN') and event.button == 1:
       self.dragging = True
 
-    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+    elif event.type == event_type('MOUSEBUTTONUP') and event.button == 1:
       self.dragging = False
 
-    elif event.type == pygame.MOUSEMOTION and self.dragging:
+    elif event.type == event_type('MOUSEMOTION') and self.dragging:
       dx, dy = event.rel  # pixels moved since last motion event
       self.rot_y += dx * self.sensitivity
       self.rot_x += dy * self.sensitivity
 
-    elif event.type == pygame.MOUSEWHEEL:
+    elif event.type == event_type('MOUSEWHEEL'):
       self.target_distance -= event.y * self.zoom_sensitivity
       self.target_distance = max(1.0, self.target_distance)
 
@@ -72,21 +67,27 @@ class Camera:
     Handles:
       - Z key: reset camera rotation to default orientation
     """
-    import pygame
-    if keys[pygame.K_z]:
+    if keys[key_code('z')]:
       self.reset()
 
+  def update_zoom(self):
+    """Smoothly approach the target zoom distance. Called once per frame."""
+    # Each frame we close 'zoom_speed' fraction of the remaining gap.
+    # At 0.1, it takes ~20-30 frames to visually settle.
+    self.distance += (self.target_distance - self.distance) * self.zoom_speed
+
   def apply(self):
     """Set the OpenGL modelview matrix to reflect current camera state.
 
     Called once per frame, before drawing. Replaces the current modelview
     matrix entirely (no accumulation across frames). Also smoothly
-    interpolates the zoom distance toward its target.
+    interpolates the zoom distance toward its target (see update_zoom).
     """
-    # Smoothly approach target zoom distance.
-    # Each frame we close 'zoom_speed' fraction of the remaining gap.
-    # At 0.1, it takes ~20-30 frames to visually settle.
-    self.distance += (self.target_distance - self.distance) * self.zoom_speed
+    # Imported here so the camera can be used without OpenGL (e.g. by the
+    # ray marcher or a headless replay).
+    from OpenGL.GL import glLoadIdentity, glTranslatef, glRotatef, glMatrixMode, GL_MODELVIEW
+
+    self.update_zoom()
 
     glMatrixMode(GL_MODELVIEW)
     glLoadIdentity()
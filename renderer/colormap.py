@@ -0,0 +1,30 @@
+import numpy as np
+
+
+# Colours at the two ends of the W range: kata (-W, away from the 4D
+# camera) is cool blue, ana (+W, toward it) is warm orange.
+W_COLOR_FAR = (0.2, 0.45, 1.0)
+W_COLOR_NEAR = (1.0, 0.55, 0.2)
+
+
+def w_colors(w, w_min, w_max, out=None):
+  """Map W coordinates to RGB colours by blending between two end colours.
+
+  Args:
+    w: (N,) array of W values
+    w_min: W value drawn fully in W_COLOR_FAR
+    w_max: W value drawn fully in W_COLOR_NEAR
+    out: optional (N, 3) float32 array to write into
+
+  Returns:
+    (N, 3) float32 array of RGB colours in [0, 1]
+  """
+  if out is None:
+    out = np.empty((len(w), 3), dtype=np.float32)
+  span = w_max - w_min if w_max > w_min else 1.0
+  t = np.clip((w - w_min) / span, 0.0, 1.0).astype(np.float32)[:, np.newaxis]
+  far = np.asarray(W_COLOR_FAR, dtype=np.float32)
+  near = np.asarray(W_COLOR_NEAR, dtype=np.float32)
+  np.multiply(t, near - far, out=out)
+  out += far
+  return out
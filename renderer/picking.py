@@ -0,0 +1,204 @@
+import numpy as np
+
+from renderer.raymarch import camera_basis
+
+
+# Screen-space picking. Like raymarch.py this is NumPy-only: it redoes the
+# camera and gluPerspective() transforms on the CPU so the index can be
+# built (and tested) without a GL context.
+
+DEFAULT_CELL_SIZE = 16  # pixels per grid cell
+DEFAULT_PICK_RADIUS = 10.0  # pixels
+
+
+def screen_positions(verts_3d, camera, width, height, fov=45.0):
+  """Pixel coordinates of projected 3D vertices as drawn through a Camera.
+
+  Args:
+    verts_3d: (N, 3) positions (the output of the 4D projection)
+    camera: object with `distance`, `rot_x`, `rot_y` (see camera_basis)
+    width, height: window size in pixels
+    fov: vertical field of view in degrees, as passed to gluPerspective
+
+  Returns:
+    (N, 2) float64 pixel coordinates (x right, y down, origin at the top
+    left); NaN for vertices behind the camera
+  """
+  eye_to_world, origin = camera_basis(camera)
+  eye = (np.asarray(verts_3d, dtype=np.float64) - origin) @ eye_to_world.T
+  depth = -eye[:, 2]
+  tan_half = np.tan(np.radians(fov) / 2)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    x_ndc = eye[:, 0] / (depth * tan_half * width / height)
+    y_ndc = eye[:, 1] / (depth * tan_half)
+  screen = np.column_stack([(x_ndc + 1) / 2 * width, (1 - y_ndc) / 2 * height])
+  screen[depth <= 0] = np.nan
+  return screen
+
+
+def _bucket(cell_ids, num_cells):
+  """Group item indices by cell (CSR): items of cell c are order[start[c]:start[c + 1]]."""
+  order = np.argsort(cell_ids, kind='stable')
+  start = np.searchsorted(cell_ids[order], np.arange(num_cells + 1))
+  return start, order
+
+
+class PickingIndex:
+  """Uniform-grid index of a projected wireframe for hover and selection.
+
+  The window is divided into square cells. Each vertex is stored in the
+  cell it falls in, and each edge in every cell its screen bounding box
+  overlaps, so a query only looks at the few cells within the pick
+  radius of the cursor instead of scanning every vertex or edge.
+
+  update() rebuilds the index only when something that moves the
+  projection has changed (shape or its version, 4D rotation, projection
+  or camera); otherwise queries reuse the last build. The shape is
+  compared by identity and kept referenced, so a new shape is never
+  mistaken for a freed one that had the same id().
+
+  Attributes:
+    width, height: window size in pixels
+    cell_size: edge length of a grid cell in pixels
+    fov: vertical field of view in degrees
+    verts_3d: projected 3D vertices of the last build
+    edges: (M, 2) edges of the last build
+    screen: (N, 2) pixel coordinates of the last build
+    examined: number of candidates the last query checked
+  """
+
+  def __init__(self, width, height, cell_size=DEFAULT_CELL_SIZE, fov=45.0):
+    self.width = width
+    self.height = height
+    self.cell_size = cell_size
+    self.fov = fov
+    self.cols = -(-width // cell_size)
+    self.rows = -(-height // cell_size)
+    self.verts_3d = np.zeros((0, 3))
+    self.edges = np.zeros((0, 2), dtype=np.int64)
+    self.screen = np.zeros((0, 2))
+    self.examined = 0
+    self._shape = None
+    self._key = None
+    self._vertex_cells = (np.zeros(self.cols * self.rows + 1, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    self._edge_cells = self._vertex_cells
+
+  def update(self, obj, camera, wireframe=None):
+    """Rebuild for an Object4D seen through a Camera, if anything moved.
+
+    Only wireframes are indexed (including slice cross-sections); point
+    clouds give an empty index.
+
+    Args:
+      obj: the Object4D
+      camera: the Camera it is seen through
+      wireframe: (verts_3d, edges) the current frame already projected
+                 for obj (its last_wireframe after drawing); projected
+                 here if None
+
+    Returns:
+      True if the index was rebuilt
+    """
+    key = (getattr(obj.shape, 'version', 0), obj.rotation.tobytes(), obj.projection_index,
+           obj.camera_distance, obj.slice_mode, obj.slice_offset, obj.cull,
+           camera.distance, camera.rot_x, camera.rot_y)
+    if obj.shape is self._shape and key == self._key:
+      return False
+    self._shape = obj.shape
+    self._key = key
+    if wireframe is None:
+      wireframe = np.zeros((0, 3)), np.zeros((0, 2), dtype=np.int64)
+      for batch_verts, batch_edges, _ in obj.project():
+        if batch_edges is not None:
+          wireframe = batch_verts, batch_edges
+        break
+    self.build(*wireframe, camera)
+    return True
+
+  def build(self, verts_3d, edges, camera):
+    """Index projected vertices and edges for the given camera."""
+    self.verts_3d = np.array(verts_3d)
+    self.edges = np.asarray(edges, dtype=np.int64)
+    self.screen = screen_positions(self.verts_3d, camera, self.width, self.height, self.fov)
+    num_cells = self.cols * self.rows
+
+    # Vertices: one cell each; off-screen and hidden ones are left out.
+    cx, cy, visible = self._cells(self.screen)
+    ids = np.flatnonzero(visible)
+    start, order = _bucket(cy[ids] * self.cols + cx[ids], num_cells)
+    self._vertex_cells = (start, ids[order])
+
+    # Edges: every cell of the screen bounding box, clipped to the window.
+    a, b = self.screen[self.edges[:, 0]], self.screen[self.edges[:, 1]]
+    lo = np.floor(np.fmin(a, b) / self.cell_size)
+    hi = np.floor(np.fmax(a, b) / self.cell_size)
+    ok = np.all(np.isfinite(lo) & np.isfinite(hi), axis=1)
+    ok &= (hi[:, 0] >= 0) & (hi[:, 1] >= 0) & (lo[:, 0] < self.cols) & (lo[:, 1] < self.rows)
+    ids = np.flatnonzero(ok)
+    lo = np.maximum(lo[ids], 0).astype(np.int64)
+    hi = np.minimum(hi[ids], [self.cols - 1, self.rows - 1]).astype(np.int64)
+    span = hi - lo + 1
+    counts = span[:, 0] * span[:, 1]
+    owner = np.repeat(np.arange(len(ids)), counts)
+    # Position of each entry within its edge's box, unravelled to (dx, dy).
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    ex = lo[owner, 0] + local % span[owner, 0]
+    ey = lo[owner, 1] + local // span[owner, 0]
+    start, order = _bucket(ey * self.cols + ex, num_cells)
+    self._edge_cells = (start, ids[owner[order]])
+
+  def _cells(self, points):
+    """Grid cell of each point, and whether it is inside the window."""
+    with np.errstate(invalid='ignore'):
+      cell = np.floor(points / self.cell_size)
+      visible = (np.all(np.isfinite(cell), axis=1)
+                 & (cell[:, 0] >= 0) & (cell[:, 0] < self.cols)
+                 & (cell[:, 1] >= 0) & (cell[:, 1] < self.rows))
+    cell = np.where(visible[:, np.newaxis], cell, 0).astype(np.int64)
+    return cell[:, 0], cell[:, 1], visible
+
+  def _candidates(self, cells, x, y, radius):
+    """Items stored in the cells within `radius` pixels of (x, y)."""
+    start, items = cells
+    x0 = max(int((x - radius) // self.cell_size), 0)
+    x1 = min(int((x + radius) // self.cell_size), self.cols - 1)
+    y0 = max(int((y - radius) // self.cell_size), 0)
+    y1 = min(int((y + radius) // self.cell_size), self.rows - 1)
+    if x0 > x1 or y0 > y1:
+      return items[:0]
+    # Cells of one grid row are consecutive, so each row is one slice.
+    rows = [items[start[r * self.cols + x0]:start[r * self.cols + x1 + 1]]
+            for r in range(y0, y1 + 1)]
+    return np.concatenate(rows)
+
+  def nearest_vertex(self, x, y, radius=DEFAULT_PICK_RADIUS):
+    """Index of the vertex drawn closest to pixel (x, y), or None.
+
+    Only vertices within `radius` pixels are considered.
+    """
+    candidates = self._candidates(self._vertex_cells, x, y, radius)
+    self.examined = len(candidates)
+    if len(candidates) == 0:
+      return None
+    d2 = ((self.screen[candidates] - (x, y))**2).sum(axis=1)
+    best = np.argmin(d2)
+    return int(candidates[best]) if d2[best] <= radius**2 else None
+
+  def nearest_edge(self, x, y, radius=DEFAULT_PICK_RADIUS):
+    """Index (into edges) of the edge drawn closest to pixel (x, y), or None.
+
+    Only edges passing within `radius` pixels are considered.
+    """
+    candidates = self._candidates(self._edge_cells, x, y, radius)
+    self.examined = len(candidates)
+    if len(candidates) == 0:
+      return None
+    a = self.screen[self.edges[candidates, 0]]
+    b = self.screen[self.edges[candidates, 1]]
+    ab = b - a
+    p = np.array([x, y], dtype=np.float64)
+    length2 = (ab**2).sum(axis=1)
+    t = np.clip(((p - a) * ab).sum(axis=1) / np.where(length2 > 0, length2, 1), 0, 1)
+    d2 = ((a + t[:, np.newaxis] * ab - p)**2).sum(axis=1)
+    best = np.argmin(d2)
+    return int(candidates[best]) if d2[best] <= radius**2 else None
@@ -0,0 +1,38 @@
+import numpy as np
+from OpenGL.GL import (
+  glColor3f, glPointSize, glEnableClientState, glDisableClientState,
+  glVertexPointer, glColorPointer, glDrawArrays,
+  GL_VERTEX_ARRAY, GL_COLOR_ARRAY, GL_POINTS, GL_FLOAT,
+)
+
+from renderer.wireframe import GL_VERTEX_TYPES
+
+
+def draw_points(vertices_3d, colors=None, color=(0.4, 0.8, 1.0), size=2.0):
+  """Draw projected 3D positions as points.
+
+  Submitted as one client-side vertex array, so a chunk of tens of
+  thousands of points is a single draw call.
+
+  Args:
+    vertices_3d: (N, 3) array of 3D positions (already projected from 4D)
+    colors: optional (N, 3) float32 array of per-point RGB colours
+    color: RGB tuple used when `colors` is None
+    size: point size in pixels
+  """
+  vertices_3d = np.ascontiguousarray(vertices_3d)
+  if vertices_3d.dtype not in GL_VERTEX_TYPES:
+    vertices_3d = vertices_3d.astype(np.float32)
+
+  glPointSize(size)
+  glEnableClientState(GL_VERTEX_ARRAY)
+  glVertexPointer(3, GL_VERTEX_TYPES[vertices_3d.dtype], 0, vertices_3d)
+  if colors is not None:
+    glEnableClientState(GL_COLOR_ARRAY)
+    glColorPointer(3, GL_FLOAT, 0, np.ascontiguousarray(colors, dtype=np.float32))
+  else:
+    glColor3f(*color)
+  glDrawArrays(GL_POINTS, 0, len(vertices_3d))
+  if colors is not None:
+    glDisableClientState(GL_COLOR_ARRAY)
+  glDisableClientState(GL_VERTEX_ARRAY)
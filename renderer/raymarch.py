@@ -0,0 +1,314 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from renderer.colormap import w_colors
+
+
+# This module is NumPy-only (no OpenGL) so that process-pool workers can
+# import it cheaply; renderer.window.draw_image() puts the result on screen.
+
+BACKGROUND = (0.05, 0.05, 0.08)  # matches the glClearColor in window.py
+
+
+def camera_basis(camera):
+  """Orientation and position of an orbiting Camera in the projected 3D space.
+
+  Mirrors Camera.apply(): the camera sits `distance` away from the
+  origin, rotated by rot_x about X and rot_y about Y.
+
+  Returns:
+    (eye_to_world, origin): (3, 3) rotation taking eye-space row vectors
+    to world space (`v @ eye_to_world`), and the (3,) camera position
+  """
+  ax = np.radians(camera.rot_x)
+  ay = np.radians(camera.rot_y)
+  rx = np.array([[1, 0, 0],
+                 [0, np.cos(ax), -np.sin(ax)],
+                 [0, np.sin(ax), np.cos(ax)]])
+  ry = np.array([[np.cos(ay), 0, np.sin(ay)],
+                 [0, 1, 0],
+                 [-np.sin(ay), 0, np.cos(ay)]])
+  # World -> eye is translate(-distance) · Rx · Ry, so eye -> world for a
+  # row vector is `v @ (Rx @ Ry)`.
+  eye_to_world = rx @ ry
+  origin = np.array([0.0, 0.0, camera.distance]) @ eye_to_world
+  return eye_to_world, origin
+
+
+def camera_rays(camera, width, height, fov=45.0):
+  """Build the 3D viewing rays of an orbiting Camera, one per pixel.
+
+  Mirrors what Camera.apply() and the gluPerspective() call in window.py
+  do on the GPU: the camera (see camera_basis) looks at the origin
+  through a symmetric frustum with the given vertical field of view.
+
+  Args:
+    camera: object with `distance`, `rot_x` and `rot_y` (degrees), e.g. a
+            renderer.camera.Camera
+    width: image width in pixels
+    height: image height in pixels
+    fov: vertical field of view in degrees
+
+  Returns:
+    (origin, directions): (3,) camera position and (height, width, 3)
+    unit ray directions in the projected 3D space; row 0 is the top of
+    the image.
+  """
+  eye_to_world, origin = camera_basis(camera)
+
+  tan_half = np.tan(np.radians(fov) / 2)
+  aspect = width / height
+  u = (2 * (np.arange(width) + 0.5) / width - 1) * tan_half * aspect
+  v = (1 - 2 * (np.arange(height) + 0.5) / height) * tan_half
+  uu, vv = np.meshgrid(u, v)
+  dirs_eye = np.stack([uu, vv, -np.ones_like(uu)], axis=-1)
+  dirs = dirs_eye @ eye_to_world
+  dirs /= np.linalg.norm(dirs, axis=-1, keepdims=True)
+  return origin, dirs
+
+
+def _sphere_trace(sdf, origin, dirs, beta0, beta1, max_steps, eps):
+  """Sphere-trace 4D rays origin + beta * dirs for beta in [beta0, beta1].
+
+  Rays that hit or leave the interval drop out of the active set, so
+  each step only evaluates the SDF for rays that are still marching.
+
+  Returns:
+    (hit, beta, min_dist, unfinished): which rays hit, where along the
+    ray they stopped, the smallest distance seen along each ray, and
+    which rays ran out of steps before hitting or leaving the interval.
+  """
+  n = dirs.shape[0]
+  beta = beta0.copy()
+  hit = np.zeros(n, dtype=bool)
+  min_dist = np.full(n, np.inf)
+  active = np.flatnonzero(beta0 < beta1)
+
+  for _ in range(max_steps):
+    if active.size == 0:
+      break
+    p = origin + beta[active, np.newaxis] * dirs[active]
+    d = sdf(p)
+    min_dist[active] = np.minimum(min_dist[active], d)
+    done = d < eps
+    hit[active[done]] = True
+    beta[active] += np.where(done, 0.0, d)
+    active = active[~done & (beta[active] < beta1[active])]
+
+  unfinished = np.zeros(n, dtype=bool)
+  unfinished[active] = True
+  return hit, beta, min_dist, unfinished
+
+
+def _ray_ball(origin, dirs, radius):
+  """Intersect rays from one origin with a ball centered at the origin.
+
+  Args:
+    origin: (D,) common ray origin
+    dirs: (N, D) unit ray directions
+    radius: ball radius
+
+  Returns:
+    (enter, leave, closest): ray parameters of the entry and exit points
+    (NaN where the ray misses) and of the point closest to the center.
+  """
+  b = dirs @ origin
+  c = origin @ origin - radius**2
+  disc = b * b - c
+  root = np.sqrt(np.where(disc >= 0, disc, np.nan))
+  return -b - root, -b + root, -b
+
+
+def _render_tile(job):
+  """Render one rectangular tile of the image. Runs in a worker process.
+
+  For a pixel, the 3D ray q(t) = o + t * dir sweeps through projected
+  space. Every projected point q is the image of a 4D line through the
+  4D eye E = (0, 0, 0, d): p = E + s * (q, -1). Along the pixel's ray
+  those lines fan out into a 2D half-plane of 4D rays D(t) = (o, -1) +
+  t * (dir, 0). The visible surface is the first t whose 4D ray hits
+  the object.
+
+  The outer loop advances t; the inner loop sphere-traces the 4D ray
+  D(t). If every point of a missed 4D ray is at least m from the
+  surface, and the object lies within beta_max of the eye along it,
+  then t can advance by m * |D| / (beta_max * |V|) without skipping any
+  geometry, so steps are large in empty space and shrink near
+  silhouettes. Rays that hit, or leave the projected bounding ball,
+  stop marching immediately.
+
+  Returns the (rows, cols, 3) shaded tile.
+  """
+  (sdf, rotation, camera_distance, origin, dirs, bound, params) = job
+  max_outer, max_inner, eps, min_step = params
+  rows, cols = dirs.shape[:2]
+  dirs = dirs.reshape(-1, 3)
+  n = dirs.shape[0]
+
+  # Evaluate the SDF in the rotated frame: rotated = v @ R, so v = p @ R^T.
+  def sdf_rotated(p):
+    return sdf(p @ rotation.T)
+
+  eye = np.array([0.0, 0.0, 0.0, camera_distance])
+  hit_t = np.full(n, np.nan)
+  hit_w = np.zeros(n)
+
+  # Bound of the projected solid: |xyz| <= bound and d - w >= d - bound.
+  if camera_distance > bound:
+    q_bound = bound / (camera_distance - bound)
+  else:
+    q_bound = 1e3
+  t0, t1, _ = _ray_ball(origin, dirs, q_bound)
+  t = np.maximum(np.nan_to_num(t0, nan=np.inf), 0)
+  t_end = np.nan_to_num(t1, nan=-np.inf)
+  active = np.flatnonzero(t <= t_end)
+  t_min_step = min_step * q_bound
+
+  u = np.concatenate([origin, [-1.0]])
+  for _ in range(max_outer):
+    if active.size == 0:
+      break
+    v = np.concatenate([dirs[active], np.zeros((active.size, 1))], axis=1)
+    d4 = u + t[active, np.newaxis] * v
+    d4_len = np.linalg.norm(d4, axis=1)
+    d4 /= d4_len[:, np.newaxis]
+
+    b0, b1, closest = _ray_ball(eye, d4, bound)
+    b0 = np.maximum(np.nan_to_num(b0, nan=np.inf), 0)
+    b1 = np.nan_to_num(b1, nan=-np.inf)
+    hit, beta, min_dist, unfinished = _sphere_trace(
+      sdf_rotated, eye, d4, b0, b1, max_inner, eps)
+
+    if hit.any():
+      idx = active[hit]
+      hit_t[idx] = t[idx]
+      hit_w[idx] = camera_distance + beta[hit] * d4[hit, 3]
+
+    # Clearance of each missed 4D ray from the surface. Between two
+    # sphere-tracing samples the SDF cannot drop below half the next
+    # sample's value, so half the smallest sample is a safe bound. Rays
+    # that miss the bounding ball are as far from the object as they are
+    # from the ball; rays that ran out of steps get no guarantee.
+    miss = ~hit
+    dist_to_center = np.sqrt(np.maximum(camera_distance**2 - closest[miss]**2, 0))
+    clearance = np.where(np.isfinite(min_dist[miss]), 0.5 * min_dist[miss],
+                         dist_to_center - bound)
+    clearance = np.where(unfinished[miss], 0.0, np.maximum(clearance, 0.0))
+    # Any object point on the ray lies within the ball, so at most
+    # closest + bound from the eye.
+    beta_max = np.maximum(closest[miss] + bound, eps)
+    v_len = np.linalg.norm(v[miss], axis=1)
+    # Safe advance, bounded below so every ray finishes in at most
+    # max_outer steps.
+    step = clearance * d4_len[miss] / (beta_max * np.maximum(v_len, 1e-12))
+    still = active[miss]
+    t[still] += np.maximum(step, t_min_step)
+    active = still[t[still] <= t_end[still]]
+
+  return _shade(origin, dirs.reshape(rows, cols, 3), hit_t.reshape(rows, cols),
+                hit_w.reshape(rows, cols), bound)
+
+
+def _shade(origin, dirs, hit_t, hit_w, bound):
+  """Shade a tile of hits: W colouring times a 3D headlight term.
+
+  The first 4D ray to touch the object always grazes it, so its 4D
+  normal is useless for lighting. Instead the normal of the projected
+  3D surface is estimated from the hit positions of neighbouring pixels.
+  """
+  rows, cols = hit_t.shape
+  image = np.empty((rows, cols, 3), dtype=np.float32)
+  image[:] = BACKGROUND
+  hit = np.isfinite(hit_t)
+  if not hit.any():
+    return image
+
+  q = origin + hit_t[..., np.newaxis] * dirs
+  d_row = np.gradient(q, axis=0) if rows > 1 else np.zeros_like(q)
+  d_col = np.gradient(q, axis=1) if cols > 1 else np.zeros_like(q)
+  normal = np.cross(d_col, d_row)
+  normal /= np.linalg.norm(normal, axis=-1, keepdims=True)
+  lambert = np.abs(np.einsum('ijk,ijk->ij', normal, dirs))
+  # Silhouette pixels have missing neighbours; light them fully.
+  lambert = np.where(np.isfinite(lambert), lambert, 1.0)
+
+  base = w_colors(hit_w[hit], -bound, bound)
+  image[hit] = base * (0.3 + 0.7 * lambert[hit])[:, np.newaxis]
+  return image
+
+
+class RayMarcher:
+  """CPU ray-marching renderer for shapes with a signed-distance function.
+
+  Splits the image into square tiles and renders them in parallel on a
+  process pool (or inline when workers=1). The pool is created once and
+  reused for every frame; call close() when done.
+
+  Attributes:
+    width, height: output image size in pixels
+    tile_size: edge length of a tile in pixels
+    workers: number of worker processes (1 = render in this process)
+    max_outer: cap on outer (projected-space) steps per pixel
+    max_inner: cap on sphere-tracing steps per 4D ray
+    eps: hit tolerance, as a fraction of the bounding radius
+    min_step: smallest outer step, as a fraction of the projected bound
+  """
+
+  def __init__(self, width=200, height=150, tile_size=32, workers=None,
+               max_outer=48, max_inner=48, eps=1e-3, min_step=0.01, fov=45.0):
+    self.width = width
+    self.height = height
+    self.tile_size = tile_size
+    self.workers = workers if workers is not None else (os.cpu_count() or 1)
+    self.max_outer = max_outer
+    self.max_inner = max_inner
+    self.eps = eps
+    self.min_step = min_step
+    self.fov = fov
+    self._pool = None
+
+  def render(self, obj, camera):
+    """Render an Object4D as seen through a Camera.
+
+    Args:
+      obj: Object4D whose shape has an `sdf` (uses its rotation and
+           camera_distance)
+      camera: the 3D orbit camera
+
+    Returns:
+      (height, width, 3) float32 RGB image, row 0 at the top
+    """
+    shape = obj.shape
+    assert getattr(shape, 'sdf', None) is not None, "shape has no signed-distance function"
+    bound = float(np.linalg.norm(shape.vertices.astype(np.float64), axis=1).max()) * 1.01
+    origin, dirs = camera_rays(camera, self.width, self.height, self.fov)
+    params = (self.max_outer, self.max_inner, self.eps * bound, self.min_step)
+
+    jobs = []
+    slots = []
+    for r in range(0, self.height, self.tile_size):
+      for c in range(0, self.width, self.tile_size):
+        tile = dirs[r:r + self.tile_size, c:c + self.tile_size]
+        jobs.append((shape.sdf, np.asarray(obj.rotation, dtype=np.float64),
+                     float(obj.camera_distance), origin, tile, bound, params))
+        slots.append((r, c))
+
+    if self.workers == 1:
+      tiles = map(_render_tile, jobs)
+    else:
+      if self._pool is None:
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+      tiles = self._pool.map(_render_tile, jobs)
+
+    image = np.empty((self.height, self.width, 3), dtype=np.float32)
+    for (r, c), tile in zip(slots, tiles):
+      image[r:r + tile.shape[0], c:c + tile.shape[1]] = tile
+    return image
+
+  def close(self):
+    """Shut down the worker pool, if one was started."""
+    if self._pool is not None:
+      self._pool.shutdown()
+      self._pool = None
@@ -0,0 +1,242 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import (
+  glCreateShader, glShaderSource, glCompileShader, glGetShaderiv, glGetShaderInfoLog,
+  glCreateProgram, glAttachShader, glBindAttribLocation, glLinkProgram,
+  glGetProgramiv, glGetProgramInfoLog, glDeleteShader, glDeleteProgram,
+  glUseProgram, glGetUniformLocation, glUniformMatrix4fv, glUniform4fv,
+  glUniform1f, glUniform1i, glUniform3f,
+  glGenBuffers, glDeleteBuffers, glBindBuffer, glBufferData, glBufferSubData, glGetBufferSubData,
+  glEnableVertexAttribArray, glDisableVertexAttribArray, glVertexAttribPointer,
+  glDrawElements, glDrawArrays, glEnable, glDisable,
+  glTransformFeedbackVaryings, glBindBufferBase,
+  glBeginTransformFeedback, glEndTransformFeedback,
+  GL_VERTEX_SHADER, GL_FRAGMENT_SHADER, GL_COMPILE_STATUS, GL_LINK_STATUS,
+  GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_TRANSFORM_FEEDBACK_BUFFER,
+  GL_STATIC_DRAW, GL_STATIC_READ, GL_INTERLEAVED_ATTRIBS, GL_RASTERIZER_DISCARD,
+  GL_FLOAT, GL_FALSE, GL_LINES, GL_POINTS,
+)
+
+from math4d.projections import STEREO_EPS
+from renderer.wireframe import GL_INDEX_TYPES
+
+
+# GLSL 1.20 so the shaders run on the same legacy (compatibility) context
+# as the rest of the renderer; the camera's modelview and gluPerspective
+# matrices still apply to the projected 3D positions.
+#
+# The active projection arrives as its combined 5x5 matrix M (rotation
+# folded in, row-vector convention), split into the parts that produce
+# XYZ/depth and the homogeneous divisor H:
+#   [xyz, depth] = p @ M[:4, :4] + M[4, :4]
+#   H            = p @ M[:4, 4]  + M[4, 4]   (+ |p| if stereographic)
+# A NumPy C-order matrix read by GL as column-major is its transpose, so
+# `linear * p` computes p @ M[:4, :4] without transposing on upload.
+VERTEX_SHADER = """
+#version 120
+attribute vec4 position4d;
+uniform mat4 linear;
+uniform vec4 offset;
+uniform vec4 h_row;
+uniform float h_offset;
+uniform bool stereographic;
+uniform float stereo_eps;
+varying vec3 projected;
+varying float depth;
+
+void main() {
+  vec4 p = linear * position4d + offset;
+  float h = dot(h_row, position4d) + h_offset;
+  if (stereographic) {
+    float len = length(position4d);
+    h = max(h + len, max(stereo_eps * len, 1e-30));  // STEREO_MIN_DIVISOR
+  }
+  projected = p.xyz / h;
+  depth = p.w;
+  gl_Position = gl_ModelViewProjectionMatrix * vec4(projected, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+uniform vec3 color;
+
+void main() {
+  gl_FragColor = vec4(color, 1.0);
+}
+"""
+
+POSITION_LOCATION = 0  # aliases gl_Vertex, so drawing works on compat contexts
+
+
+def _compile(kind, source):
+  shader = glCreateShader(kind)
+  glShaderSource(shader, source)
+  glCompileShader(shader)
+  if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+    raise RuntimeError(f"shader compile failed: {glGetShaderInfoLog(shader).decode()}")
+  return shader
+
+
+def _link(vertex_source, fragment_source, feedback_varyings=()):
+  """Compile and link a program; position4d is bound to POSITION_LOCATION."""
+  shaders = [_compile(GL_VERTEX_SHADER, vertex_source),
+             _compile(GL_FRAGMENT_SHADER, fragment_source)]
+  program = glCreateProgram()
+  for shader in shaders:
+    glAttachShader(program, shader)
+  glBindAttribLocation(program, POSITION_LOCATION, 'position4d')
+  if feedback_varyings:
+    names = (ctypes.c_char_p * len(feedback_varyings))(
+      *[v.encode() for v in feedback_varyings])
+    glTransformFeedbackVaryings(program, len(feedback_varyings),
+                                ctypes.cast(names, ctypes.POINTER(ctypes.POINTER(ctypes.c_char))),
+                                GL_INTERLEAVED_ATTRIBS)
+  glLinkProgram(program)
+  for shader in shaders:
+    glDeleteShader(shader)
+  if not glGetProgramiv(program, GL_LINK_STATUS):
+    raise RuntimeError(f"shader link failed: {glGetProgramInfoLog(program).decode()}")
+  return program
+
+
+class ShaderRenderer:
+  """Wireframe renderer that rotates and projects 4D vertices on the GPU.
+
+  The shape's raw 4D vertices and edge indices are uploaded to buffer
+  objects once (and again only when a different shape is drawn); each
+  frame then transfers just the combined rotation-and-projection matrix
+  (see math4d.projections.Projection), and the vertex shader does the
+  rest. Vertices are uploaded as float32, the precision the shader
+  computes in.
+
+  Needs a current OpenGL context (2.0 for drawing; transform() also
+  needs transform feedback, i.e. OpenGL 3.0).
+  """
+
+  def __init__(self):
+    self.supports_feedback = bool(glTransformFeedbackVaryings)
+    varyings = ('projected', 'depth') if self.supports_feedback else ()
+    self.program = _link(VERTEX_SHADER, FRAGMENT_SHADER, varyings)
+    self.uniforms = {name: glGetUniformLocation(self.program, name)
+                     for name in ('linear', 'offset', 'h_row', 'h_offset',
+                                  'stereographic', 'stereo_eps', 'color')}
+    self.vertex_buffer, self.index_buffer = glGenBuffers(2)
+    self._shape = None
+    self._version = None
+    self._num_vertices = 0
+    self._index_count = 0
+    self._index_type = None
+
+  def upload(self, shape):
+    """Upload a shape's vertices and edges, unless they are already resident.
+
+    A shape morphed in place since its upload (a new `version`) only has
+    its vertices uploaded again; the edges never change.
+    """
+    if shape is self._shape and shape.version == self._version:
+      return
+    if shape is self._shape:
+      vertices = np.ascontiguousarray(shape.vertices, dtype=np.float32)
+      glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+      glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
+      glBindBuffer(GL_ARRAY_BUFFER, 0)
+      self._version = shape.version
+      return
+    vertices = np.ascontiguousarray(shape.vertices, dtype=np.float32)
+    edges = np.ascontiguousarray(shape.edges)
+    if edges.dtype not in GL_INDEX_TYPES:
+      edges = edges.astype(np.uint32)
+
+    glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+    glBufferData(GL_ELEMENT_ARRAY_BUFFER, edges.nbytes, edges, GL_STATIC_DRAW)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    self._shape = shape
+    self._version = shape.version
+    self._num_vertices = len(vertices)
+    self._index_count = edges.size
+    self._index_type = GL_INDEX_TYPES[edges.dtype]
+
+  def _begin(self, rotation, projection, color=(0.4, 0.8, 1.0)):
+    """Bind the program, set this frame's uniforms and the vertex attribute."""
+    m = projection.combined(rotation).astype(np.float32)
+    u = self.uniforms
+    glUseProgram(self.program)
+    glUniformMatrix4fv(u['linear'], 1, GL_FALSE, np.ascontiguousarray(m[:4, :4]))
+    glUniform4fv(u['offset'], 1, m[4, :4])
+    glUniform4fv(u['h_row'], 1, np.ascontiguousarray(m[:4, 4]))
+    glUniform1f(u['h_offset'], m[4, 4])
+    glUniform1i(u['stereographic'], int(projection.stereographic))
+    glUniform1f(u['stereo_eps'], STEREO_EPS)
+    glUniform3f(u['color'], *color)
+
+    glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+    glEnableVertexAttribArray(POSITION_LOCATION)
+    glVertexAttribPointer(POSITION_LOCATION, 4, GL_FLOAT, GL_FALSE, 0, None)
+
+  def _end(self):
+    glDisableVertexAttribArray(POSITION_LOCATION)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+    glUseProgram(0)
+
+  def draw(self, shape, rotation, projection, color=(0.4, 0.8, 1.0)):
+    """Draw a Shape4D's wireframe under a rotation and projection.
+
+    Every edge is drawn: the index buffer is resident, so back-cell
+    culling (Object4D.cull) is not applied on this path.
+
+    Args:
+      shape: the Shape4D (uploaded on first use)
+      rotation: (4, 4) rotation matrix (row-vector convention)
+      projection: a math4d.projections.Projection
+      color: RGB tuple, each component in [0, 1]
+    """
+    self.upload(shape)
+    self._begin(rotation, projection, color)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+    glDrawElements(GL_LINES, self._index_count, self._index_type, None)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+    self._end()
+
+  def transform(self, shape, rotation, projection):
+    """Run the vertex shader and read back its results (transform feedback).
+
+    Used to check the GPU path against Projection.project() on the CPU.
+
+    Returns:
+      (verts_3d, depth): (N, 3) float32 projected positions and (N,) depths
+    """
+    assert self.supports_feedback, "transform feedback needs OpenGL 3.0"
+    self.upload(shape)
+    n = self._num_vertices
+    feedback = glGenBuffers(1)
+    glBindBuffer(GL_TRANSFORM_FEEDBACK_BUFFER, feedback)
+    glBufferData(GL_TRANSFORM_FEEDBACK_BUFFER, n * 4 * 4, None, GL_STATIC_READ)
+    glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, feedback)
+
+    self._begin(rotation, projection)
+    glEnable(GL_RASTERIZER_DISCARD)
+    glBeginTransformFeedback(GL_POINTS)
+    glDrawArrays(GL_POINTS, 0, n)
+    glEndTransformFeedback()
+    glDisable(GL_RASTERIZER_DISCARD)
+    self._end()
+
+    # Read back as raw bytes: [projected.xyz, depth] per vertex.
+    out = glGetBufferSubData(GL_TRANSFORM_FEEDBACK_BUFFER, 0, n * 4 * 4)
+    out = np.frombuffer(out, dtype=np.float32).reshape(n, 4)
+    glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, 0)
+    glBindBuffer(GL_TRANSFORM_FEEDBACK_BUFFER, 0)
+    glDeleteBuffers(1, [feedback])
+    return out[:, :3], out[:, 3]
+
+  def release(self):
+    """Free the GPU program and buffers."""
+    glDeleteBuffers(2, [self.vertex_buffer, self.index_buffer])
+    glDeleteProgram(self.program)
+    self._shape = None
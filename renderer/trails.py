@@ -0,0 +1,130 @@
+import numpy as np
+
+
+TRAIL_LENGTH = 24  # ghost frames kept
+TRAIL_COLOR = (0.4, 0.8, 1.0)
+TRAIL_ALPHA = 0.5  # opacity of the most recent ghost; older ones fade to 0
+
+
+class TrailBuffer:
+  """Ring buffer of recently projected frames of a wireframe, drawn as ghosts.
+
+  All storage is allocated when the first frame of a mesh arrives:
+
+    positions: (capacity, V, 3) float32, one slot per frame
+    indices:   (capacity, E, 2) uint32, the edges offset into each slot
+    colors:    (capacity, V, 4) uint8 RGBA, only the alpha changes
+
+  Pushing a frame copies it into the oldest slot, and drawing rewrites
+  the alpha of each slot from its age in place, so neither allocates.
+  Since slot k always holds vertices k * V to (k + 1) * V, the index
+  array never changes, and the filled slots (a prefix until the buffer
+  wraps, then all of them) are drawn with one glDrawElements call.
+
+  The buffer resets itself when it is given a different edge array,
+  i.e. when the shape changes. Frames that draw only some of the edges
+  (back-cell culling) pass a mask instead of a smaller array: the hidden
+  edges of that slot are collapsed onto one endpoint, so they draw
+  nothing, and the slot's indices are restored when it is reused.
+
+  Attributes:
+    capacity: number of frames kept
+    color: RGB tuple of the ghosts, each component in [0, 1]
+    max_alpha: opacity of the most recent frame
+    count: number of frames currently held
+  """
+
+  def __init__(self, capacity=TRAIL_LENGTH, color=TRAIL_COLOR, max_alpha=TRAIL_ALPHA):
+    assert capacity >= 1, f"capacity must be at least 1, got {capacity}"
+    self.capacity = capacity
+    self.color = color
+    self.max_alpha = max_alpha
+    self.count = 0
+    self._head = 0  # slot the next frame goes into
+    self._edges = None
+    self._slot_edges = None  # uint32 edges of the mesh, before the slot offset
+    self._masked = np.zeros(self.capacity, dtype=bool)  # slots with collapsed edges
+    self.positions = None
+    self.indices = None
+    self.colors = None
+    # Alpha of a frame by age: 1 for the most recent, capacity for the oldest.
+    ages = np.arange(self.capacity + 1)
+    self._alpha_by_age = np.round(255 * max_alpha * (1 - (ages - 1) / capacity)).astype(np.uint8)
+    self._slots = np.arange(self.capacity)
+    self._ages = np.empty(self.capacity, dtype=np.int64)
+    self._alpha = np.empty(self.capacity, dtype=np.uint8)
+
+  def reset(self):
+    """Forget all frames (the storage is kept)."""
+    self.count = 0
+    self._head = 0
+
+  def _allocate(self, num_vertices, edges):
+    self._edges = edges
+    self.reset()
+    if self.positions is None or self.positions.shape[1] != num_vertices:
+      self.positions = np.empty((self.capacity, num_vertices, 3), dtype=np.float32)
+      self.colors = np.empty((self.capacity, num_vertices, 4), dtype=np.uint8)
+      self.colors[..., :3] = np.round(255 * np.asarray(self.color))
+    offsets = (self._slots * num_vertices).astype(np.uint32)
+    self._slot_edges = np.asarray(edges, dtype=np.uint32)
+    self.indices = self._slot_edges[np.newaxis] + offsets[:, np.newaxis, np.newaxis]
+    self._masked[:] = False
+
+  def push(self, verts_3d, edges, mask=None):
+    """Add a projected frame, replacing the oldest one once the buffer is full.
+
+    Args:
+      verts_3d: (V, 3) projected vertices of the frame
+      edges: (E, 2) edges of the mesh (the same array every frame)
+      mask: optional (E,) bool of the edges drawn in this frame
+    """
+    if edges is not self._edges or self.positions.shape[1] != len(verts_3d):
+      self._allocate(len(verts_3d), edges)
+    slot = self.indices[self._head]
+    if self._masked[self._head]:
+      np.add(self._slot_edges, np.uint32(self._head * len(verts_3d)), out=slot)
+    if mask is not None:
+      hidden = ~np.asarray(mask, dtype=bool)
+      slot[hidden, 1] = slot[hidden, 0]
+    self._masked[self._head] = mask is not None
+    self.positions[self._head] = verts_3d
+    self._head = (self._head + 1) % self.capacity
+    self.count = min(self.count + 1, self.capacity)
+
+  def ages(self):
+    """Age of the frame in each slot: 1 for the most recent (a view of a reused buffer)."""
+    np.subtract(self._head - 1 + self.capacity, self._slots, out=self._ages)
+    np.remainder(self._ages, self.capacity, out=self._ages)
+    self._ages += 1
+    return self._ages
+
+  def update_alpha(self):
+    """Write each held frame's age-based alpha into the colour buffer."""
+    np.take(self._alpha_by_age, self.ages(), out=self._alpha)
+    self.colors[:self.count, :, 3] = self._alpha[:self.count, np.newaxis]
+
+  def draw(self):
+    """Draw every held frame in one call, older frames more transparent.
+
+    Ghosts do not write depth, so they never hide the current frame.
+    """
+    if self.count == 0:
+      return
+    from OpenGL.GL import (
+      glEnableClientState, glDisableClientState, glVertexPointer, glColorPointer,
+      glDrawElements, glDepthMask,
+      GL_VERTEX_ARRAY, GL_COLOR_ARRAY, GL_LINES, GL_FLOAT, GL_UNSIGNED_BYTE,
+      GL_UNSIGNED_INT, GL_FALSE, GL_TRUE,
+    )
+
+    self.update_alpha()
+    glDepthMask(GL_FALSE)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, self.positions)
+    glColorPointer(4, GL_UNSIGNED_BYTE, 0, self.colors)
+    glDrawElements(GL_LINES, self.indices[:self.count].size, GL_UNSIGNED_INT, self.indices)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glDepthMask(GL_TRUE)
@@ -0,0 +1,200 @@
+import numpy as np
+
+from math4d.projections import make_projection
+
+
+# Split view: the perspective view beside the four axis-dropped
+# orthographic views, as (kind, axis) pairs of make_projection(). The
+# first view gets the left half of the window, the rest share the right.
+SPLIT_VIEWS = [
+  ('perspective', 'w'),
+  ('orthographic', 'x'),
+  ('orthographic', 'y'),
+  ('orthographic', 'z'),
+  ('orthographic', 'w'),
+]
+
+
+def split_projections(camera_distance=3.0, views=SPLIT_VIEWS):
+  """The Projection of each split view."""
+  return [make_projection(kind, axis, camera_distance) for kind, axis in views]
+
+
+def project_views(vertices, rotation, projections, out=None):
+  """Rotate 4D vertices once and project them for several views.
+
+  The vertices are rotated into one shared buffer, and every view is
+  projected from it. Views whose divisor H is constant (orthographic
+  views) are a single (N, 4) @ (4, 3) product written straight into
+  their output, with no homogeneous divide.
+
+  Args:
+    vertices: (N, 4) array of 4D positions
+    rotation: (4, 4) rotation matrix (row-vector convention)
+    projections: list of math4d.projections.Projection
+    out: optional (views, N, 3) array for the result
+
+  Returns:
+    (views, N, 3) projected positions, at the vertices' compute precision
+  """
+  dtype = np.promote_types(vertices.dtype, np.float32)
+  vertices = vertices.astype(dtype, copy=False)
+  if out is None:
+    out = np.empty((len(projections), len(vertices), 3), dtype=dtype)
+  rotated = np.matmul(vertices, rotation.astype(dtype))
+  scratch = None
+  for view, projection in zip(out, projections):
+    m = projection.matrix
+    if not projection.stereographic and not m[:4, 4].any():
+      np.matmul(rotated, (m[:4, :3] / m[4, 4]).astype(dtype), out=view)
+      if m[4, :3].any():
+        view += (m[4, :3] / m[4, 4]).astype(dtype)
+    else:
+      if scratch is None:
+        scratch = np.empty((len(vertices), 5), dtype=dtype)
+      projection.project(rotated, out=view, scratch=scratch)
+  return out
+
+
+def split_layout(x, y, width, height, num_views=len(SPLIT_VIEWS)):
+  """Viewport rectangles for the split view, in OpenGL window coordinates.
+
+  The first view fills the left half; the others are tiled in a grid on
+  the right half, filled row by row from the top.
+
+  Returns:
+    list of (x, y, width, height) integer tuples, origin at the bottom left
+  """
+  rest = num_views - 1
+  if rest == 0:
+    return [(x, y, width, height)]
+  half = width // 2
+  rects = [(x, y, half, height)]
+  cols = int(np.ceil(np.sqrt(rest)))
+  rows = -(-rest // cols)
+  cell_w, cell_h = (width - half) // cols, height // rows
+  for i in range(rest):
+    r, c = divmod(i, cols)
+    rects.append((x + half + c * cell_w, y + height - (r + 1) * cell_h, cell_w, cell_h))
+  return rects
+
+
+class SplitView:
+  """Draws an Object4D's wireframe in several viewports at once.
+
+  On the CPU path every view is projected from one pass over the
+  vertices (see project_views), and the edge indices live in a single
+  element buffer that all views draw from; it is uploaded again only
+  when the shape changes. With a ShaderRenderer the geometry is already
+  resident on the GPU and each view costs a uniform update and a draw.
+
+  The camera's modelview matrix is shared by all views; each viewport
+  gets a perspective matrix with its own aspect ratio. Every view draws
+  all edges: back-cell culling (Object4D.cull) depends on the viewpoint,
+  so it is not applied here.
+
+  Needs a current OpenGL context (1.5 for the element buffer).
+  """
+
+  def __init__(self, views=SPLIT_VIEWS, fov=45.0):
+    self.views = views
+    self.fov = fov
+    self.index_buffer = None
+    self._edges = None
+    self._index_count = 0
+    self._index_type = None
+    self._positions = None
+
+  def _upload_edges(self, edges):
+    from OpenGL.GL import glGenBuffers, glBindBuffer, glBufferData, \
+      GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW
+    from renderer.wireframe import GL_INDEX_TYPES
+
+    if edges is self._edges:
+      return
+    if self.index_buffer is None:
+      self.index_buffer = glGenBuffers(1)
+    indices = np.ascontiguousarray(edges)
+    if indices.dtype not in GL_INDEX_TYPES:
+      indices = indices.astype(np.uint32)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+    glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+    self._edges = edges
+    self._index_count = indices.size
+    self._index_type = GL_INDEX_TYPES[indices.dtype]
+
+  def project(self, obj):
+    """Projected vertices of every view, (views, N, 3); reuses its buffer."""
+    projections = split_projections(obj.camera_distance, self.views)
+    n = obj.shape.num_vertices
+    dtype = obj.shape.compute_dtype
+    if self._positions is None or self._positions.shape[1:] != (n, 3) \
+        or self._positions.dtype != dtype:
+      self._positions = np.empty((len(projections), n, 3), dtype=dtype)
+    return project_views(obj.shape.vertices, obj.rotation, projections, out=self._positions)
+
+  def draw(self, obj, shader=None, color=(0.4, 0.8, 1.0)):
+    """Draw each view of a wireframe Object4D into its own viewport.
+
+    Call after Camera.apply(). The full viewport and projection matrix
+    are restored afterwards.
+
+    Args:
+      obj: Object4D whose shape is a Shape4D
+      shader: optional ShaderRenderer to project on the GPU instead
+      color: RGB tuple, each component in [0, 1]
+    """
+    import ctypes
+    from OpenGL.GL import (
+      glGetIntegerv, glViewport, glMatrixMode, glPushMatrix, glPopMatrix, glLoadIdentity,
+      glColor3f, glEnableClientState, glDisableClientState, glVertexPointer,
+      glBindBuffer, glDrawElements,
+      GL_VIEWPORT, GL_PROJECTION, GL_MODELVIEW, GL_VERTEX_ARRAY,
+      GL_ELEMENT_ARRAY_BUFFER, GL_LINES,
+    )
+    from OpenGL.GLU import gluPerspective
+    from renderer.wireframe import GL_VERTEX_TYPES
+
+    viewport = (ctypes.c_int * 4)()
+    glGetIntegerv(GL_VIEWPORT, viewport)
+    rects = split_layout(*viewport, num_views=len(self.views))
+
+    if shader is None:
+      positions = self.project(obj)
+      self._upload_edges(obj.shape.edges)
+      glColor3f(*color)
+      glEnableClientState(GL_VERTEX_ARRAY)
+      glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+    else:
+      projections = split_projections(obj.camera_distance, self.views)
+
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    for i, (x, y, width, height) in enumerate(rects):
+      glViewport(x, y, width, height)
+      glMatrixMode(GL_PROJECTION)
+      glLoadIdentity()
+      gluPerspective(self.fov, width / max(height, 1), 0.1, 50.0)
+      glMatrixMode(GL_MODELVIEW)
+      if shader is None:
+        glVertexPointer(3, GL_VERTEX_TYPES[positions.dtype], 0, positions[i])
+        glDrawElements(GL_LINES, self._index_count, self._index_type, None)
+      else:
+        shader.draw(obj.shape, obj.rotation, projections[i], color)
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glViewport(*viewport)
+
+    if shader is None:
+      glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+      glDisableClientState(GL_VERTEX_ARRAY)
+
+  def release(self):
+    """Free the element buffer."""
+    if self.index_buffer is not None:
+      from OpenGL.GL import glDeleteBuffers
+      glDeleteBuffers(1, [self.index_buffer])
+      self.index_buffer = None
+      self._edges = None
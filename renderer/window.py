@@ -1,12 +1,14 @@
+import numpy as np
 import pygame
 from pygame.locals import DOUBLEBUF, OPENGL
 from OpenGL.GL import (
-  glClearColor, glEnable, glLineWidth, glClear, glMatrixMode, glViewport,
+  glClearColor, glEnable, glDisable, glLineWidth, glClear, glMatrixMode, glViewport,
   GL_DEPTH_TEST, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT,
   GL_PROJECTION, GL_MODELVIEW,
   GL_LINE_SMOOTH, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
   glBlendFunc, glHint, GL_LINE_SMOOTH_HINT, GL_NICEST,
-  glGetIntegerv, GL_VIEWPORT
+  glGetIntegerv, GL_VIEWPORT,
+  glWindowPos2i, glPixelZoom, glDrawPixels, GL_RGB, GL_FLOAT,
 )
 from OpenGL.GLU import gluPerspective
 import ctypes
@@ -77,6 +79,11 @@ def init_window(width=800, height=600, title="4D Viewer"):
   return surface
 
 
+def set_title(title):
+  """Change the window title."""
+  pygame.display.set_caption(title)
+
+
 def clear():
   """Clear the screen for a new frame."""
   glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -89,3 +96,36 @@ def swap():
   it to the screen all at once. This prevents flickering.
   """
   pygame.display.flip()
+
+
+def draw_image(image):
+  """Draw an RGB image (e.g. a ray-marched frame) over the whole viewport.
+
+  The image is stretched to the framebuffer size, so a low-resolution
+  render fills the window.
+
+  Args:
+    image: (H, W, 3) float array in [0, 1], row 0 at the top
+  """
+  viewport = (ctypes.c_int * 4)()
+  glGetIntegerv(GL_VIEWPORT, viewport)
+  height, width = image.shape[:2]
+
+  glDisable(GL_DEPTH_TEST)
+  glWindowPos2i(0, 0)
+  glPixelZoom(viewport[2] / width, viewport[3] / height)
+  # OpenGL's pixel rows start at the bottom of the window.
+  glDrawPixels(width, height, GL_RGB, GL_FLOAT,
+               np.ascontiguousarray(image[::-1], dtype=np.float32))
+  glPixelZoom(1, 1)
+  glEnable(GL_DEPTH_TEST)
+
+
+def window_size():
+  """Size of the window in the units of mouse coordinates (points)."""
+  return pygame.display.get_window_size()
+
+
+def mouse_position():
+  """Current mouse position in window coordinates, origin at the top left."""
+  return pygame.mouse.get_pos()
@@ -1,4 +1,26 @@
-from OpenGL.GL import glBegin, glEnd, glVertex3fv, glColor3f, GL_LINES
+import numpy as np
+from OpenGL.GL import (
+  glColor3f, glEnableClientState, glDisableClientState, glVertexPointer,
+  glDrawElements, GL_VERTEX_ARRAY, GL_LINES,
+  GL_FLOAT, GL_DOUBLE, GL_UNSIGNED_BYTE, GL_UNSIGNED_SHORT, GL_UNSIGNED_INT,
+)
+
+
+# NumPy dtypes that OpenGL can read directly, mapped to their GL enums.
+# Anything else would need a conversion (and a copy) before drawing.
+GL_VERTEX_TYPES = {
+  np.dtype(np.float32): GL_FLOAT,
+  np.dtype(np.float64): GL_DOUBLE,
+}
+
+GL_INDEX_TYPES = {
+  np.dtype(np.uint8): GL_UNSIGNED_BYTE,
+  np.dtype(np.uint16): GL_UNSIGNED_SHORT,
+  np.dtype(np.uint32): GL_UNSIGNED_INT,
+  # Full-precision shapes store int32 indices; they are never negative,
+  # so GL can read them as unsigned ints of the same width.
+  np.dtype(np.int32): GL_UNSIGNED_INT,
+}
 
 
 def draw_wireframe(vertices_3d, edges, color=(0.4, 0.8, 1.0)):
@@ -8,14 +30,24 @@ def draw_wireframe(vertices_3d, edges, color=(0.4, 0.8, 1.0)):
   between vertex pairs. OpenGL's pipeline handles the 3D→2D perspective
   projection (set up in window.py) and rasterizes the lines to pixels.
 
+  The vertex and edge arrays are handed to OpenGL as client-side arrays
+  in their own dtypes (float32/float64 positions, 8/16/32-bit indices),
+  so compact shapes are uploaded at their compact size.
+
   Args:
     vertices_3d: (N, 3) array of 3D positions (already projected from 4D)
     edges: (M, 2) array of vertex index pairs
     color: RGB tuple, each component in [0, 1]
   """
+  vertices_3d = np.ascontiguousarray(vertices_3d)
+  edges = np.ascontiguousarray(edges)
+  if vertices_3d.dtype not in GL_VERTEX_TYPES:
+    vertices_3d = vertices_3d.astype(np.float32)
+  if edges.dtype not in GL_INDEX_TYPES:
+    edges = edges.astype(np.uint32)
+
   glColor3f(*color)
-  glBegin(GL_LINES)
-  for e in edges:
-    glVertex3fv(vertices_3d[e[0]])
-    glVertex3fv(vertices_3d[e[1]])
-  glEnd()
+  glEnableClientState(GL_VERTEX_ARRAY)
+  glVertexPointer(3, GL_VERTEX_TYPES[vertices_3d.dtype], 0, vertices_3d)
+  glDrawElements(GL_LINES, edges.size, GL_INDEX_TYPES[edges.dtype], edges)
+  glDisableClientState(GL_VERTEX_ARRAY)
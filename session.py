@@ -0,0 +1,200 @@
+import json
+
+import numpy as np
+
+from keymap import event_type
+
+
+# Recorded sessions: everything the main loop reads from pygame in one
+# frame (the held keys and the queued events), stored compactly so a
+# session can be replayed later without a window.
+#
+# Key states are one bit per tracked key per frame (np.packbits). Events
+# are a flat table of (frame, kind, arg0, arg1) rows; only the event
+# types the viewer reacts to are kept.
+
+# pygame event type names that are recorded, in the order of their kind
+# codes. Stored by name because pygame's numeric codes are resolved at
+# runtime.
+EVENT_TYPES = ('QUIT', 'KEYDOWN', 'MOUSEBUTTONDOWN', 'MOUSEBUTTONUP',
+               'MOUSEMOTION', 'MOUSEWHEEL')
+
+
+def _event_kinds():
+  """Map pygame event type codes to recorded kind codes (and back)."""
+  codes = [event_type(name) for name in EVENT_TYPES]
+  return {code: kind for kind, code in enumerate(codes)}, codes
+
+
+def _encode_event(event, kind_name):
+  """The two integer arguments kept for a recorded event."""
+  if kind_name == 'KEYDOWN':
+    return event.key, 0
+  if kind_name in ('MOUSEBUTTONDOWN', 'MOUSEBUTTONUP'):
+    return event.button, 0
+  if kind_name == 'MOUSEMOTION':
+    return event.rel
+  if kind_name == 'MOUSEWHEEL':
+    return event.x, event.y
+  return 0, 0
+
+
+def _decode_event(type_code, kind_name, args):
+  """Rebuild a pygame event with the attributes the viewer reads."""
+  import pygame
+  a, b = int(args[0]), int(args[1])
+  if kind_name == 'KEYDOWN':
+    return pygame.event.Event(type_code, key=a)
+  if kind_name in ('MOUSEBUTTONDOWN', 'MOUSEBUTTONUP'):
+    return pygame.event.Event(type_code, button=a)
+  if kind_name == 'MOUSEMOTION':
+    return pygame.event.Event(type_code, rel=(a, b))
+  if kind_name == 'MOUSEWHEEL':
+    return pygame.event.Event(type_code, x=a, y=b)
+  return pygame.event.Event(type_code)
+
+
+class KeyState:
+  """Recorded key states for one frame, indexable like pygame.key.get_pressed().
+
+  Keys that were not tracked while recording read as not pressed.
+  """
+
+  def __init__(self, key_codes, pressed):
+    self._pressed = {int(code): bool(p) for code, p in zip(key_codes, pressed)}
+
+  def __getitem__(self, key):
+    return self._pressed.get(key, False)
+
+
+class Session:
+  """A recorded input session.
+
+  Attributes:
+    key_codes: (K,) int32 pygame key codes whose states were recorded
+    key_bits: (F, ceil(K / 8)) uint8 packed key states, one row per frame
+    event_frame: (E,) int32 frame index of each event (non-decreasing)
+    event_kind: (E,) uint8 index into EVENT_TYPES
+    event_args: (E, 2) int32 event arguments (key, button, motion, wheel)
+    precision: storage format the shapes were generated at
+    frame_ms: (F,) float32 frame times measured while recording (or None)
+    source: keyword arguments of main.load_source() for the shape the
+            session started on, or None for the default tesseract
+    threads: worker threads of the transform engine, or None for none
+  """
+
+  def __init__(self, key_codes, key_bits, event_frame, event_kind, event_args,
+               precision='full', frame_ms=None, source=None, threads=None):
+    self.key_codes = np.asarray(key_codes, dtype=np.int32)
+    self.key_bits = np.asarray(key_bits, dtype=np.uint8).reshape(-1, (len(self.key_codes) + 7) // 8)
+    self.event_frame = np.asarray(event_frame, dtype=np.int32)
+    self.event_kind = np.asarray(event_kind, dtype=np.uint8)
+    self.event_args = np.asarray(event_args, dtype=np.int32).reshape(-1, 2)
+    self.precision = precision
+    self.frame_ms = None if frame_ms is None else np.asarray(frame_ms, dtype=np.float32)
+    self.source = source
+    self.threads = threads
+    assert np.all(np.diff(self.event_frame) >= 0), "events must be in frame order"
+
+  @property
+  def num_frames(self):
+    return self.key_bits.shape[0]
+
+  def key_state(self, frame):
+    """The KeyState recorded for a frame."""
+    pressed = np.unpackbits(self.key_bits[frame], count=len(self.key_codes))
+    return KeyState(self.key_codes, pressed)
+
+  def event_rows(self, frame):
+    """(kinds, args) of the events recorded for a frame."""
+    lo, hi = np.searchsorted(self.event_frame, [frame, frame + 1])
+    return self.event_kind[lo:hi], self.event_args[lo:hi]
+
+  def frames(self):
+    """Yield (events, keys) for every frame, as the main loop would see them.
+
+    Events are rebuilt as pygame events, so this needs pygame (but no
+    window or display).
+    """
+    _, codes = _event_kinds()
+    for frame in range(self.num_frames):
+      kinds, args = self.event_rows(frame)
+      events = [_decode_event(codes[k], EVENT_TYPES[k], a) for k, a in zip(kinds, args)]
+      yield events, self.key_state(frame)
+
+  def save(self, path):
+    """Write the session to a compressed .npz file."""
+    arrays = dict(key_codes=self.key_codes, key_bits=self.key_bits,
+                  event_frame=self.event_frame, event_kind=self.event_kind,
+                  event_args=self.event_args, precision=np.array(self.precision))
+    if self.frame_ms is not None:
+      arrays['frame_ms'] = self.frame_ms
+    if self.source is not None:
+      arrays['source'] = np.array(json.dumps(self.source))
+    if self.threads is not None:
+      arrays['threads'] = np.array(self.threads)
+    np.savez_compressed(path, **arrays)
+
+  @classmethod
+  def load(cls, path):
+    """Read a session written by save()."""
+    with np.load(path) as data:
+      frame_ms = data['frame_ms'] if 'frame_ms' in data.files else None
+      source = json.loads(str(data['source'])) if 'source' in data.files else None
+      threads = int(data['threads']) if 'threads' in data.files else None
+      return cls(data['key_codes'], data['key_bits'], data['event_frame'],
+                 data['event_kind'], data['event_args'],
+                 precision=str(data['precision']), frame_ms=frame_ms,
+                 source=source, threads=threads)
+
+
+class SessionRecorder:
+  """Collects per-frame input from the live main loop into a Session.
+
+  Args:
+    key_codes: pygame key codes whose held state matters to the viewer
+    precision: storage format the viewer generates shapes at
+    source, threads: how the viewer was started (see Session)
+  """
+
+  def __init__(self, key_codes, precision='full', source=None, threads=None):
+    self.key_codes = np.asarray(key_codes, dtype=np.int32)
+    self.precision = precision
+    self.source = source
+    self.threads = threads
+    self._key_rows = []
+    self._events = []  # (frame, kind, arg0, arg1)
+    self._frame_ms = []
+    self._kinds = None
+
+  def record_frame(self, events, keys, frame_ms=None):
+    """Record one frame of input.
+
+    Args:
+      events: the pygame events handled this frame
+      keys: the pygame.key.get_pressed() result used this frame
+      frame_ms: optional measured frame time in milliseconds
+    """
+    if events and self._kinds is None:
+      self._kinds, _ = _event_kinds()
+    frame = len(self._key_rows)
+    pressed = np.array([bool(keys[code]) for code in self.key_codes.tolist()])
+    self._key_rows.append(np.packbits(pressed))
+    for event in events:
+      kind = self._kinds.get(event.type)
+      if kind is not None:
+        self._events.append((frame, kind, *_encode_event(event, EVENT_TYPES[kind])))
+    self._frame_ms.append(np.nan if frame_ms is None else frame_ms)
+
+  def session(self):
+    """The frames recorded so far as a Session."""
+    nbytes = (len(self.key_codes) + 7) // 8
+    key_bits = np.array(self._key_rows, dtype=np.uint8).reshape(-1, nbytes)
+    rows = np.array(self._events, dtype=np.int64).reshape(-1, 4)
+    return Session(self.key_codes, key_bits, rows[:, 0], rows[:, 1], rows[:, 2:],
+                   precision=self.precision, frame_ms=self._frame_ms,
+                   source=self.source, threads=self.threads)
+
+  def save(self, path):
+    """Write the frames recorded so far to a compressed .npz file."""
+    self.session().save(path)
@@ -0,0 +1,51 @@
+import numpy as np
+from math4d.batch import project_batch, project_angles
+from math4d.projections import perspective, orthographic
+from math4d.rotations import compose_planes
+from geometry.tesseract import make_tesseract
+
+
+def test_project_batch_matches_loop():
+  """Batched projection should equal projecting each rotation separately."""
+  t = make_tesseract()
+  rotations = compose_planes(('xw', 'yz'), np.random.default_rng(0).uniform(-3, 3, (7, 2)))
+  result = project_batch(t.vertices, rotations, camera_distance=3.0)
+  assert result.shape == (7, 16, 3)
+  for k, r in enumerate(rotations):
+    assert np.allclose(result[k], perspective(t.vertices @ r, 3.0))
+
+
+def test_project_batch_orthographic():
+  """camera_distance=None should drop W after rotating."""
+  t = make_tesseract()
+  rotations = compose_planes(('zw',), np.array([0.0, 0.7]))
+  result = project_batch(t.vertices, rotations, camera_distance=None)
+  for k, r in enumerate(rotations):
+    assert np.allclose(result[k], orthographic(t.vertices @ r))
+
+
+def test_project_batch_chunking_is_transparent():
+  """Tiny chunks should give the same answer as one big chunk."""
+  t = make_tesseract()
+  angles = np.linspace(0, 2 * np.pi, 10)[:, np.newaxis]
+  whole = project_angles(t.vertices, ('xw',), angles)
+  chunked = project_angles(t.vertices, ('xw',), angles, max_points=1)
+  assert np.allclose(whole, chunked)
+
+
+def test_project_batch_writes_into_out():
+  """A preallocated output array should be filled and returned."""
+  t = make_tesseract()
+  out = np.zeros((3, 16, 3))
+  rotations = compose_planes(('xy',), np.array([0.1, 0.2, 0.3]))
+  result = project_batch(t.vertices, rotations, out=out)
+  assert result is out
+  assert not np.allclose(out, 0)
+
+
+def test_project_batch_keeps_compact_dtype():
+  """float32 vertices should not be upcast by float64 rotations."""
+  t = make_tesseract(precision='compact')
+  rotations = compose_planes(('xw',), np.array([0.2, 0.4]))
+  result = project_batch(t.vertices, rotations)
+  assert result.dtype == np.float32
@@ -0,0 +1,110 @@
+import numpy as np
+from math4d.culling import facing_cells, visible_edges
+from math4d.projections import make_projection
+from math4d.rotations import compose_planes, rotation_matrix
+from geometry.tesseract import make_tesseract
+from geometry.pentachoron import make_pentachoron
+from geometry.duoprism import make_duoprism
+from geometry.prism import make_platonic_prism
+from geometry.reorder import reorder
+from geometry.spherinder import make_spherinder
+from object4d import Object4D, PROJECTION_MODES
+
+
+def test_projection_eye():
+  """Perspective views have a finite eye at the camera; orthographic ones look from infinity."""
+  assert np.allclose(make_projection('perspective', 'w', 3.0).eye(), [0, 0, 0, 3, 1])
+  assert np.allclose(make_projection('perspective', 'y', 2.0).eye(), [0, 2, 0, 0, 1])
+  assert np.allclose(make_projection('orthographic', 'z', 3.0).eye(), [0, 0, 1, 0, 0])
+  assert make_projection('stereographic').eye() is None
+
+
+def test_only_the_near_cube_faces_a_head_on_eye():
+  """Looking along W at an unrotated tesseract, only the w = +1 cube is visible."""
+  obj = Object4D(make_tesseract())
+  obj.cull = True
+  edges = obj.drawn_edges()
+  assert len(edges) == 12
+  assert np.all(obj.shape.vertices[edges][..., 3] == 1)
+  obj.cull = False
+  assert len(obj.drawn_edges()) == 32
+
+
+def test_facing_cells_matches_rotated_geometry():
+  """The vectorized test agrees with checking each rotated cell plane against the eye."""
+  rotations = compose_planes(('xw', 'yz', 'zw', 'xy'),
+                             np.random.default_rng(0).uniform(-np.pi, np.pi, (20, 4)))
+  for shape in (make_tesseract(), make_pentachoron()):
+    normals = shape.topology('cell_normals')
+    offsets = shape.topology('cell_offsets')
+    for kind, axis in PROJECTION_MODES[:-1]:
+      eye = make_projection(kind, axis, 3.0).eye()
+      for rotation in rotations:
+        front = facing_cells(normals, offsets, rotation, eye)
+        rotated = shape.vertices @ rotation
+        for cell, n, f in zip(shape.cells, normals @ rotation, front):
+          p = rotated[cell[0]]
+          side = n @ (eye[:4] - p * eye[4])
+          assert f == (side > 0)
+
+
+def test_culling_keeps_edges_of_any_front_cell():
+  """An edge stays while at least one of its cells faces the eye; some edges always remain."""
+  shape = make_tesseract()
+  pairs = shape.topology('edge_cells')
+  front = np.zeros(8, dtype=bool)
+  front[7] = True  # the w = +1 cube
+  assert len(visible_edges(shape.edges, pairs, front)) == 12
+  obj = Object4D(make_pentachoron())
+  obj.cull = True
+  for angle in np.linspace(0, 2 * np.pi, 13):
+    obj.rotation = rotation_matrix('xw', angle) @ rotation_matrix('yw', 0.3)
+    drawn = obj.drawn_edges()
+    assert 0 < len(drawn) <= 10
+  obj.next_projection()
+  while obj.projection.name != 'stereographic (w)':
+    obj.next_projection()
+  assert len(obj.drawn_edges()) == 10
+
+
+def test_trail_ghosts_hide_the_culled_edges():
+  """In cull mode each ghost draws the edges its own frame drew, without resetting the trail."""
+  obj = Object4D(make_tesseract())
+  obj.cull = obj.trail_mode = True
+  drawn = []
+  for angle in (0.0, 0.6, 1.2):
+    obj.rotation = rotation_matrix('xw', angle)
+    (_, edges, _), = obj.project()
+    drawn.append(edges)
+  assert obj.trail.count == 3
+  for slot, edges in enumerate(drawn):
+    ghost = obj.trail.indices[slot] - slot * 16
+    visible = ghost[ghost[:, 0] != ghost[:, 1]]
+    assert np.array_equal(visible, edges)
+
+
+def test_product_shapes_cull_by_their_cells():
+  """Prisms and duoprisms get cells from the product rule, and reordering keeps them."""
+  prism = make_platonic_prism('octahedron', half_height=1.0)
+  # Two octahedral caps, and a triangular prism on each of the 8 faces.
+  assert sorted(len(c) for c in prism.cells) == [6] * 10
+  obj = Object4D(prism)
+  obj.cull = True
+  edges = obj.drawn_edges()
+  assert len(edges) == 12 and np.all(obj.shape.vertices[edges][..., 3] == 1)
+  # A 5-7 duoprism has 7 pentagonal and 5 heptagonal prisms, each in its facet's hyperplane.
+  duoprism = make_duoprism(5, 7)
+  assert sorted(len(c) for c in duoprism.cells) == [10] * 7 + [14] * 5
+  normals, offsets = duoprism.topology('cell_normals'), duoprism.topology('cell_offsets')
+  for cell, n, f in zip(duoprism.cells, normals, offsets):
+    assert np.allclose(duoprism.vertices[cell] @ n, f)
+  obj = Object4D(duoprism)
+  obj.cull = True
+  obj.rotation = rotation_matrix('xw', 0.4) @ rotation_matrix('yz', 0.3)
+  assert 0 < len(obj.drawn_edges()) < duoprism.num_edges
+  shuffled = reorder(make_tesseract(), order=np.random.default_rng(0).permutation(16))
+  obj = Object4D(shuffled)
+  obj.cull = True
+  assert len(obj.drawn_edges()) == 12
+  # A sphere has no faces, so its prism has no cells to cull by.
+  assert not make_spherinder().has_topology('cells')
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from math4d.engine import TransformEngine
+from math4d.projections import make_projection
+from math4d.rotations import rotation_matrix
+from renderer.colormap import w_colors
+from geometry.hypersphere import make_hypersphere
+from geometry.pointcloud import PointCloud4D
+from object4d import Object4D
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+@pytest.mark.parametrize("kind", ['perspective', 'stereographic'])
+def test_engine_matches_projection(threads, kind):
+  """Chunked, threaded results equal one Projection.project call, with depth colours."""
+  points = np.random.default_rng(0).uniform(-1, 1, (10_007, 4)).astype(np.float32)
+  rotation = rotation_matrix('xw', 0.4) @ rotation_matrix('yz', 0.3)
+  projection = make_projection(kind, 'w', 3.0)
+  engine = TransformEngine(threads, chunk_size=1000)
+  depth = np.empty(len(points), dtype=np.float32)
+  colors = np.empty((len(points), 3), dtype=np.float32)
+  xyz = engine.transform(points, rotation, projection, depth=depth,
+                         colors=colors, depth_range=(-1, 1))
+  engine.close()
+  expected, expected_depth = projection.project(points, rotation)
+  assert xyz.dtype == np.float32
+  assert np.allclose(xyz, expected, rtol=1e-5, atol=1e-6)
+  assert np.allclose(depth, expected_depth, atol=1e-6)
+  assert np.allclose(colors, w_colors(expected_depth, -1, 1), atol=1e-5)
+
+
+def test_object_uses_engine_for_meshes_and_points():
+  """An Object4D with an engine draws the same batches as without one."""
+  engine = TransformEngine(threads=2, chunk_size=64)
+  rotation = rotation_matrix('zw', 0.7)
+  cloud = PointCloud4D.from_array(np.random.default_rng(1).normal(size=(1000, 4)), chunk_size=300)
+  cloud.radius = 3.0
+  for shape in (make_hypersphere(precision='compact'), cloud):
+    plain = Object4D(shape)
+    threaded = Object4D(shape, engine=engine)
+    plain.rotation = threaded.rotation = rotation
+    for a, b in zip(plain.project(), threaded.project()):
+      assert np.allclose(a[0], b[0], rtol=1e-5, atol=1e-6)
+      assert (a[2] is None) == (b[2] is None)
+      if a[2] is not None:
+        assert np.allclose(a[2], b[2], atol=1e-5)
+  engine.close()
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import numpy as np
+from geometry.tesseract import make_tesseract
+from geometry.pointcloud import sample_hypersphere
+from object4d import Object4D, PROJECTION_MODES
+
+
+def test_core_imports_without_gui():
+  """geometry, math4d, the object model and the viewer loop don't load pygame/OpenGL."""
+  code = (
+    "import sys\n"
+    "import geometry.product, geometry.loader, geometry.weld, geometry.spherinder\n"
+    "import math4d.batch, math4d.slicing, math4d.stream, math4d.projections\n"
+    "import object4d, session, main, renderer.camera, renderer.raymarch\n"
+    "print(sorted({m.split('.')[0] for m in sys.modules} & {'pygame', 'OpenGL'}))\n"
+  )
+  result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+  assert result.returncode == 0, result.stderr
+  assert result.stdout.strip() == "[]"
+
+
+def test_object4d_projects_without_opengl():
+  """Object4D.project() does a frame's CPU work with no GL context."""
+  obj = Object4D(make_tesseract())
+  for _ in PROJECTION_MODES:
+    (verts_3d, edges, colors), = obj.project()
+    assert verts_3d.shape == (16, 3) and np.all(np.isfinite(verts_3d))
+    assert edges.shape == (32, 2) and colors is None
+    obj.next_projection()
+  assert obj.projection_index == 0
+
+
+def test_object4d_streams_point_cloud_batches():
+  """Point clouds come out as coloured point batches, one per chunk."""
+  obj = Object4D(sample_hypersphere(num_points=5000, chunk_size=2000))
+  batches = [(len(v), edges, c.shape) for v, edges, c in obj.project()]
+  assert batches == [(2000, None, (2000, 3)), (2000, None, (2000, 3)), (1000, None, (1000, 3))]
@@ -0,0 +1,70 @@
+import numpy as np
+from geometry.loader import load_points, open_table
+from geometry.pointcloud import PointCloud4D, reservoir_sample
+
+
+def _table(rows=1000, cols=7):
+  return np.random.default_rng(0).normal(size=(rows, cols)).astype(np.float32)
+
+
+def test_load_npy_selects_columns(tmp_path):
+  """Chosen columns come back in order, chunk by chunk, in the file's dtype."""
+  table = _table()
+  path = tmp_path / "data.npy"
+  np.save(path, table)
+  cloud = load_points(path, columns=(1, 3, 4, 6), chunk_size=300)
+  assert cloud.num_points == 1000
+  assert [len(c) for c in cloud.iter_chunks()] == [300, 300, 300, 100]
+  points = cloud.to_array()
+  assert points.dtype == np.float32
+  assert np.array_equal(points, table[:, [1, 3, 4, 6]])
+
+
+def test_load_is_memory_mapped(tmp_path):
+  """Consecutive columns are streamed as views of the mapped file."""
+  path = tmp_path / "data.npy"
+  np.save(path, _table())
+  assert isinstance(open_table(path), np.memmap)
+  chunk = next(load_points(path, columns=(2, 3, 4, 5)).iter_chunks())
+  assert not chunk.flags.owndata
+
+
+def test_load_raw_binary_with_stride(tmp_path):
+  """Raw files need a layout; stride keeps every n-th row."""
+  table = _table(rows=1001, cols=5).astype(np.float64)
+  path = tmp_path / "data.bin"
+  table.tofile(path)
+  cloud = load_points(path, stride=10, chunk_size=16, num_columns=5, dtype='float64')
+  assert cloud.num_points == 101
+  assert np.array_equal(cloud.to_array(), table[::10, :4])
+
+
+def test_load_fit_radius(tmp_path):
+  """fit_radius centers and scales the data into a ball of that radius."""
+  table = _table() * 50 + 1000
+  path = tmp_path / "data.npy"
+  np.save(path, table)
+  points = load_points(path, fit_radius=1.5).to_array()
+  assert np.allclose(points.mean(axis=0), 0, atol=1e-3)
+  assert np.linalg.norm(points, axis=1).max() <= 1.5 + 1e-4
+
+
+def test_reservoir_sample_is_uniform_subset():
+  """The sample has k distinct original rows, spread uniformly, in order."""
+  points = np.arange(40_000, dtype=np.float64).repeat(4).reshape(-1, 4)
+  cloud = PointCloud4D.from_array(points, chunk_size=1000)
+  sample = reservoir_sample(cloud, 5000, seed=1).to_array()
+  ids = sample[:, 0]
+  assert len(ids) == 5000 and len(np.unique(ids)) == 5000
+  assert np.all(np.diff(ids) > 0)
+  assert abs(ids.mean() - 20_000) < 500
+  counts = np.histogram(ids, bins=10, range=(0, 40_000))[0]
+  assert counts.min() > 400
+  assert np.array_equal(reservoir_sample(cloud, 5000, seed=1).to_array(), sample)
+
+
+def test_reservoir_sample_small_cloud():
+  """Asking for more points than exist returns them all."""
+  points = np.random.default_rng(2).normal(size=(50, 4))
+  sample = reservoir_sample(PointCloud4D.from_array(points, chunk_size=8), 100)
+  assert np.array_equal(sample.to_array(), points)
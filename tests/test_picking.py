@@ -0,0 +1,120 @@
+import types
+import numpy as np
+from renderer.picking import PickingIndex, screen_positions
+from renderer.raymarch import camera_rays
+from geometry.tesseract import make_tesseract
+from geometry.pentachoron import make_pentachoron
+from geometry.base import Shape4D
+from object4d import Object4D
+from math4d.rotations import rotation_matrix
+
+
+def _camera(distance=6.0, rot_x=0.0, rot_y=0.0):
+  return types.SimpleNamespace(distance=distance, rot_x=rot_x, rot_y=rot_y)
+
+
+def _brute_force_edge(screen, edges, x, y, radius):
+  a, b = screen[edges[:, 0]], screen[edges[:, 1]]
+  ab = b - a
+  t = np.clip(((np.array([x, y]) - a) * ab).sum(axis=1) / (ab**2).sum(axis=1), 0, 1)
+  d = np.linalg.norm(a + t[:, None] * ab - [x, y], axis=1)
+  d[~np.isfinite(d)] = np.inf
+  best = np.argmin(d)
+  return best if d[best] <= radius else None, d[best]
+
+
+def test_screen_positions_match_camera_rays():
+  """A point on a pixel's viewing ray should land on that pixel's center."""
+  camera = _camera(rot_x=20.0, rot_y=-35.0)
+  origin, dirs = camera_rays(camera, 40, 30)
+  points = origin + 4.0 * dirs[[0, 15, 29], [0, 20, 39]]
+  screen = screen_positions(points, camera, 40, 30)
+  assert np.allclose(screen, [[0.5, 0.5], [20.5, 15.5], [39.5, 29.5]])
+  # Behind the camera
+  assert np.all(np.isnan(screen_positions(origin[None] - dirs[15, 20], camera, 40, 30)))
+
+
+def test_nearest_matches_brute_force():
+  """Grid queries should find the same vertex and edge as a full scan."""
+  rng = np.random.default_rng(1)
+  verts = rng.uniform(-2, 2, (3000, 3))
+  edges = rng.integers(0, len(verts), (6000, 2))
+  edges = edges[edges[:, 0] != edges[:, 1]]
+  camera = _camera(rot_x=10.0, rot_y=30.0)
+  index = PickingIndex(320, 240, cell_size=8)
+  index.build(verts, edges, camera)
+  screen = screen_positions(verts, camera, 320, 240)
+  for x, y in rng.uniform(0, [320, 240], (50, 2)):
+    v = index.nearest_vertex(x, y, radius=12)
+    dv = np.linalg.norm(screen - [x, y], axis=1)
+    expected = np.argmin(dv) if dv.min() <= 12 else None
+    assert v == expected
+    e = index.nearest_edge(x, y, radius=3)
+    expected, distance = _brute_force_edge(screen, edges, x, y, 3)
+    if e is None or expected is None:
+      assert e == expected
+    else:
+      # Ties between edges through the same point may pick either one.
+      assert e == expected or np.isclose(_brute_force_edge(screen, edges[[e]], x, y, 3)[1], distance)
+
+
+def test_update_rebuilds_only_when_view_changes():
+  """The index should be rebuilt for a new rotation or camera, not every frame."""
+  obj = Object4D(make_tesseract())
+  camera = _camera()
+  index = PickingIndex(200, 200)
+  assert index.update(obj, camera)
+  assert not index.update(obj, camera)
+  obj.rotation = obj.rotation @ rotation_matrix('xw', 0.1)
+  assert index.update(obj, camera)
+  camera.rot_y = 5.0
+  assert index.update(obj, camera)
+  assert not index.update(obj, camera)
+  # A vertex can be picked at its own screen position.
+  x, y = index.screen[0]
+  assert index.nearest_vertex(x, y, radius=1) is not None
+
+
+def test_update_follows_shape_identity_and_reuses_the_frame():
+  """A new shape always rebuilds, even if it reuses a freed shape's id()."""
+  obj = Object4D(make_tesseract())
+  camera = _camera()
+  index = PickingIndex(200, 200)
+  assert index.update(obj, camera)
+  for scale in (1.1, 1.2, 1.3):
+    edges = obj.shape.edges
+    obj.shape = None  # free the old shape first, so its id() can be reused
+    obj.shape = Shape4D(make_tesseract().vertices * scale, edges)
+    assert index.update(obj, camera)
+    (verts_3d, _, _), = obj.project()
+    assert np.allclose(index.verts_3d, verts_3d)
+  obj.shape = make_pentachoron()
+  assert index.update(obj, camera) and len(index.edges) == 10
+  # A frame that was already projected is indexed as is, not projected again.
+  obj.rotation = rotation_matrix('yw', 0.3)
+  (verts_3d, edges, _), = obj.project()
+  assert obj.last_wireframe[1] is edges
+  assert index.update(obj, camera, obj.last_wireframe)
+  assert np.array_equal(index.verts_3d, verts_3d)
+
+
+def test_queries_examine_few_candidates_on_large_wireframes():
+  """On 10^5 short edges a query checks only the edges near the cursor."""
+  rng = np.random.default_rng(2)
+  verts = rng.normal(size=(50_000, 3))
+  edges = np.column_stack([np.arange(100_000) % 50_000, rng.integers(0, 50_000, 100_000)])
+  # Short edges, like those of a finely tessellated surface
+  verts_b = verts[edges[:, 0]] + rng.normal(scale=0.01, size=(100_000, 3))
+  verts = np.concatenate([verts, verts_b])
+  edges[:, 1] = 50_000 + np.arange(100_000)
+  index = PickingIndex(800, 600)
+  index.build(verts, edges, _camera(distance=8.0))
+  examined = []
+  for x, y in rng.uniform(0, [800, 600], (200, 2)):
+    index.nearest_edge(x, y)
+    examined.append(index.examined)
+    index.nearest_vertex(x, y)
+    examined.append(index.examined)
+  # A 10-pixel radius covers a few of the 50 x 38 grid cells.
+  assert np.mean(examined) < 0.01 * len(edges)
+  assert max(examined) < 0.05 * len(edges)
@@ -0,0 +1,61 @@
+import numpy as np
+from geometry.pointcloud import PointCloud4D, sample_hypersphere
+from math4d.stream import transform_chunks
+from math4d.projections import perspective
+from math4d.rotations import rotation_matrix
+from renderer.colormap import w_colors, W_COLOR_FAR, W_COLOR_NEAR
+
+
+def test_sample_hypersphere_on_sphere():
+  """Every sampled point should lie on S³ of the requested radius."""
+  cloud = sample_hypersphere(num_points=5000, radius=2.0, chunk_size=1000)
+  points = cloud.to_array()
+  assert points.shape == (5000, 4)
+  assert np.allclose(np.linalg.norm(points, axis=1), 2.0)
+
+
+def test_sample_hypersphere_is_reproducible():
+  """Iterating twice should regenerate exactly the same points."""
+  cloud = sample_hypersphere(num_points=3000, chunk_size=700, seed=3)
+  assert np.array_equal(cloud.to_array(), cloud.to_array())
+
+
+def test_sample_hypersphere_is_uniform():
+  """Uniform S³ samples have zero mean and covariance R²/4 * I."""
+  cloud = sample_hypersphere(num_points=200_000, radius=1.0)
+  points = cloud.to_array()
+  assert np.allclose(points.mean(axis=0), 0, atol=0.01)
+  assert np.allclose(np.cov(points.T), np.eye(4) / 4, atol=0.01)
+
+
+def test_chunks_respect_chunk_size():
+  """All chunks but the last should have exactly chunk_size points."""
+  cloud = PointCloud4D.from_array(np.zeros((10, 4)), chunk_size=4)
+  sizes = [len(c) for c in cloud.iter_chunks()]
+  assert sizes == [4, 4, 2]
+
+
+def test_transform_chunks_matches_perspective():
+  """Streaming projection should equal projecting the whole array at once."""
+  points = np.random.default_rng(1).uniform(-1, 1, (1000, 4))
+  cloud = PointCloud4D.from_array(points, chunk_size=128)
+  r = rotation_matrix('xw', 0.6)
+  pieces = [xyz.copy() for xyz, w in transform_chunks(cloud.iter_chunks(), r, 3.0)]
+  assert np.allclose(np.concatenate(pieces), perspective(points @ r, 3.0))
+
+
+def test_transform_chunks_reuses_buffers():
+  """Successive chunks should be written into the same scratch buffer."""
+  cloud = PointCloud4D.from_array(np.ones((256, 4)), chunk_size=64)
+  bases = {xyz.__array_interface__['data'][0]
+           for xyz, w in transform_chunks(cloud.iter_chunks(), np.eye(4), 3.0)}
+  assert len(bases) == 1
+
+
+def test_w_colors_endpoints():
+  """The W range ends should map to the two end colours."""
+  colors = w_colors(np.array([-1.0, 1.0, 5.0]), -1.0, 1.0)
+  assert colors.dtype == np.float32
+  assert np.allclose(colors[0], W_COLOR_FAR)
+  assert np.allclose(colors[1], W_COLOR_NEAR)
+  assert np.allclose(colors[2], W_COLOR_NEAR)  # clipped
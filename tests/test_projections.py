@@ -1,5 +1,9 @@
 import numpy as np
-from math4d.projections import orthographic, perspective
+from math4d.projections import (
+  orthographic, perspective, homogeneous, make_projection,
+  orthographic_projection, perspective_projection, stereographic_projection,
+)
+from math4d.rotations import rotation_matrix
 from geometry.tesseract import make_tesseract
 
 
@@ -73,4 +77,64 @@ def test_perspective_large_distance_approaches_orthographic():
   persp = perspective(t.vertices, camera_distance=d)
   ortho = orthographic(t.vertices)
   # perspective should be approximately ortho / d (since scale ≈ d for all)
-  assert np.allclose(persp, ortho / d, atol=1e-3)
\ No newline at end of file
+  assert np.allclose(persp, ortho / d, atol=1e-3)
+
+
+def test_perspective_keeps_float32():
+  """float32 input should stay float32 (no silent upcast)."""
+  verts = np.ones((4, 4), dtype=np.float32)
+  assert perspective(verts, 3.0).dtype == np.float32
+
+
+def test_perspective_matrix_matches_perspective():
+  """Rotate-and-project through one 5x5 matrix equals rotate, then perspective()."""
+  verts = np.random.default_rng(0).normal(size=(50, 4))
+  r = rotation_matrix('xw', 0.4) @ rotation_matrix('yz', 1.2)
+  xyz, depth = perspective_projection(3.0).project(verts, r)
+  assert np.allclose(xyz, perspective(verts @ r, 3.0))
+  assert np.allclose(depth, (verts @ r)[:, 3])
+
+
+def test_combined_matrix_is_rotation_then_projection():
+  """combined(R) is the homogeneous rotation times the projection matrix."""
+  r = rotation_matrix('zw', 0.7)
+  p = perspective_projection(4.0)
+  assert np.allclose(p.combined(r), homogeneous(r) @ p.matrix)
+  assert np.allclose(p.combined(r)[4], [0, 0, 0, 0, 4.0])
+
+
+def test_orthographic_along_each_axis():
+  """Orthographic projection keeps the other three axes in order; depth is the dropped one."""
+  verts = np.array([[1, 2, 3, 4], [5, 6, 7, 8]], dtype=np.float64)
+  xyz, depth = orthographic_projection('w').project(verts)
+  assert np.allclose(xyz, orthographic(verts))
+  xyz, depth = orthographic_projection('y').project(verts)
+  assert np.allclose(xyz, verts[:, [0, 2, 3]])
+  assert np.allclose(depth, verts[:, 1])
+
+
+def test_stereographic_projection():
+  """Points at w = 0 land at unit distance; the pole stays finite."""
+  verts = np.array([[2, 0, 0, 0], [0, 0, 3, 0], [0, 0, 0, 2]], dtype=np.float64)
+  xyz, _ = stereographic_projection().project(verts)
+  assert np.allclose(np.linalg.norm(xyz[:2], axis=1), 1)
+  assert np.all(np.isfinite(xyz))
+
+
+def test_stereographic_projects_the_origin_to_the_origin():
+  """A point at the 4D origin (e.g. in loaded data) projects to 0, without warnings."""
+  verts = np.array([[0, 0, 0, 0], [1, 0, 0, 0]])
+  for dtype in (np.float64, np.float32, np.float16):
+    with np.errstate(all='raise'):
+      xyz, _ = stereographic_projection().project(verts.astype(dtype))
+    assert np.array_equal(xyz[0], [0, 0, 0])
+    assert np.allclose(xyz[1], [1, 0, 0], atol=1e-3)
+
+
+def test_make_projection_keeps_size_when_switching():
+  """Orthographic views match perspective at w = 0, and float32 stays float32."""
+  verts = np.array([[1, 2, 3, 0]], dtype=np.float32)
+  persp, _ = make_projection('perspective', camera_distance=3.0).project(verts)
+  ortho, _ = make_projection('orthographic', camera_distance=3.0).project(verts)
+  assert np.allclose(persp, ortho)
+  assert persp.dtype == np.float32
@@ -0,0 +1,100 @@
+import numpy as np
+from math4d.quaternions import (
+  KeyframePlayer, align, compose, conjugate, from_matrix, multiply, normalize, slerp_pair,
+  to_matrix,
+)
+from math4d.rotations import rotation_matrix, rotation_matrices, compose_planes
+
+
+PLANES = ('xy', 'zw', 'xw', 'yz', 'xz', 'yw')
+
+
+def _random_rotations(k, seed=0):
+  angles = np.random.default_rng(seed).uniform(-np.pi, np.pi, (k, len(PLANES)))
+  return compose_planes(PLANES, angles)
+
+
+def test_matrix_round_trip():
+  """Matrices convert to quaternion pairs and back unchanged."""
+  rotations = _random_rotations(200)
+  left, right = from_matrix(rotations)
+  assert np.allclose(np.linalg.norm(left, axis=-1), 1)
+  assert np.allclose(np.linalg.norm(right, axis=-1), 1)
+  assert np.allclose(to_matrix(left, right), rotations)
+
+
+def test_pair_acts_as_left_and_right_multiplication():
+  """v @ M is the quaternion product l * v * conj(r)."""
+  rng = np.random.default_rng(1)
+  left, right = normalize(rng.normal(size=(2, 4)))
+  v = rng.normal(size=4)
+  expected = multiply(multiply(left, v), conjugate(right))
+  assert np.allclose(v @ to_matrix(left, right), expected)
+
+
+def test_compose_matches_matrix_product():
+  """Composing pairs applies the first rotation, then the second, like A @ B."""
+  a, b = _random_rotations(2, seed=2)
+  composed = compose(from_matrix(a), from_matrix(b))
+  assert np.allclose(to_matrix(*composed), a @ b)
+
+
+def test_from_matrix_reorthonormalizes():
+  """A slightly drifted matrix maps back to a nearby exact rotation."""
+  rotation = _random_rotations(1, seed=3)[0]
+  drifted = rotation + 1e-4 * np.random.default_rng(3).normal(size=(4, 4))
+  fixed = to_matrix(*from_matrix(drifted))
+  assert np.allclose(fixed @ fixed.T, np.eye(4), atol=1e-12)
+  assert np.allclose(fixed, rotation, atol=1e-3)
+
+
+def test_slerp_follows_a_plane_rotation():
+  """Interpolating a single-plane rotation turns at constant speed in that plane."""
+  a = from_matrix(np.eye(4))
+  b = from_matrix(rotation_matrix('xw', 1.2))
+  t = np.linspace(0, 1, 7)
+  left, right = slerp_pair(a, b, t)
+  assert np.allclose(to_matrix(left, right), rotation_matrices('xw', 1.2 * t))
+
+
+def test_slerp_takes_the_short_way_for_either_sign():
+  """(l, r) and (-l, -r) are the same rotation and interpolate identically."""
+  a = from_matrix(np.eye(4))
+  b = from_matrix(rotation_matrix('yz', 0.8))
+  flipped = (-b[0], -b[1])
+  half = to_matrix(*slerp_pair(a, b, 0.5))
+  assert np.allclose(to_matrix(*slerp_pair(a, flipped, 0.5)), half)
+  assert np.allclose(half, rotation_matrix('yz', 0.4))
+
+
+def test_keyframe_player_hits_keyframes_and_stays_orthonormal():
+  """The player passes through every keyframe; all frames are exact rotations."""
+  keyframes = _random_rotations(4, seed=4)
+  player = KeyframePlayer(keyframes, times=[0.0, 0.5, 2.0, 3.0])
+  assert player.duration == 3.0
+  assert np.allclose(player.evaluate(player.times), keyframes)
+  frames = player.evaluate(np.linspace(-1, 4, 1000))
+  assert frames.shape == (1000, 4, 4)
+  assert np.allclose(frames @ np.swapaxes(frames, -1, -2), np.eye(4))
+  assert np.allclose(np.linalg.det(frames), 1)
+  # Clamped outside the keyframe range
+  assert np.allclose(frames[0], keyframes[0]) and np.allclose(frames[-1], keyframes[-1])
+  assert np.allclose(KeyframePlayer(keyframes[:1]).evaluate([0.0, 1.0]), keyframes[:1])
+
+
+def _pair_with_dots(dot_l, dot_r):
+  """A quaternion pair whose dots with the identity pair are dot_l and dot_r."""
+  left = np.array([dot_l, np.sqrt(1 - dot_l**2), 0, 0])
+  right = np.array([dot_r, 0, np.sqrt(1 - dot_r**2), 0])
+  return left, right
+
+
+def test_align_minimizes_the_joint_path_when_dots_disagree():
+  """With opposite-sign dots, align picks the sign of the shorter total path."""
+  identity = (np.array([1.0, 0, 0, 0]), np.array([1.0, 0, 0, 0]))
+  for dot_l, dot_r in [(-0.9, 0.95), (-0.9, 0.8), (0.3, -0.5), (-0.2, 0.25)]:
+    pair = _pair_with_dots(dot_l, dot_r)
+    left, right = align(identity, pair)
+    lengths = {sign: np.arccos(sign * dot_l)**2 + np.arccos(sign * dot_r)**2 for sign in (1, -1)}
+    best = min(lengths, key=lengths.get)
+    assert np.allclose(left, best * pair[0]) and np.allclose(right, best * pair[1])
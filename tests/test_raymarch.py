@@ -0,0 +1,63 @@
+import types
+import numpy as np
+from renderer.raymarch import RayMarcher, camera_rays, BACKGROUND
+from geometry.hypersphere import make_hypersphere
+from geometry.tesseract import make_tesseract
+from math4d.rotations import rotation_matrix
+
+
+def _scene(shape, rotation=None):
+  obj = types.SimpleNamespace(shape=shape, camera_distance=3.0,
+                              rotation=np.eye(4) if rotation is None else rotation)
+  camera = types.SimpleNamespace(distance=3.0, rot_x=0.0, rot_y=0.0)
+  return obj, camera
+
+
+def test_camera_rays_center_looks_at_origin():
+  """With no orbit, the central ray should point from +Z toward the origin."""
+  camera = types.SimpleNamespace(distance=5.0, rot_x=0.0, rot_y=0.0)
+  origin, dirs = camera_rays(camera, 3, 3)
+  assert np.allclose(origin, [0, 0, 5])
+  assert np.allclose(dirs[1, 1], [0, 0, -1])
+  assert np.allclose(np.linalg.norm(dirs, axis=-1), 1)
+
+
+def test_raymarch_hypersphere_is_a_centered_disc():
+  """A hypersphere should render as a filled disc in the middle of the image."""
+  obj, camera = _scene(make_hypersphere(radius=2))
+  image = RayMarcher(width=40, height=30, workers=1).render(obj, camera)
+  assert image.shape == (30, 40, 3)
+  covered = np.any(image != np.float32(BACKGROUND), axis=-1)
+  assert covered[15, 20]
+  assert not covered[0, 0] and not covered[-1, -1]
+  # Symmetric about the image center
+  assert np.array_equal(covered, covered[::-1, ::-1])
+
+
+def test_raymarch_silhouette_matches_projection():
+  """The ray-marched tesseract should fill the projected outer cube's face.
+
+  With identity rotation and no orbit, the outer cube (w = +1) projects to
+  |x|, |y| <= 1 / (3 - 1) = 0.5, seen from z = 3 - 0.5 = 2.5 away.
+  """
+  obj, camera = _scene(make_tesseract())
+  width = height = 61
+  image = RayMarcher(width=width, height=height, workers=1).render(obj, camera)
+  covered = np.any(image != np.float32(BACKGROUND), axis=-1)
+  row = covered[height // 2]
+  half_width_px = row.sum() / 2
+  tan_half = np.tan(np.radians(45) / 2)
+  expected = 0.5 / 2.5 / tan_half * (width / 2)
+  assert abs(half_width_px - expected) <= 1.5
+
+
+def test_raymarch_tiles_in_parallel_match_inline():
+  """A process pool over tiles should produce the same image as one process."""
+  obj, camera = _scene(make_tesseract(), rotation_matrix('xw', 0.5))
+  inline = RayMarcher(width=32, height=24, tile_size=8, workers=1).render(obj, camera)
+  pooled = RayMarcher(width=32, height=24, tile_size=8, workers=2)
+  try:
+    parallel = pooled.render(obj, camera)
+  finally:
+    pooled.close()
+  assert np.allclose(inline, parallel)
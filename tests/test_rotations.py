@@ -1,5 +1,5 @@
 import numpy as np
-from math4d.rotations import rotation_matrix, compose
+from math4d.rotations import rotation_matrix, compose, rotation_matrices, compose_planes
 
 
 def test_rotation_is_orthogonal():
@@ -109,3 +109,23 @@ def test_rotation_on_tesseract_vertex():
   result = v @ m
   expected = np.array([-1, 1, 1, -1])
   assert np.allclose(result, expected), f"Got {result}, expected {expected}"
+
+
+def test_rotation_matrices_match_single():
+  """The batched builder should agree with rotation_matrix() per angle."""
+  angles = np.array([0.0, 0.3, -1.2, np.pi])
+  for plane in ['xy', 'xz', 'xw', 'yz', 'yw', 'zw', 'wx']:
+    stack = rotation_matrices(plane, angles)
+    assert stack.shape == (4, 4, 4)
+    for k, angle in enumerate(angles):
+      assert np.allclose(stack[k], rotation_matrix(plane, angle))
+
+
+def test_compose_planes_matches_compose():
+  """compose_planes should compose the planes in the given order."""
+  planes = ('xy', 'xw', 'zw')
+  angles = np.array([[0.5, 0.3, -0.9], [1.1, -0.2, 0.4]])
+  stack = compose_planes(planes, angles)
+  for k in range(len(angles)):
+    expected = compose(*[rotation_matrix(p, a) for p, a in zip(planes, angles[k])])
+    assert np.allclose(stack[k], expected)
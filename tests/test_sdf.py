@@ -0,0 +1,45 @@
+import numpy as np
+from geometry.sdf import sdf_hypersphere, sdf_spherinder, sdf_box, sdf_convex
+from geometry.tesseract import make_tesseract
+from geometry.pentachoron import make_pentachoron
+from geometry.hypersphere import make_hypersphere
+from geometry.spherinder import make_spherinder
+
+
+def test_hypersphere_sdf_values():
+  """Distance should be |p| - R: negative inside, zero on, positive outside."""
+  p = np.array([[0, 0, 0, 0], [2, 0, 0, 0], [0, 0, 0, 3]], dtype=np.float64)
+  assert np.allclose(sdf_hypersphere(p, radius=2), [-2, 0, 1])
+
+
+def test_box_sdf_values():
+  """Tesseract SDF: inside depth, face distance, and corner distance."""
+  p = np.array([[0, 0, 0, 0], [3, 0, 0, 0], [2, 2, 2, 2]], dtype=np.float64)
+  assert np.allclose(sdf_box(p, 1.0), [-1, 2, 2])
+
+
+def test_spherinder_sdf_values():
+  """Spherinder SDF should combine the ball and the W slab."""
+  p = np.array([[0, 0, 0, 0], [3, 0, 0, 0], [0, 0, 0, 3], [4, 0, 0, 5]], dtype=np.float64)
+  assert np.allclose(sdf_spherinder(p, radius=1, half_height=1), [-1, 2, 2, 5])
+
+
+def test_generator_vertices_lie_on_surface():
+  """Vertices of each generated shape should be on its own SDF's zero set."""
+  for shape in (make_tesseract(), make_pentachoron(radius=2.25),
+                make_hypersphere(radius=2), make_spherinder(radius=1.5, half_height=1.0)):
+    assert shape.sdf is not None
+    assert np.allclose(shape.sdf(shape.vertices), 0, atol=1e-9)
+
+
+def test_pentachoron_sdf_center_is_inradius():
+  """The center of a regular 5-cell is R/4 from every facet."""
+  p = make_pentachoron(radius=2)
+  assert np.isclose(p.sdf(np.zeros((1, 4)))[0], -0.5)
+
+
+def test_convex_sdf_is_vectorized():
+  """SDFs should accept any leading batch shape."""
+  normals = np.eye(4)
+  p = np.zeros((5, 7, 4))
+  assert sdf_convex(p, normals, np.ones(4)).shape == (5, 7)
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from session import KeyState, Session, SessionRecorder
+
+
+def test_key_state_reads_like_get_pressed():
+  """Tracked keys read their recorded state; untracked keys read as released."""
+  keys = KeyState([97, 100, 120], [1, 0, 1])
+  assert keys[97] and keys[120]
+  assert not keys[100]
+  assert not keys[49]
+
+
+def test_recorder_packs_key_bits():
+  """Each frame stores one bit per tracked key."""
+  codes = list(range(100, 111))  # 11 keys -> 2 bytes per frame
+  recorder = SessionRecorder(codes)
+  pressed = {100, 105, 110}
+  for frame in range(3):
+    keys = {code: code in pressed and frame != 1 for code in codes}
+    recorder.record_frame([], keys)
+  session = recorder.session()
+  assert session.num_frames == 3
+  assert session.key_bits.shape == (3, 2)
+  for code in codes:
+    assert session.key_state(0)[code] == (code in pressed)
+    assert not session.key_state(1)[code]
+
+
+def test_session_save_load_roundtrip(tmp_path):
+  """A saved session loads back with identical keys, events and metadata."""
+  rng = np.random.default_rng(0)
+  codes = [97, 98, 99, 100]
+  key_bits = np.packbits(rng.integers(0, 2, size=(50, 4)).astype(bool), axis=1)
+  event_frame = np.sort(rng.integers(0, 50, size=20))
+  event_kind = rng.integers(0, 6, size=20)
+  event_args = rng.integers(-5, 5, size=(20, 2))
+  session = Session(codes, key_bits, event_frame, event_kind, event_args,
+                    precision='compact', frame_ms=rng.random(50))
+  path = tmp_path / "session.npz"
+  session.save(path)
+  loaded = Session.load(path)
+
+  assert loaded.precision == 'compact'
+  assert np.array_equal(loaded.key_codes, codes)
+  assert np.array_equal(loaded.key_bits, key_bits)
+  assert np.allclose(loaded.frame_ms, session.frame_ms)
+  for frame in (0, int(event_frame[3]), 49):
+    kinds, args = loaded.event_rows(frame)
+    mask = event_frame == frame
+    assert np.array_equal(kinds, event_kind[mask])
+    assert np.array_equal(args, event_args[mask])
+
+
+def test_session_keeps_start_source_and_threads(tmp_path):
+  """A replay starts on the recorded data and engine, not the default tesseract."""
+  from benchmarks.replay import make_viewer
+
+  data = tmp_path / "points.npy"
+  np.save(data, np.random.default_rng(1).normal(size=(5000, 6)))
+  source = dict(path=str(data), columns=[2, 3, 4, 5], stride=2, preview=300,
+                raw_columns=None, raw_dtype=None)
+  recorder = SessionRecorder([97, 98], precision='compact', source=source, threads=2)
+  for _ in range(3):
+    recorder.record_frame([], {97: True, 98: False})
+  path = tmp_path / "session.npz"
+  recorder.save(path)
+  loaded = Session.load(path)
+  assert loaded.source == source and loaded.threads == 2
+
+  viewer = make_viewer(loaded)
+  try:
+    assert viewer.obj.shape.num_points == 300
+    assert viewer.obj.engine is not None and viewer.obj.engine.threads == 2
+    viewer.render_headless()
+  finally:
+    viewer.close()
+    viewer.obj.engine.close()
+  # The default session still starts on the tesseract, without an engine.
+  viewer = make_viewer(Session([97], np.zeros((1, 1)), [], [], []))
+  assert viewer.obj.shape.num_vertices == 16 and viewer.obj.engine is None
+
+
+def test_replay_runs_on_the_recorded_source(tmp_path):
+  """A full replay of a data session steps through every frame (needs pygame)."""
+  pytest.importorskip("pygame")
+  from benchmarks.replay import replay
+
+  data = tmp_path / "points.npy"
+  np.save(data, np.random.default_rng(2).normal(size=(2000, 4)))
+  recorder = SessionRecorder([97], source=dict(path=str(data), preview=500), threads=2)
+  for _ in range(4):
+    recorder.record_frame([], {97: True})
+  times = replay(recorder.session())
+  assert len(times) == 4 and np.all(times >= 0)
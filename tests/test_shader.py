@@ -0,0 +1,185 @@
+import ctypes
+import os
+
+import numpy as np
+import pytest
+
+# Use Mesa's surfaceless EGL platform (software llvmpipe on a GPU-less
+# box). Must be set before OpenGL is first imported.
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+pytest.importorskip("OpenGL")
+
+from geometry.base import Shape4D
+from geometry.hypersphere import make_hypersphere
+from geometry.morph import morphable_hypersphere
+from geometry.tesseract import make_tesseract
+from math4d.projections import make_projection
+from math4d.rotations import rotation_matrix
+
+
+SIZE = 64  # edge length of the offscreen framebuffer
+
+
+@pytest.fixture(scope="module")
+def gl_context():
+  """A current headless OpenGL context, or skip the tests if there is none.
+
+  A surfaceless context has no default framebuffer, so a small
+  offscreen one is bound for the draw calls to render into.
+  """
+  from OpenGL import EGL
+  from OpenGL import GL
+  try:
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    major, minor = EGL.EGLint(), EGL.EGLint()
+    EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor))
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, EGL.EGLConfig(), EGL.EGL_NO_CONTEXT, None)
+    assert EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, context)
+  except Exception as error:  # no EGL, no Mesa, wrong PyOpenGL platform...
+    pytest.skip(f"no headless OpenGL context: {error}")
+
+  framebuffer = GL.glGenFramebuffers(1)
+  GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, framebuffer)
+  color = GL.glGenRenderbuffers(1)
+  GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, color)
+  GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, SIZE, SIZE)
+  GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0,
+                               GL.GL_RENDERBUFFER, color)
+  GL.glViewport(0, 0, SIZE, SIZE)
+  yield
+  EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+  EGL.eglDestroyContext(display, context)
+  EGL.eglTerminate(display)
+
+
+@pytest.fixture(scope="module")
+def renderer(gl_context):
+  from renderer.shader import ShaderRenderer
+  r = ShaderRenderer()
+  if not r.supports_feedback:
+    pytest.skip("OpenGL context has no transform feedback")
+  yield r
+  r.release()
+
+
+@pytest.mark.parametrize("kind,axis", [
+  ('perspective', 'w'), ('orthographic', 'y'), ('stereographic', 'w'),
+])
+def test_shader_matches_numpy(renderer, kind, axis):
+  """The vertex shader's output matches Projection.project() on the CPU."""
+  shape = make_hypersphere(radius=1.5)
+  rotation = rotation_matrix('xw', 0.7) @ rotation_matrix('yz', -0.3)
+  projection = make_projection(kind, axis, camera_distance=3.0)
+  gpu_xyz, gpu_depth = renderer.transform(shape, rotation, projection)
+  cpu_xyz, cpu_depth = projection.project(shape.vertices, rotation)
+  assert np.allclose(gpu_xyz, cpu_xyz, rtol=1e-4, atol=1e-5)
+  assert np.allclose(gpu_depth, cpu_depth, rtol=1e-4, atol=1e-5)
+
+
+def test_shader_projects_origin_stereographically(renderer):
+  """The 4D origin projects to the 3D origin on the GPU too, not to NaN."""
+  shape = Shape4D([[0, 0, 0, 0], [1, 0, 0, 0]], [[0, 1]])
+  xyz, _ = renderer.transform(shape, np.eye(4), make_projection('stereographic'))
+  assert np.all(np.isfinite(xyz)) and np.allclose(xyz[0], 0)
+
+
+def test_shader_uploads_once(renderer):
+  """Vertices stay resident: drawing the same shape again does not re-upload."""
+  shape = make_tesseract()
+  renderer.upload(shape)
+  buffer = renderer.vertex_buffer
+  renderer.upload(shape)
+  assert renderer._shape is shape and renderer.vertex_buffer == buffer
+  xyz, _ = renderer.transform(shape, np.eye(4), make_projection())
+  assert xyz.shape == (16, 3)
+
+
+def test_shader_reuploads_morphed_vertices(renderer):
+  """A shape morphed in place is projected from its new vertices."""
+  morph = morphable_hypersphere(n1=4, n2=4, n3=6)
+  projection = make_projection('orthographic', 'w')
+  renderer.upload(morph.shape)
+  morph.set(radius=0.5, interpolation=1.0)
+  xyz, _ = renderer.transform(morph.shape, np.eye(4), projection)
+  assert np.allclose(xyz, projection.project(morph.shape.vertices, np.eye(4))[0], atol=1e-5)
+
+
+def test_shader_draws_wireframe(renderer):
+  """draw() renders the wireframe in the given colour, inside the projected outer cube."""
+  from OpenGL import GL
+  GL.glClearColor(0, 0, 0, 1)
+  GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+  # Identity modelview/projection: projected XYZ are clip coordinates.
+  shape = make_tesseract()
+  renderer.draw(shape, np.eye(4), make_projection(camera_distance=3.0), color=(1, 0, 0))
+  pixels = np.frombuffer(GL.glReadPixels(0, 0, SIZE, SIZE, GL.GL_RGB, GL.GL_UNSIGNED_BYTE),
+                         dtype=np.uint8).reshape(SIZE, SIZE, 3)
+  lit = pixels[..., 0] > 0
+  assert lit.any()
+  assert not pixels[..., 1:].any()
+  # The outer cube projects to |xy| <= 0.5, so nothing is drawn near the border.
+  ys, xs = np.nonzero(lit)
+  assert xs.min() >= SIZE // 4 - 1 and xs.max() <= 3 * SIZE // 4
+
+
+@pytest.mark.parametrize("use_shader", [False, True])
+def test_split_view_draws_every_viewport(renderer, use_shader):
+  """The split view draws a wireframe into each of its viewports and restores the full one."""
+  from OpenGL import GL
+  from renderer.viewports import SplitView, split_layout
+  from object4d import Object4D
+  GL.glClearColor(0, 0, 0, 1)
+  GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+  GL.glMatrixMode(GL.GL_MODELVIEW)
+  GL.glLoadIdentity()
+  GL.glTranslatef(0, 0, -3)
+  obj = Object4D(make_tesseract())
+  obj.rotation = rotation_matrix('xw', 0.4) @ rotation_matrix('yz', 0.3)
+  split = SplitView()
+  split.draw(obj, shader=renderer if use_shader else None, color=(0, 1, 0))
+  GL.glLoadIdentity()
+  viewport = (ctypes.c_int * 4)()
+  GL.glGetIntegerv(GL.GL_VIEWPORT, viewport)
+  assert list(viewport) == [0, 0, SIZE, SIZE]
+  pixels = np.frombuffer(GL.glReadPixels(0, 0, SIZE, SIZE, GL.GL_RGB, GL.GL_UNSIGNED_BYTE),
+                         dtype=np.uint8).reshape(SIZE, SIZE, 3)
+  for x, y, width, height in split_layout(0, 0, SIZE, SIZE):
+    assert pixels[y:y + height, x:x + width, 1].any()
+  split.release()
+
+
+def test_trail_draws_ghosts_in_one_call(gl_context):
+  """Held frames are drawn blended, with the trail colour."""
+  from OpenGL import GL
+  from renderer.trails import TrailBuffer
+  GL.glClearColor(0, 0, 0, 1)
+  GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+  GL.glMatrixMode(GL.GL_MODELVIEW)
+  GL.glLoadIdentity()
+  GL.glMatrixMode(GL.GL_PROJECTION)
+  GL.glLoadIdentity()
+  GL.glEnable(GL.GL_BLEND)
+  GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+  shape = make_tesseract()
+  trail = TrailBuffer(capacity=4, color=(0, 0, 1), max_alpha=1.0)
+  projection = make_projection(camera_distance=3.0)
+  for angle in (0.0, 0.2, 0.4):
+    verts_3d, _ = projection.project(shape.vertices, rotation_matrix('xw', angle))
+    trail.push(verts_3d, shape.edges)
+  trail.draw()
+  GL.glDisable(GL.GL_BLEND)
+  pixels = np.frombuffer(GL.glReadPixels(0, 0, SIZE, SIZE, GL.GL_RGB, GL.GL_UNSIGNED_BYTE),
+                         dtype=np.uint8).reshape(SIZE, SIZE, 3)
+  assert pixels[..., 2].any() and not pixels[..., :2].any()
+
+  # Frames with every edge masked out (all culled) leave no trace.
+  GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+  hidden = np.zeros(shape.num_edges, dtype=bool)
+  for _ in range(4):
+    trail.push(verts_3d, shape.edges, mask=hidden)
+  trail.draw()
+  pixels = GL.glReadPixels(0, 0, SIZE, SIZE, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
+  assert not np.frombuffer(pixels, dtype=np.uint8).any()
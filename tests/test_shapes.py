@@ -1,6 +1,17 @@
 import numpy as np
 from geometry.tesseract import make_tesseract
 from geometry.pentachoron import make_pentachoron
+from geometry.hypersphere import make_hypersphere
+from geometry.spherinder import make_spherinder
+from geometry.base import Shape3D, Shape4D, index_dtype, memory_report
+from geometry.sphere import make_sphere
+from geometry.weld import weld, weld_map, weld_summary
+from geometry.reorder import reorder, morton_codes
+from geometry.morph import morphable_hypersphere, morphable_sphere, morphable_spherinder
+from geometry.product import make_polygon, make_segment, product
+from geometry.prism import make_prism, make_platonic_prism
+from geometry.polyhedra import PLATONIC_SOLIDS
+from geometry.duoprism import make_duoprism, make_duocylinder
 
 
 def test_tesseract_counts():
@@ -110,3 +121,387 @@ def test_pentachoron_faces_are_triangles():
   p = make_pentachoron()
   for face in p.faces:
     assert len(face) == 3
+
+
+# --- Precision tests ---
+
+def test_full_precision_is_default():
+  """Shapes default to float64 vertices and int32 indices."""
+  t = make_tesseract()
+  assert t.precision == 'full'
+  assert t.vertices.dtype == np.float64
+  assert t.edges.dtype == np.int32
+
+
+def test_compact_precision_dtypes():
+  """Compact shapes use float32 vertices and the smallest index type."""
+  t = make_tesseract(precision='compact')
+  assert t.vertices.dtype == np.float32
+  assert t.edges.dtype == np.uint8
+  assert all(f.dtype == np.uint8 for f in t.faces)
+  h = make_hypersphere(n1=6, n2=8, n3=12, precision='compact')
+  assert h.vertices.dtype == np.float32
+  assert h.edges.dtype == np.uint16
+
+
+def test_index_dtype_thresholds():
+  """Index type should widen exactly when the vertex count requires it."""
+  assert index_dtype(256, 'compact') == np.uint8
+  assert index_dtype(257, 'compact') == np.uint16
+  assert index_dtype(65536, 'compact') == np.uint16
+  assert index_dtype(65537, 'compact') == np.uint32
+  assert index_dtype(10, 'full') == np.int32
+
+
+def test_compact_prism_does_not_overflow_indices():
+  """Extruding a compact shape must widen indices for the doubled count."""
+  # 9 * 16 + 2 = 146 sphere vertices fit in uint8, 292 prism vertices do not.
+  s = make_spherinder(n_lat=10, n_lon=16, precision='compact')
+  full = make_spherinder(n_lat=10, n_lon=16)
+  assert s.vertices.dtype == np.float32
+  assert s.edges.dtype == np.uint16
+  assert np.array_equal(s.edges, full.edges)
+
+
+def test_half_precision_computes_in_float32():
+  """float16 is a storage format; transforms should run in float32."""
+  t = make_tesseract(precision='half')
+  assert t.vertices.dtype == np.float16
+  assert t.compute_dtype == np.float32
+
+
+def test_with_precision_round_trip():
+  """Converting precision should keep the geometry and shrink storage."""
+  p = make_pentachoron()
+  c = p.with_precision('compact')
+  assert np.allclose(c.vertices, p.vertices, atol=1e-6)
+  assert np.array_equal(c.edges, p.edges)
+  assert c.nbytes < p.nbytes
+  assert 'Pentachoron' in memory_report({'Pentachoron': c})
+
+
+# --- Lazy topology tests ---
+
+def test_generators_build_topology_lazily():
+  """Generators should only compute vertices until topology is accessed."""
+  for shape in (make_tesseract(), make_pentachoron(), make_hypersphere(), make_spherinder()):
+    assert not shape.is_built('edges')
+    shape.edges
+    assert shape.is_built('edges')
+  for shape in (make_tesseract(), make_pentachoron(), make_spherinder()):
+    assert not shape.is_built('faces')
+
+
+def test_lazy_topology_is_cached():
+  """A builder should run once; later accesses return the cached value."""
+  calls = []
+
+  def build_edges(shape):
+    calls.append(1)
+    return [[0, 1], [1, 2]]
+
+  s = Shape4D(np.zeros((3, 4)), build_edges)
+  assert s.edges is s.edges
+  assert len(calls) == 1
+  assert s.edges.dtype == np.int32
+
+
+def test_lazy_edges_respect_precision():
+  """Built topology should use the shape's index type."""
+  h = make_hypersphere(precision='compact')
+  assert h.edges.dtype == np.uint16
+
+
+def test_register_custom_builder():
+  """Generators and callers can attach extra named topology."""
+  t = make_tesseract()
+  t.register_builder('degree', lambda shape: np.diff(shape.adjacency[0]))
+  assert np.all(t.topology('degree') == 4)
+
+
+def test_adjacency_from_edges():
+  """Adjacency should list each edge from both endpoints."""
+  p = make_pentachoron()
+  for i in range(5):
+    assert list(p.neighbors(i)) == [j for j in range(5) if j != i]
+
+
+def test_vertices_only_shape_has_no_edges():
+  """Omitting edges should give an empty (0, 2) edge array."""
+  s = Shape4D(np.zeros((7, 4)))
+  assert s.edges.shape == (0, 2)
+  assert s.num_faces == 0
+
+
+def test_nbytes_counts_only_built_topology():
+  """Memory use should grow only when topology is actually built."""
+  h = make_hypersphere(n1=10, n2=10, n3=20)
+  before = h.nbytes
+  assert before == h.vertices.nbytes
+  h.edges
+  assert h.nbytes > before
+
+
+# --- Welding tests ---
+
+def test_hypersphere_poles_are_welded():
+  """Each pole of the hypersphere should be a single vertex."""
+  h = make_hypersphere(radius=2, n1=6, n2=8, n3=10)
+  at_north = np.all(np.isclose(h.vertices, [0, 0, 0, 2]), axis=1)
+  at_south = np.all(np.isclose(h.vertices, [0, 0, 0, -2]), axis=1)
+  assert at_north.sum() == 1
+  assert at_south.sum() == 1
+
+
+def test_welded_meshes_have_no_duplicate_vertices():
+  """No two vertices of a generated mesh should coincide."""
+  for shape in (make_hypersphere(n1=5, n2=6, n3=7), make_sphere(n_lat=8, n_lon=9)):
+    rounded = np.round(shape.vertices, 9)
+    assert len(np.unique(rounded, axis=0)) == shape.num_vertices
+
+
+def test_welded_meshes_have_no_degenerate_edges():
+  """Every remaining edge should have positive length and appear once."""
+  h = make_hypersphere(n1=6, n2=8, n3=10)
+  lengths = np.linalg.norm(h.vertices[h.edges[:, 0]] - h.vertices[h.edges[:, 1]], axis=1)
+  assert np.all(lengths > 1e-6)
+  assert len(np.unique(h.edges, axis=0)) == h.num_edges
+
+
+def test_sphere_weld_counts():
+  """A UV sphere welds each pole ring to one vertex: n_lon * (n_lat - 1) + 2."""
+  s = make_sphere(n_lat=10, n_lon=12)
+  assert s.num_vertices == 12 * 9 + 2
+  assert s.weld_stats['vertices'] == (132, 110)
+  s.edges
+  assert s.weld_stats['edges'][1] == s.num_edges
+  assert 'vertices 132 -> 110' in weld_summary(s)
+
+
+def test_weld_is_noop_without_duplicates():
+  """Welding a clean mesh should keep vertex order, edges and faces."""
+  t = make_tesseract()
+  w = weld(t)
+  assert np.array_equal(w.vertices, t.vertices)
+  assert np.array_equal(w.edges, t.edges)
+  assert all(np.array_equal(a, b) for a, b in zip(w.faces, t.faces))
+
+
+def test_weld_collapses_faces():
+  """Collapsed corners shrink faces; faces with < 3 corners disappear."""
+  vertices = np.array([[0, 0, 0, 0], [1, 0, 0, 0], [1, 1, 0, 0], [1, 1e-12, 0, 0]])
+  shape = Shape4D(vertices, [[0, 1], [1, 3], [2, 3]], [[0, 1, 2, 3], [0, 1, 3]])
+  w = weld(shape, tolerance=1e-9)
+  assert w.num_vertices == 3
+  assert w.edges.tolist() == [[0, 1], [1, 2]]
+  assert [f.tolist() for f in w.faces] == [[0, 1, 2]]
+
+
+def test_weld_merges_across_cell_boundaries():
+  """Points within tolerance merge even when they hash to neighbouring cells."""
+  tolerance = 1e-6
+  for x in (0.49999e-6, 7.99999e-6, 8.00001e-6 - 1e-6):
+    vertices = np.array([[x, 0, 0, 0], [x + 2e-11, 0, 0, 0], [x + 0.9e-6, -1e-12, 0, 0]])
+    representatives, inverse = weld_map(vertices, tolerance)
+    assert representatives.tolist() == [0] and inverse.tolist() == [0, 0, 0]
+  # Diagonal neighbours, and chains of close pairs, are merged too; a
+  # point just beyond the tolerance is not.
+  vertices = np.array([[7.9e-6, 7.9e-6, 0, 0], [8.1e-6, 8.1e-6, 0, 0],
+                       [8.9e-6, 8.9e-6, 0, 0], [10.1e-6, 8.9e-6, 0, 0]])
+  representatives, inverse = weld_map(vertices, tolerance)
+  assert representatives.tolist() == [0, 3] and inverse.tolist() == [0, 0, 0, 1]
+
+
+def test_reorder_keeps_the_same_mesh():
+  """Reordering permutes vertices but every edge and face joins the same points."""
+  h = make_hypersphere(radius=2, n1=8, n2=8, n3=12, precision='compact')
+  r = reorder(h)
+  assert r.precision == 'compact' and r.edges.dtype == h.edges.dtype
+  assert sorted(r.source_index.tolist()) == list(range(h.num_vertices))
+  assert np.array_equal(r.vertices, h.vertices[r.source_index])
+  # Edges as sets of endpoint positions are unchanged, and sorted for gathers.
+  before = {tuple(sorted(map(tuple, h.vertices[e].tolist()))) for e in h.edges}
+  after = {tuple(sorted(map(tuple, r.vertices[e].tolist()))) for e in r.edges}
+  assert before == after and r.num_edges == h.num_edges
+  assert np.all(r.edges[:, 0] < r.edges[:, 1])
+  assert np.all(np.diff(r.edges[:, 0].astype(np.int64)) >= 0)
+  t = make_tesseract()
+  rt = reorder(t, order=np.arange(16)[::-1])
+  assert sorted(sorted(f.tolist()) for f in rt.faces) == sorted(
+    sorted((15 - f).tolist()) for f in t.faces)
+  # Packed faces are remapped in packed form, sorted by their lowest vertex.
+  d = make_duoprism(5, 7)
+  rd = reorder(d)
+  indices, lengths = rd.topology('packed_faces')
+  assert not rd.is_built('faces') and len(lengths) == len(d.faces)
+  assert [f.tolist() for f in rd.faces] == [
+    f.tolist() for f in np.split(indices, np.cumsum(lengths)[:-1])]
+  assert np.all(np.diff([f.min() for f in rd.faces]) >= 0)
+  new_index = np.argsort(rd.source_index)
+  assert sorted(tuple(f.tolist()) for f in rd.faces) == sorted(
+    tuple(new_index[f].tolist()) for f in d.faces)
+
+
+def test_morton_codes_follow_the_z_curve():
+  """Codes interleave the coordinate bits, so a 2x2 grid is visited in Z order."""
+  square = np.array([[1, 1], [0, 0], [1, 0], [0, 1]])
+  assert morton_codes(square, bits=1).tolist() == [3, 0, 1, 2]
+  points = np.random.default_rng(0).uniform(-1, 1, (5000, 4))
+  r = reorder(Shape4D(points))
+  # Consecutive vertices end up much closer together than in random order.
+  step = np.linalg.norm(np.diff(r.vertices, axis=0), axis=1).mean()
+  assert step < 0.5 * np.linalg.norm(np.diff(points, axis=0), axis=1).mean()
+
+
+def test_polytope_cells():
+  """Tesseract and pentachoron cells have outward unit normals and share edges correctly."""
+  for shape, num_cells, cell_size in ((make_tesseract(), 8, 8), (make_pentachoron(), 5, 4)):
+    assert shape.has_topology('cells') and not shape.is_built('cells')
+    assert len(shape.cells) == num_cells and all(len(c) == cell_size for c in shape.cells)
+    normals = shape.topology('cell_normals')
+    offsets = shape.topology('cell_offsets')
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1)
+    for cell, n, o in zip(shape.cells, normals, offsets):
+      # Cell vertices lie on the plane, all other vertices inside it.
+      d = shape.vertices @ n - o
+      assert np.allclose(d[cell], 0)
+      assert np.all(np.delete(d, cell) < 0)
+    # Every edge is in 3 cells, and both its endpoints are in each of them.
+    pairs = shape.topology('edge_cells')
+    assert np.all(np.bincount(pairs[:, 0], minlength=shape.num_edges) == 3)
+    for e, c in pairs:
+      assert set(shape.edges[e].tolist()) <= set(shape.cells[c].tolist())
+  assert not make_hypersphere().has_topology('cells')
+
+
+def test_product_counts():
+  """Product counts follow V = Va*Vb, E = Ea*Vb + Va*Eb, F = Fa*Vb + Va*Fb + Ea*Eb."""
+  a, b = make_polygon(5), make_polygon(7)
+  d = product(a, b)
+  assert d.dimension == 4
+  assert d.num_vertices == 35
+  assert d.num_edges == 5 * 7 + 5 * 7
+  assert d.num_faces == 7 + 5 + 35
+
+
+def test_product_vertices_are_pairs():
+  """Vertex j * Va + i is vertex i of the first factor joined with vertex j of the second."""
+  a, b = make_polygon(4), make_polygon(3, radius=2.0)
+  d = product(a, b)
+  for j in range(3):
+    for i in range(4):
+      assert np.allclose(d.vertices[j * 4 + i], np.concatenate([a.vertices[i], b.vertices[j]]))
+
+
+def test_product_edges_have_unit_step():
+  """Every product edge moves along exactly one factor."""
+  d = make_duoprism(6, 8)
+  na = 6
+  for u, v in d.edges:
+    same_a = u % na == v % na
+    same_b = u // na == v // na
+    assert same_a != same_b
+
+
+def test_prism_is_product_with_segment():
+  """make_prism keeps its layout: bottom copy, top copy, then vertical edges."""
+  cube = PLATONIC_SOLIDS['cube']()
+  p = make_prism(cube, half_height=0.5)
+  assert p.num_vertices == 16
+  assert p.num_edges == 2 * 12 + 8
+  assert p.num_faces == 2 * 6 + 12
+  assert np.all(p.vertices[:8, 3] == -0.5) and np.all(p.vertices[8:, 3] == 0.5)
+  assert np.array_equal(p.edges[-8:], np.column_stack([np.arange(8), np.arange(8) + 8]))
+
+
+def test_platonic_solids_are_closed():
+  """Each solid has Euler characteristic 2 and every edge borders two faces."""
+  for make_fn in PLATONIC_SOLIDS.values():
+    s = make_fn(radius=1.5)
+    assert s.num_vertices - s.num_edges + s.num_faces == 2
+    assert np.allclose(np.linalg.norm(s.vertices, axis=1), 1.5)
+    counts = {}
+    for face in s.faces:
+      for k in range(len(face)):
+        e = tuple(sorted((int(face[k]), int(face[(k + 1) % len(face)]))))
+        counts[e] = counts.get(e, 0) + 1
+    assert sorted(counts) == sorted(tuple(e) for e in s.edges.tolist())
+    assert set(counts.values()) == {2}
+
+
+def test_product_shapes_sdf_vanishes_on_vertices():
+  """Vertices of duoprisms and Platonic prisms lie on their SDF's surface."""
+  shapes = [make_duoprism(5, 7), make_platonic_prism('tetrahedron'),
+            make_platonic_prism('octahedron')]
+  for s in shapes:
+    assert np.allclose(s.sdf(s.vertices), 0)
+  d = make_duocylinder(1.0, 2.0, resolution=64)
+  assert np.all(d.sdf(d.vertices) <= 1e-12)
+  assert np.allclose(d.sdf(d.vertices), 0, atol=1e-2)
+
+
+def test_product_builds_topology_lazily():
+  """Duoprism edges and faces are only built when first accessed."""
+  d = make_duocylinder(resolution=128)
+  assert not d.is_built('edges') and not d.is_built('faces')
+  assert d.num_edges == 2 * 128 * 128
+  assert not d.is_built('faces')
+
+
+def test_product_packs_faces_in_order():
+  """Packed product faces keep the product-rule order, even with mixed face lengths."""
+  pyramid = Shape3D([[1, 1, 0], [1, -1, 0], [-1, -1, 0], [-1, 1, 0], [0, 0, 1]],
+                    [[0, 1], [1, 2], [2, 3], [3, 0], [0, 4], [1, 4], [2, 4], [3, 4]],
+                    [[0, 1, 4], [0, 1, 2, 3], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+  p = make_prism(pyramid, half_height=0.5)
+  indices, lengths = p.topology('packed_faces')
+  assert not p.is_built('faces')
+  assert lengths.tolist() == [3, 4, 3, 3, 3] * 2 + [4] * 8
+  assert indices[:16].tolist() == [0, 1, 4, 0, 1, 2, 3, 1, 2, 4, 2, 3, 4, 3, 0, 4]
+  expected = [list(f) for f in pyramid.faces] + [[int(i) + 5 for i in f] for f in pyramid.faces]
+  assert [f.tolist() for f in p.faces[:10]] == expected
+  assert p.faces[10].tolist() == [0, 1, 6, 5]
+
+
+def test_compact_product_indices():
+  """Compact products use an index type wide enough for the product, not the factors."""
+  d = product(make_polygon(20), make_polygon(20), precision='compact')
+  assert d.vertices.dtype == np.float32
+  assert d.edges.dtype == np.uint16
+  assert d.edges.max() == 399
+  s = make_segment(precision='compact')
+  assert s.dimension == 1 and s.edges.dtype == np.uint8
+
+
+def test_morphing_matches_the_generators():
+  """Morphed vertices equal a fresh generator call at the same parameters."""
+  cases = [
+    (morphable_hypersphere, make_hypersphere, {"n1": 5, "n2": 6, "n3": 7},
+     [{"interpolation": 0.3}, {"radius": 2.0, "interpolation": 1.0}]),
+    (morphable_sphere, make_sphere, {"n_lat": 6, "n_lon": 8},
+     [{"interpolation": 0.5, "radius": 0.5}]),
+    (morphable_spherinder, make_spherinder, {"n_lat": 6, "n_lon": 8},
+     [{"half_height": 0.25}, {"radius": 0.7, "interpolation": 0.6}]),
+  ]
+  for morphable, make_fn, kwargs, steps in cases:
+    morph = morphable(**kwargs)
+    for params in steps:
+      assert morph.set(**params)
+      fresh = make_fn(**kwargs, **morph.params)
+      assert np.allclose(morph.shape.vertices, fresh.vertices, atol=1e-12)
+      assert np.array_equal(morph.shape.edges, fresh.edges)
+
+
+def test_morphing_keeps_topology_and_buffers():
+  """set() rewrites the same vertex array, bumps the version and updates the sdf."""
+  morph = morphable_spherinder(n_lat=4, n_lon=6, precision='compact')
+  shape = morph.shape
+  vertices, edges = shape.vertices, shape.edges
+  assert not morph.set(radius=1.0)  # unchanged parameters do nothing
+  assert shape.version == 0
+  assert morph.set(radius=0.5, half_height=0.3)
+  assert shape.version == 1
+  assert shape.vertices is vertices and shape.edges is edges
+  assert vertices.dtype == np.float32
+  assert np.allclose(np.abs(shape.sdf(shape.vertices.astype(np.float64))), 0, atol=1e-5)
+  assert np.allclose(np.abs(vertices[:, 3]), 0.3)
@@ -0,0 +1,100 @@
+import numpy as np
+from functools import partial
+from math4d.slicing import (
+  hyperplane_basis, slice_to_4d, slice_sdf, marching_tetrahedra, TET_TABLE,
+)
+from math4d.rotations import rotation_matrix
+from geometry.hypersphere import make_hypersphere
+from geometry.spherinder import make_spherinder
+from geometry.sdf import sdf_hypersphere
+from geometry.base import Shape4D
+from object4d import Object4D
+
+
+def test_hyperplane_basis_is_orthonormal():
+  """Basis rows should be orthonormal and perpendicular to the normal."""
+  normal = np.array([1.0, -2.0, 0.5, 3.0])
+  basis = hyperplane_basis(normal)
+  assert basis.shape == (3, 4)
+  assert np.allclose(basis @ basis.T, np.eye(3))
+  assert np.allclose(basis @ normal, 0)
+
+
+def test_w_normal_gives_xyz_basis():
+  """Slicing along W should use the viewer's XYZ axes as slice coordinates."""
+  assert np.allclose(hyperplane_basis((0, 0, 0, 1)), np.eye(4)[:3])
+
+
+def test_tet_table_covers_every_case():
+  """Cases with mixed signs emit triangles; uniform cases emit none."""
+  for case in range(16):
+    count = (TET_TABLE[case, :, 0] >= 0).sum()
+    inside = bin(case).count('1')
+    expected = {0: 0, 1: 1, 2: 2, 3: 1, 4: 0}[inside]
+    assert count == expected
+
+
+def test_hypersphere_slice_is_a_sphere():
+  """Slicing S³ of radius 2 at w=1 gives a 2-sphere of radius √3."""
+  h = make_hypersphere(radius=2)
+  section = slice_sdf(h.sdf, offset=1.0, resolution=32)
+  radii = np.linalg.norm(section.vertices, axis=1)
+  assert np.allclose(radii, np.sqrt(3), atol=0.01)
+  # A closed genus-0 surface has Euler characteristic V - E + F = 2
+  assert section.num_vertices - section.num_edges + section.num_faces == 2
+  assert all(len(f) == 3 for f in section.faces)
+
+
+def test_slice_vertices_lie_on_the_4d_surface():
+  """Mapped back to 4D, slice vertices should sit on the rotated solid."""
+  s = make_spherinder(radius=1.5, half_height=1.0)
+  r = rotation_matrix('xw', 0.7) @ rotation_matrix('yz', 0.3)
+  section = slice_sdf(s.sdf, offset=0.2, rotation=r, resolution=40)
+  points = slice_to_4d(section.vertices, (0, 0, 0, 1), 0.2)
+  assert np.allclose(points[:, 3], 0.2)
+  assert np.abs(s.sdf(points @ r.T)).max() < 0.05
+
+
+def test_slice_missing_the_shape_is_empty():
+  """A hyperplane beyond the shape yields an empty mesh."""
+  h = make_hypersphere(radius=1)
+  section = slice_sdf(h.sdf, offset=1.5)
+  assert section.num_vertices == 0
+  assert section.num_edges == 0
+
+
+def test_block_skipping_matches_full_grid():
+  """Skipping far blocks must not change the extracted surface."""
+  def sdf(p):
+    return sdf_hypersphere(p, radius=1.2)
+  skipped = slice_sdf(sdf, resolution=32, block_size=8)
+  full = slice_sdf(sdf, resolution=32, block_size=32)
+  assert skipped.num_faces == full.num_faces
+  assert np.allclose(np.sort(skipped.vertices, axis=0), np.sort(full.vertices, axis=0))
+
+
+def test_marching_tetrahedra_single_cell():
+  """One corner inside a single cube should produce a small closed cap."""
+  values = np.ones((2, 2, 2))
+  values[0, 0, 0] = -1
+  vertices, triangles = marching_tetrahedra(values, np.array([[0, 0, 0]]), 1.0, np.zeros(3))
+  # The three cube edges at the corner are cut at their midpoints, plus
+  # the face and body diagonals shared by the six tetrahedra.
+  assert len(triangles) > 0
+  assert np.all(vertices <= 0.5 + 1e-12)
+
+
+def test_cross_section_cache_follows_shape_identity():
+  """A new shape is re-sliced, even if it reuses a freed shape's id()."""
+  obj = Object4D(make_hypersphere(radius=2, n1=3, n2=3, n3=4))
+  obj.slice_offset = 1.0
+  first = obj.cross_section()
+  assert obj.cross_section() is first  # cached while nothing changes
+  for scale in (0.6, 0.75, 0.9):
+    vertices, edges = obj.shape.vertices, obj.shape.edges
+    obj.shape = None  # free the old shape first, so its id() can be reused
+    obj.shape = Shape4D(vertices * scale, edges)
+    obj.shape.sdf = partial(sdf_hypersphere, radius=2 * scale)
+    section = obj.cross_section()
+    radii = np.linalg.norm(section.vertices, axis=1)
+    assert np.allclose(radii, np.sqrt((2 * scale)**2 - 1), atol=0.05)
@@ -0,0 +1,99 @@
+import numpy as np
+from renderer.trails import TrailBuffer
+from geometry.tesseract import make_tesseract
+from geometry.pentachoron import make_pentachoron
+from object4d import Object4D
+from math4d.rotations import rotation_matrix
+
+
+def _frames(n, num_vertices=4):
+  return [np.full((num_vertices, 3), i, dtype=np.float64) for i in range(n)]
+
+
+def test_trail_keeps_the_last_frames():
+  """Once full, each new frame replaces the oldest, and ages count back from the newest."""
+  edges = np.array([[0, 1], [2, 3]])
+  trail = TrailBuffer(capacity=3)
+  for frame in _frames(5):
+    trail.push(frame, edges)
+  assert trail.count == 3
+  # Frames 3 and 4 overwrote slots 0 and 1; slot 2 still holds frame 2.
+  assert trail.positions[:, 0, 0].tolist() == [3, 4, 2]
+  assert trail.ages().tolist() == [2, 1, 3]
+  # Each slot's edges point at that slot's vertices.
+  assert trail.indices[2].tolist() == [[8, 9], [10, 11]]
+
+
+def test_trail_alpha_fades_with_age():
+  """The newest ghost is the most opaque; alpha is uniform within a frame."""
+  trail = TrailBuffer(capacity=4, max_alpha=1.0)
+  edges = np.array([[0, 1]])
+  for frame in _frames(6, num_vertices=2):
+    trail.push(frame, edges)
+  trail.update_alpha()
+  alpha = trail.colors[:, :, 3]
+  assert np.all(alpha == alpha[:, :1])
+  by_age = alpha[np.argsort(trail.ages()), 0]
+  assert by_age[0] == 255 and np.all(np.diff(by_age.astype(int)) < 0)
+
+
+def test_trail_does_not_allocate_per_frame():
+  """Pushing frames of the same mesh reuses the buffers; a new mesh resets the trail."""
+  shape = make_tesseract()
+  trail = TrailBuffer(capacity=8)
+  trail.push(shape.vertices[:, :3], shape.edges)
+  buffers = (trail.positions, trail.indices, trail.colors)
+  for _ in range(20):
+    trail.push(shape.vertices[:, :3], shape.edges)
+    trail.update_alpha()
+  assert all(a is b for a, b in zip(buffers, (trail.positions, trail.indices, trail.colors)))
+  other = make_pentachoron()
+  trail.push(other.vertices[:, :3], other.edges)
+  assert trail.count == 1 and trail.positions.shape == (8, 5, 3)
+
+
+def test_object_trail_records_previous_frames():
+  """In trail mode a frame joins the trail only after it has been drawn."""
+  obj = Object4D(make_tesseract())
+  obj.trail_mode = True
+  for frame in range(3):
+    batches = obj.project()
+    next(batches)
+    assert obj.trail.count == frame
+    for _ in batches:
+      pass
+    obj.rotation = obj.rotation @ rotation_matrix('xw', 0.1)
+  assert obj.trail.count == 3
+  obj.next_projection()
+  assert obj.trail.count == 0
+
+
+def test_trail_masks_hidden_edges_per_frame():
+  """Masked edges collapse to a point in their slot; a reused slot gets all its edges back."""
+  edges = np.array([[0, 1], [1, 2], [2, 3]])
+  trail = TrailBuffer(capacity=2)
+  frames = _frames(3)
+  trail.push(frames[0], edges, mask=np.array([True, False, True]))
+  trail.push(frames[1], edges)
+  assert trail.indices[0].tolist() == [[0, 1], [1, 1], [2, 3]]
+  assert trail.indices[1].tolist() == [[4, 5], [5, 6], [6, 7]]
+  trail.push(frames[2], edges)  # reuses slot 0, unmasked
+  assert trail.indices[0].tolist() == [[0, 1], [1, 2], [2, 3]]
+  assert trail.count == 2
+
+
+def test_slice_mode_drops_the_wireframe_trail():
+  """Slices leave no trail, so the wireframe's ghosts do not linger behind them."""
+  obj = Object4D(make_tesseract())
+  obj.trail_mode = True
+  for _ in range(5):
+    list(obj.project())
+  assert obj.trail.count == 5
+  obj.slice_mode = True
+  for _ in range(50):
+    list(obj.project())
+  assert obj.trail.count == 0
+  obj.slice_mode = False
+  for _ in range(2):
+    list(obj.project())
+  assert obj.trail.count == 2
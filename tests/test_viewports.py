@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from renderer.viewports import SPLIT_VIEWS, project_views, split_layout, split_projections
+from geometry.hypersphere import make_hypersphere
+from math4d.projections import make_projection
+from math4d.rotations import rotation_matrix
+
+
+@pytest.mark.parametrize("precision", ['full', 'compact', 'half'])
+def test_project_views_matches_each_projection(precision):
+  """Projecting every view from one rotation gives each Projection's own result."""
+  shape = make_hypersphere(radius=1.5, precision=precision)
+  rotation = rotation_matrix('xw', 0.7) @ rotation_matrix('yz', -0.3)
+  projections = split_projections(3.0) + [make_projection('stereographic', 'y')]
+  views = project_views(shape.vertices, rotation, projections)
+  assert views.shape == (len(projections), shape.num_vertices, 3)
+  assert views.dtype == shape.compute_dtype
+  for view, projection in zip(views, projections):
+    expected, _ = projection.project(shape.vertices, rotation)
+    # Rotating first rounds differently in float32 than the combined matrix.
+    assert np.allclose(view, expected, rtol=1e-4, atol=1e-6)
+
+
+def test_split_layout_tiles_the_window():
+  """The first view fills the left half and the rest tile the right half without overlap."""
+  rects = split_layout(0, 0, 800, 600)
+  assert len(rects) == len(SPLIT_VIEWS)
+  assert rects[0] == (0, 0, 400, 600)
+  coverage = np.zeros((600, 800), dtype=int)
+  for x, y, w, h in rects:
+    coverage[y:y + h, x:x + w] += 1
+  assert coverage.max() == 1 and coverage.all()
+  # Rows are filled from the top (OpenGL y grows upward).
+  assert rects[1][1] == 300 and rects[3][1] == 0
+  assert split_layout(10, 20, 300, 200, num_views=1) == [(10, 20, 300, 200)]